@@ -1,13 +1,14 @@
 import asyncio
-import logging
-
-logging.basicConfig()
-logging.getLogger("asyncio").setLevel(logging.WARNING)
-logging.getLogger("slack_bolt").setLevel(logging.INFO)
-logging.getLogger("lsimons_bot").setLevel(logging.DEBUG)
 
+from lsimons_bot.app.config import get_optional_env_vars
+from lsimons_bot.app.logs import setup_logging
 
 if __name__ == "__main__":
-    from lsimons_bot.app.main import main
-
-    asyncio.run(main())
+    from lsimons_bot.app.main import main, make_logging_config
+
+    listener = setup_logging(make_logging_config(get_optional_env_vars()))
+    try:
+        asyncio.run(main())
+    finally:
+        # Flush what is still queued
+        listener.stop()
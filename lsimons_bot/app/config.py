@@ -8,6 +8,60 @@ REQUIRED_VARS = [
     "ASSISTANT_MODEL",
 ]
 
+# Optional settings and their defaults; an empty value leaves the feature disabled
+OPTIONAL_VARS = {
+    "ASSISTANT_PROMPT_CACHING": "auto",
+    "ASSISTANT_FAST_MODEL": "",
+    "ASSISTANT_ROUTER_MAX_FAST_TOKENS": "500",
+    "ASSISTANT_ROUTER_MAX_FAST_TURNS": "6",
+    "ASSISTANT_ROUTER_MAX_FAST_CHARS": "200",
+    "ASSISTANT_FALLBACK_MODEL": "",
+    "ASSISTANT_LATENCY_BUDGET_SECONDS": "60",
+    "ASSISTANT_HEDGE_DELAY_SECONDS": "8",
+    "ASSISTANT_MEMORY_MAX_TURNS": "20",
+    "ASSISTANT_MEMORY_KEEP_TURNS": "8",
+    "ASSISTANT_SUMMARY_MODEL": "",
+    # Index built with `python -m lsimons_bot.retrieval build`; empty disables retrieval
+    "RETRIEVAL_INDEX": "",
+    "RETRIEVAL_TOP_K": "5",
+    # Most tokens of reference notes added to a request
+    "RETRIEVAL_MAX_TOKENS": "1000",
+    # SQLite file recording assistant requests, so a restart can finish them; empty disables it
+    "ASSISTANT_WORK_LOG": "",
+    "BLOG_SCHEDULER_INTERVAL_MINUTES": "",
+    # Route stats, LLM latencies and thread summaries are saved here on shutdown and loaded on
+    # startup; empty disables it
+    "SNAPSHOT_FILE": "",
+    # An older snapshot, or thread summary in it, is ignored
+    "SNAPSHOT_MAX_AGE_HOURS": "24",
+    # On SIGTERM, how long queued requests get to finish before the bot exits
+    "SHUTDOWN_DRAIN_SECONDS": "20",
+    # Reload the user names that threads are annotated with this often; 0 disables the names
+    "SLACK_USER_DIRECTORY_RELOAD_HOURS": "12",
+    # Web API base URL; point at `python -m lsimons_bot.loadtest` to run against a fake Slack
+    "SLACK_API_URL": "",
+    # Profiles go here; SIGUSR1 profiles the event loop for PROFILING_SECONDS, SIGUSR2 memory
+    "PROFILING_DIR": "profiles",
+    "PROFILING_SECONDS": "30",
+    # Save a profile of every assistant request slower than this many seconds
+    "PROFILING_SLOW_REQUEST_SECONDS": "",
+    # Workers that run Slack event handlers off the listener; 0 runs them in the listener
+    "WORK_QUEUE_WORKERS": "8",
+    # Events waiting for a worker before new ones are rejected
+    "WORK_QUEUE_MAX_PENDING": "100",
+    # Write request traces to this file, rotated at 10 MB; empty disables tracing
+    "TRACING_FILE": "",
+    # "jsonl" for one flat span per line, "otlp" for OTLP/JSON export requests
+    "TRACING_FORMAT": "jsonl",
+    # "text" or "json" (one object per line, with the trace id of the request)
+    "LOG_FORMAT": "text",
+    "LOG_LEVEL": "DEBUG",
+    # Fraction of sub-WARNING records kept per logger, e.g. "lsimons_bot.slack=0.1"
+    "LOG_SAMPLING": "",
+    # Log messages longer than this are cut off
+    "LOG_MAX_CHARS": "2000",
+}
+
 
 def validate_env_vars(required_vars: list[str]) -> dict[str, str]:
     missing_vars: list[str] = []
@@ -28,3 +82,7 @@ def validate_env_vars(required_vars: list[str]) -> dict[str, str]:
 
 def get_env_vars() -> dict[str, str]:
     return validate_env_vars(REQUIRED_VARS)
+
+
+def get_optional_env_vars() -> dict[str, str]:
+    return {var: os.environ.get(var, default) for var, default in OPTIONAL_VARS.items()}
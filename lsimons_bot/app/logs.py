@@ -0,0 +1,233 @@
+import copy
+import json
+import logging
+import queue
+import random
+import re
+import reprlib
+import sys
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, TextIO, override
+
+from lsimons_bot.tracing.trace import current_span
+
+FORMAT_TEXT = "text"
+FORMAT_JSON = "json"
+TEXT_FORMAT = "%(levelname)s:%(name)s:%(message)s"
+DEFAULT_LEVEL = "DEBUG"
+# Longest formatted message; the rest is cut off before it leaves the event loop
+MAX_CHARS = 2000
+# Items shown per list or dict argument, e.g. the messages of a long thread
+MAX_ITEMS = 10
+QUEUE_SIZE = 10_000
+REDACTED = "[REDACTED]"
+# Library loggers that are too chatty at DEBUG
+LIBRARY_LEVELS = {"asyncio": logging.WARNING, "slack_bolt": logging.INFO}
+
+# Credentials that may end up in a logged payload or error message
+SECRET_PATTERNS = re.compile(
+    r"xox[abposre]-[\w-]+"  # Slack bot, user and refresh tokens
+    + r"|xapp-[\w-]+"  # Slack app-level tokens
+    + r"|\bsk-[\w-]{8,}"  # OpenAI-style API keys, as LiteLLM uses
+    + r"|\bgh[pousr]_\w+|\bgithub_pat_\w+"  # GitHub tokens
+    + r"|(?<=Bearer )[\w.~+/-]+=*",
+)
+
+
+@dataclass
+class LoggingConfig:
+    format: str = FORMAT_TEXT
+    level: str = DEFAULT_LEVEL
+    # Fraction of records below WARNING kept per logger name prefix, e.g. {"lsimons_bot.slack": 0.1}
+    sampling: dict[str, float] = field(default_factory=dict)
+    max_chars: int = MAX_CHARS
+    queue_size: int = QUEUE_SIZE
+
+
+def parse_sampling(value: str) -> dict[str, float]:
+    """Parse `logger=rate,logger=rate` into sampling rates."""
+    rates: dict[str, float] = {}
+    for item in value.split(","):
+        if not item.strip():
+            continue
+        name, _, rate = item.partition("=")
+        rates[name.strip()] = float(rate)
+    return rates
+
+
+def redact(text: str) -> str:
+    return SECRET_PATTERNS.sub(REDACTED, text)
+
+
+def truncate(text: str, max_chars: int) -> str:
+    if len(text) <= max_chars:
+        return text
+    return f"{text[:max_chars]}... [{len(text) - max_chars} more chars]"
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps a fraction of the records below WARNING, per logger name prefix.
+
+    The most specific prefix wins; loggers without a rate keep everything.
+    """
+
+    def __init__(
+        self, rates: Mapping[str, float], chance: Callable[[], float] = random.random
+    ) -> None:
+        super().__init__()
+        # Longest prefix first, so the most specific rate is found first
+        self.rates: list[tuple[str, float]] = sorted(
+            rates.items(), key=lambda item: len(item[0]), reverse=True
+        )
+        self.chance: Callable[[], float] = chance
+
+    def rate(self, name: str) -> float:
+        for prefix, rate in self.rates:
+            if name == prefix or name.startswith(prefix + "."):
+                return rate
+        return 1.0
+
+    @override
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self.rate(record.name)
+        return rate >= 1.0 or self.chance() < rate
+
+
+class RedactingFilter(logging.Filter):
+    """Masks credentials in the message and traceback of every record."""
+
+    @override
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.msg = redact(record.getMessage())
+        record.args = None
+        if record.exc_text:
+            record.exc_text = redact(record.exc_text)
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, with the trace id when the record was logged in a span."""
+
+    @override
+    def format(self, record: logging.LogRecord) -> str:
+        entry: dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, UTC).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        trace_id = getattr(record, "trace_id", None)
+        if trace_id is not None:
+            entry["trace_id"] = trace_id
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class CappedQueueHandler(QueueHandler):
+    """Hands records to a background thread after formatting them at a bounded cost.
+
+    Arguments are rendered with `reprlib`, so a thread of a thousand messages costs as much as
+    one of ten, and the message is cut at `max_chars`. When the queue is full records are
+    dropped rather than blocking the event loop; the next record that fits reports how many.
+    """
+
+    def __init__(
+        self, log_queue: queue.Queue[logging.LogRecord], max_chars: int = MAX_CHARS
+    ) -> None:
+        super().__init__(log_queue)
+        self.max_chars: int = max_chars
+        self.repr: reprlib.Repr = reprlib.Repr(
+            maxlevel=3,
+            maxlist=MAX_ITEMS,
+            maxtuple=MAX_ITEMS,
+            maxdict=MAX_ITEMS,
+            maxset=MAX_ITEMS,
+            maxstring=max_chars,
+            maxother=max_chars,
+        )
+        self.dropped: int = 0
+
+    def _cap(self, arg: object) -> object:
+        match arg:
+            case str() | int() | float() | bool() | None:
+                # Cheap to render; a long string is cut with the rest of the message
+                return arg
+            case list() | tuple() | dict() | set() | frozenset():
+                return self.repr.repr(arg)
+            case _:
+                return truncate(str(arg), self.max_chars)
+
+    def _message(self, record: logging.LogRecord) -> str:
+        args = record.args
+        if isinstance(args, tuple):
+            record.args = tuple(self._cap(arg) for arg in args)
+        elif isinstance(args, Mapping):
+            record.args = {key: self._cap(value) for key, value in args.items()}
+        return truncate(record.getMessage(), self.max_chars)
+
+    @override
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = self._message(record)
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+        record.stack_info = None
+        span = current_span()
+        # The writer thread has no access to the request's context
+        record.__dict__["trace_id"] = span.trace_id if span is not None else None
+        return record
+
+    @override
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            if self.dropped:
+                self.queue.put_nowait(
+                    logging.LogRecord(
+                        __name__,
+                        logging.WARNING,
+                        __file__,
+                        0,
+                        f"Log queue full, dropped {self.dropped} records",
+                        None,
+                        None,
+                    )
+                )
+                self.dropped = 0
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def setup_logging(config: LoggingConfig, stream: TextIO | None = None) -> QueueListener:
+    """Route all logging through a queue to a writer thread; stop the returned listener on exit.
+
+    Sampling runs before a record is queued, redaction and formatting on the writer thread.
+    """
+    log_queue: queue.Queue[logging.LogRecord] = queue.Queue(config.queue_size)
+    output = logging.StreamHandler(stream or sys.stderr)
+    output.addFilter(RedactingFilter())
+    output.setFormatter(
+        JsonFormatter() if config.format == FORMAT_JSON else logging.Formatter(TEXT_FORMAT)
+    )
+    handler = CappedQueueHandler(log_queue, config.max_chars)
+    handler.addFilter(SamplingFilter(config.sampling))
+
+    root = logging.getLogger()
+    for old in list(root.handlers):
+        root.removeHandler(old)
+    root.addHandler(handler)
+    for name, level in LIBRARY_LEVELS.items():
+        logging.getLogger(name).setLevel(level)
+    logging.getLogger("lsimons_bot").setLevel(config.level.upper())
+
+    listener = QueueListener(log_queue, output, respect_handler_level=True)
+    listener.start()
+    return listener
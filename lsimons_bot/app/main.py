@@ -1,46 +1,415 @@
-from typing import cast, override
+import asyncio
+import logging
+import signal
+from pathlib import Path
+from typing import Any, cast, override
 
-from lsimons_llm import load_config
-from lsimons_llm.async_client import AsyncLLMClient
 from slack_bolt.adapter.socket_mode.async_handler import AsyncSocketModeHandler
 from slack_bolt.async_app import AsyncApp
+from slack_sdk.web.async_client import AsyncWebClient
 
-from lsimons_bot.app.config import get_env_vars
-from lsimons_bot.bot.bot import Bot, Messages
-from lsimons_bot.slack import assistant, home, messages
+from lsimons_bot.app.config import get_env_vars, get_optional_env_vars
+from lsimons_bot.app.logs import LoggingConfig, parse_sampling
+from lsimons_bot.app.profiling import Profiler, ProfilingConfig
+from lsimons_bot.app.snapshot import read_snapshot, write_snapshot
+from lsimons_bot.blog.config import get_env_vars as get_blog_env_vars
+from lsimons_bot.blog.publish import BlogClients, create_clients
+from lsimons_bot.blog.scheduler import BlogScheduler
+from lsimons_bot.bot.bot import (
+    MAX_TITLE_CHARS,
+    Bot,
+    Message,
+    Messages,
+    ThreadKey,
+    short_title,
+    title_prompt,
+)
+from lsimons_bot.bot.memory import MemoryRules, ThreadMemory, summary_prompt
+from lsimons_bot.bot.metrics import LLMMetrics
+from lsimons_bot.bot.router import ModelRouter, Route, RoutingRules
+from lsimons_bot.llm.client import LLMClient, supports_cache_control
+from lsimons_bot.llm.resilience import ResilienceConfig, ResilientLLM
+from lsimons_bot.retrieval.index import IndexFormatError, RetrievalIndex
+from lsimons_bot.retrieval.retriever import Retriever
+from lsimons_bot.slack import assistant, home, messages, rate_limit, users
+from lsimons_bot.slack.assistant.resume import resume_requests
+from lsimons_bot.slack.home.home_view import HomeView
+from lsimons_bot.slack.rate_limit import RateLimitedWebClient, SlackRateLimiter
+from lsimons_bot.slack.users import UserDirectory
+from lsimons_bot.slack.work_log import WorkLog
+from lsimons_bot.slack.work_queue import WorkQueue
+from lsimons_bot.tracing.export import JsonlExporter
+from lsimons_bot.tracing.trace import STATUS_ERROR, current_span, set_exporter, span
+
+logger = logging.getLogger(__name__)
+
+
+LLM_ERROR_MESSAGE = (
+    "Sorry, I couldn't get an answer from my language model in time."
+    " Please try again in a little while."
+)
 
 
 class LLMBot(Bot):
-    def __init__(self, llm: AsyncLLMClient) -> None:
-        super().__init__()
-        self.llm: AsyncLLMClient = llm
+    def __init__(
+        self,
+        llm: LLMClient,
+        router: ModelRouter | None = None,
+        prompt_caching: str = "auto",
+        resilience: ResilienceConfig | None = None,
+        memory: MemoryRules | None = None,
+        retriever: Retriever | None = None,
+    ) -> None:
+        super().__init__(prompt_caching=prompt_caching_enabled(prompt_caching, llm.model))
+        self.llm: LLMClient = llm
+        self.resilient_llm: ResilientLLM = ResilientLLM(llm, resilience)
+        self.router: ModelRouter = router or ModelRouter(llm.model)
+        self.prompt_caching_setting: str = prompt_caching
+        self.metrics: LLMMetrics = LLMMetrics()
+        self.memory: ThreadMemory | None = None
+        if memory is not None:
+            self.memory = ThreadMemory(self._summarize, memory)
+        self.retriever: Retriever | None = retriever
+        self.summary_model: str = (
+            (memory and memory.summary_model) or self.router.rules.fast_model or llm.model
+        )
+
+    @override
+    async def chat(self, messages: Messages, thread: ThreadKey | None = None) -> str:
+        with span("bot.chat") as current:
+            messages = list(messages)
+            if thread is not None and self.memory is not None:
+                messages = self.memory.compact(thread, messages)
+            route = self.router.route(messages)
+            current.set("route", route.name)
+            current.set("model", route.model)
+            prompt_caching = prompt_caching_enabled(self.prompt_caching_setting, route.model)
+            all_messages = self.build_messages(
+                messages, prompt_caching=prompt_caching, context=self._context(messages)
+            )
+            return await self._complete(all_messages, route)
 
     @override
     async def chat_completion(self, messages: Messages) -> str:
-        return await self.llm.chat(cast("list[dict[str, object]]", list(messages)))
+        return await self._complete(list(messages), self.router.primary)
+
+    def _context(self, messages: list[Message]) -> str | None:
+        """Reference notes for the newest turn from the retrieval index, if there is one."""
+        if self.retriever is None or not messages:
+            return None
+        content = messages[-1].get("content")
+        if not isinstance(content, str) or not content.strip():
+            return None
+        return self.retriever.context(content)
+
+    def snapshot(self) -> dict[str, Any]:
+        """What the bot learned while running: route stats, latencies and thread summaries."""
+        return {
+            "router": self.router.snapshot(),
+            "ttft": self.resilient_llm.snapshot(),
+            "memory": self.memory.snapshot() if self.memory is not None else [],
+        }
+
+    def restore(self, data: dict[str, Any], max_age: float) -> None:
+        self.router.restore(cast(dict[str, dict[str, Any]], data.get("router", {})))
+        self.resilient_llm.restore(cast(dict[str, dict[str, Any]], data.get("ttft", {})))
+        if self.memory is not None:
+            self.memory.restore(cast(list[dict[str, Any]], data.get("memory", [])), max_age)
+
+    @override
+    async def title(self, text: str) -> str:
+        if len(text) <= MAX_TITLE_CHARS:
+            return short_title(text)
+        result = await self.llm.chat_completion(title_prompt(text), model=self.summary_model)
+        return short_title(result.content.strip().strip("\"'"))
+
+    async def _summarize(self, previous: str, turns: list[Message]) -> str:
+        result = await self.llm.chat_completion(
+            summary_prompt(previous, turns), model=self.summary_model
+        )
+        return result.content
+
+    async def _complete(self, messages: list[Message], route: Route) -> str:
+        try:
+            result = await self.resilient_llm.chat_completion(messages, model=route.model)
+        except Exception as e:
+            logger.error("LLM request on %s route failed: %r", route.name, e)
+            current = current_span()
+            if current is not None:
+                current.status, current.error = STATUS_ERROR, repr(e)
+            return LLM_ERROR_MESSAGE
+        self.router.record(route, result.duration, result.time_to_first_token, result.prompt_tokens)
+        self.metrics.record(result)
+        logger.debug(
+            "LLM %s (%s route, %s): %d prompt tokens (%d cached, %d written), ttft %s, %.2fs",
+            result.model,
+            route.name,
+            route.reason,
+            result.prompt_tokens,
+            result.cached_tokens,
+            result.cache_write_tokens,
+            f"{result.time_to_first_token:.2f}s" if result.time_to_first_token else "n/a",
+            result.duration,
+        )
+        logger.debug("LLM metrics: %s", self.metrics.summary())
+        logger.debug("Route stats: %s", self.router.summary())
+        return result.content
+
+
+def prompt_caching_enabled(setting: str, model: str) -> bool:
+    setting = setting.lower()
+    if setting == "auto":
+        return supports_cache_control(model)
+    return setting in ("1", "true", "on")
+
+
+def make_router(model: str, optional_vars: dict[str, str]) -> ModelRouter:
+    rules = RoutingRules(
+        fast_model=optional_vars["ASSISTANT_FAST_MODEL"] or None,
+        max_fast_tokens=int(optional_vars["ASSISTANT_ROUTER_MAX_FAST_TOKENS"]),
+        max_fast_turns=int(optional_vars["ASSISTANT_ROUTER_MAX_FAST_TURNS"]),
+        max_fast_message_chars=int(optional_vars["ASSISTANT_ROUTER_MAX_FAST_CHARS"]),
+    )
+    return ModelRouter(model, rules)
+
+
+def make_resilience_config(optional_vars: dict[str, str]) -> ResilienceConfig:
+    return ResilienceConfig(
+        fallback_model=optional_vars["ASSISTANT_FALLBACK_MODEL"] or None,
+        budget=float(optional_vars["ASSISTANT_LATENCY_BUDGET_SECONDS"]),
+        default_hedge_delay=float(optional_vars["ASSISTANT_HEDGE_DELAY_SECONDS"]),
+    )
+
+
+def make_memory_rules(optional_vars: dict[str, str]) -> MemoryRules | None:
+    max_turns = int(optional_vars["ASSISTANT_MEMORY_MAX_TURNS"])
+    if max_turns <= 0:
+        return None
+    return MemoryRules(
+        max_turns=max_turns,
+        keep_recent=int(optional_vars["ASSISTANT_MEMORY_KEEP_TURNS"]),
+        summary_model=optional_vars["ASSISTANT_SUMMARY_MODEL"] or None,
+    )
+
+
+def make_retriever(optional_vars: dict[str, str]) -> Retriever | None:
+    path = optional_vars["RETRIEVAL_INDEX"]
+    if not path:
+        return None
+    try:
+        index = RetrievalIndex.open(Path(path))
+    except (OSError, IndexFormatError) as e:
+        logger.warning("Retrieval index %s not usable, retrieval disabled: %s", path, e)
+        return None
+    logger.info("Retrieval index %s: %d chunks, %d terms", path, index.chunks, index.terms)
+    return Retriever(
+        index,
+        top_k=int(optional_vars["RETRIEVAL_TOP_K"]),
+        max_tokens=int(optional_vars["RETRIEVAL_MAX_TOKENS"]),
+    )
+
+
+def make_profiling_config(optional_vars: dict[str, str]) -> ProfilingConfig:
+    slow_request_seconds = optional_vars["PROFILING_SLOW_REQUEST_SECONDS"]
+    return ProfilingConfig(
+        directory=Path(optional_vars["PROFILING_DIR"]),
+        seconds=float(optional_vars["PROFILING_SECONDS"]),
+        slow_request_seconds=float(slow_request_seconds) if slow_request_seconds else None,
+    )
+
+
+def make_logging_config(optional_vars: dict[str, str]) -> LoggingConfig:
+    return LoggingConfig(
+        format=optional_vars["LOG_FORMAT"],
+        level=optional_vars["LOG_LEVEL"],
+        sampling=parse_sampling(optional_vars["LOG_SAMPLING"]),
+        max_chars=int(optional_vars["LOG_MAX_CHARS"]),
+    )
+
+
+def make_span_exporter(optional_vars: dict[str, str]) -> JsonlExporter | None:
+    path = optional_vars["TRACING_FILE"]
+    if not path:
+        return None
+    return JsonlExporter(Path(path), optional_vars["TRACING_FORMAT"])
+
+
+def make_work_queue(optional_vars: dict[str, str]) -> WorkQueue | None:
+    workers = int(optional_vars["WORK_QUEUE_WORKERS"])
+    if workers <= 0:
+        return None
+    return WorkQueue(workers, max_pending=int(optional_vars["WORK_QUEUE_MAX_PENDING"]))
+
+
+def make_work_log(optional_vars: dict[str, str]) -> WorkLog | None:
+    path = optional_vars["ASSISTANT_WORK_LOG"]
+    return WorkLog(Path(path)) if path else None
+
+
+def make_snapshot_path(optional_vars: dict[str, str]) -> Path | None:
+    path = optional_vars["SNAPSHOT_FILE"]
+    return Path(path) if path else None
+
+
+def restore_snapshot(bot: LLMBot, path: Path, max_age: float) -> None:
+    data = read_snapshot(path, max_age)
+    if data is None:
+        return
+    try:
+        bot.restore(data, max_age)
+    except (AttributeError, KeyError, TypeError, ValueError) as e:
+        logger.warning("Could not restore snapshot %s: %r", path, e)
+        return
+    logger.info("Restored caches from %s", path)
+
+
+def save_snapshot(bot: LLMBot, path: Path) -> None:
+    try:
+        write_snapshot(path, bot.snapshot())
+    except OSError as e:
+        logger.error("Could not write snapshot %s: %r", path, e)
+        return
+    logger.info("Saved caches to %s", path)
+
+
+def install_stop_handler(loop: asyncio.AbstractEventLoop, stop: asyncio.Event) -> None:
+    try:
+        loop.add_signal_handler(signal.SIGTERM, stop.set)
+    except NotImplementedError:
+        # add_signal_handler does not exist on Windows
+        logger.info("SIGTERM handling not supported on this platform")
+
+
+async def drain(bot: LLMBot, work_queue: WorkQueue | None, timeout: float) -> None:
+    """Let queued requests and background summaries finish, for at most `timeout` seconds."""
+    try:
+        async with asyncio.timeout(timeout):
+            if work_queue is not None:
+                await work_queue.drain()
+            if bot.memory is not None:
+                await bot.memory.wait()
+    except TimeoutError:
+        logger.warning("Requests still running after %.0fs, stopping anyway", timeout)
+
+
+def make_user_directory(optional_vars: dict[str, str]) -> UserDirectory | None:
+    reload_hours = float(optional_vars["SLACK_USER_DIRECTORY_RELOAD_HOURS"] or 0)
+    return UserDirectory() if reload_hours > 0 else None
+
+
+def make_slack_client(token: str, optional_vars: dict[str, str]) -> AsyncWebClient:
+    base_url = optional_vars["SLACK_API_URL"] or AsyncWebClient.BASE_URL
+    # The Socket Mode handler opens its connection with the app's client, so it follows along
+    return AsyncWebClient(token=token, base_url=base_url)
+
+
+def make_blog_clients() -> BlogClients | None:
+    try:
+        return create_clients(get_blog_env_vars())
+    except Exception as e:
+        logger.info("Blog not configured, blog features disabled: %s", e)
+        return None
+
+
+def make_blog_scheduler(
+    blog_clients: BlogClients | None, optional_vars: dict[str, str]
+) -> BlogScheduler | None:
+    interval_minutes = optional_vars["BLOG_SCHEDULER_INTERVAL_MINUTES"]
+    if blog_clients is None or not interval_minutes:
+        return None
+    return BlogScheduler(blog_clients, interval=float(interval_minutes) * 60)
 
 
 async def main() -> None:
     env_vars = get_env_vars()
+    optional_vars = get_optional_env_vars()
     slack_bot_token = env_vars["SLACK_BOT_TOKEN"]
     slack_app_token = env_vars["SLACK_APP_TOKEN"]
 
-    config = load_config(
+    model = env_vars["ASSISTANT_MODEL"]
+    llm = LLMClient(
         base_url=env_vars["LITELLM_API_BASE"],
         api_key=env_vars["LITELLM_API_KEY"],
-        model=env_vars["ASSISTANT_MODEL"],
+        model=model,
+    )
+
+    bot = LLMBot(
+        llm,
+        router=make_router(model, optional_vars),
+        prompt_caching=optional_vars["ASSISTANT_PROMPT_CACHING"],
+        resilience=make_resilience_config(optional_vars),
+        memory=make_memory_rules(optional_vars),
+        retriever=make_retriever(optional_vars),
     )
-    llm = AsyncLLMClient(config)
+    snapshot_path = make_snapshot_path(optional_vars)
+    if snapshot_path is not None:
+        max_age = float(optional_vars["SNAPSHOT_MAX_AGE_HOURS"]) * 3600
+        restore_snapshot(bot, snapshot_path, max_age)
 
-    bot = LLMBot(llm)
+    blog_clients = make_blog_clients()
+    blog_scheduler = make_blog_scheduler(blog_clients, optional_vars)
+    if blog_clients is not None:
+        home_view = HomeView(blog_clients.wp, blog_clients.gh, blog_scheduler)
+    else:
+        home_view = HomeView()
 
     app = AsyncApp(
-        token=slack_bot_token,
+        client=make_slack_client(slack_bot_token, optional_vars),
         ignoring_self_assistant_message_events_enabled=False,
     )
-    assistant.register(app, bot)
-    messages.register(app)
-    home.register(app)
+    profiler = Profiler(make_profiling_config(optional_vars))
+    profiler.install_signal_handlers(asyncio.get_running_loop())
+    span_exporter = make_span_exporter(optional_vars)
+    if span_exporter is not None:
+        logger.info("Tracing to %s", span_exporter.path)
+        set_exporter(span_exporter)
+
+    work_queue = make_work_queue(optional_vars)
+    work_log = make_work_log(optional_vars)
+    user_directory = make_user_directory(optional_vars)
+    limiter = SlackRateLimiter()
+    client = RateLimitedWebClient.wrap(app.client, limiter)
+
+    rate_limit.register(app, limiter)
+    assistant.register(app, bot, profiler, work_queue, work_log, user_directory)
+    messages.register(app, work_queue)
+    home.register(app, home_view)
+
+    background_tasks = [asyncio.create_task(home_view.run())]
+    if user_directory is not None:
+        users.register(app, user_directory)
+        reload_interval = float(optional_vars["SLACK_USER_DIRECTORY_RELOAD_HOURS"]) * 3600
+        background_tasks.append(asyncio.create_task(user_directory.run(client, reload_interval)))
+    if work_queue is not None:
+        background_tasks.append(asyncio.create_task(work_queue.run()))
+    if work_log is not None:
+        work_log.prune()
+        background_tasks.append(asyncio.create_task(work_log.run()))
+        background_tasks.append(
+            asyncio.create_task(resume_requests(client, bot, work_log, work_queue, user_directory))
+        )
+    if blog_scheduler is not None:
+        logger.info("Blog scheduler enabled, every %.0f minutes", blog_scheduler.interval / 60)
+        background_tasks.append(asyncio.create_task(blog_scheduler.run()))
 
+    stop = asyncio.Event()
+    install_stop_handler(asyncio.get_running_loop(), stop)
     handler = AsyncSocketModeHandler(app, slack_app_token)
-    await handler.start_async()
+    connection = asyncio.create_task(handler.start_async())
+    stopping = asyncio.create_task(stop.wait())
+    try:
+        _ = await asyncio.wait([connection, stopping], return_when=asyncio.FIRST_COMPLETED)
+        if connection.done():
+            connection.result()
+        else:
+            logger.info("SIGTERM received, finishing in-flight requests")
+            await handler.close_async()
+            await drain(bot, work_queue, float(optional_vars["SHUTDOWN_DRAIN_SECONDS"]))
+    finally:
+        for task in [connection, stopping, *background_tasks]:
+            _ = task.cancel()
+        if snapshot_path is not None:
+            save_snapshot(bot, snapshot_path)
+        if span_exporter is not None:
+            set_exporter(None)
+            span_exporter.close()
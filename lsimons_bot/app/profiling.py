@@ -0,0 +1,184 @@
+import asyncio
+import logging
+import signal
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, deque
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from types import FrameType
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DIRECTORY = Path("profiles")
+DEFAULT_SECONDS = 30.0
+SAMPLE_INTERVAL = 0.005
+# About ten minutes of samples at the default interval
+MAX_SAMPLES = 120_000
+TOP_ALLOCATIONS = 25
+
+
+@dataclass
+class ProfilingConfig:
+    directory: Path = DEFAULT_DIRECTORY
+    # Length of a profile started with SIGUSR1
+    seconds: float = DEFAULT_SECONDS
+    # Save a profile for every tracked request slower than this; None disables it
+    slow_request_seconds: float | None = None
+    interval: float = SAMPLE_INTERVAL
+    top_allocations: int = TOP_ALLOCATIONS
+
+
+def folded_stack(frame: FrameType | None) -> str:
+    """A stack in the collapsed format of flamegraph.pl and speedscope, root frame first."""
+    frames: list[str] = []
+    while frame is not None:
+        code = frame.f_code
+        frames.append(f"{code.co_qualname} ({Path(code.co_filename).name}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(frames))
+
+
+def write_folded(path: Path, stacks: Counter[str]) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    _ = path.write_text("".join(f"{stack} {count}\n" for stack, count in stacks.most_common()))
+    return path
+
+
+class StackSampler:
+    """Samples the stack of one thread, normally the event loop's, from a background thread.
+
+    Sampling runs only while someone holds it (`acquire`/`release`), so an idle bot pays
+    nothing. Samples are kept with their time, so overlapping users each get their own window.
+    """
+
+    def __init__(
+        self, thread_id: int, interval: float = SAMPLE_INTERVAL, max_samples: int = MAX_SAMPLES
+    ) -> None:
+        self.thread_id: int = thread_id
+        self.interval: float = interval
+        self.samples: deque[tuple[float, str]] = deque(maxlen=max_samples)
+        self._users: int = 0
+        self._lock: threading.Lock = threading.Lock()
+        self._stop: threading.Event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def acquire(self) -> None:
+        with self._lock:
+            self._users += 1
+            if self._thread is None:
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+                self._thread.start()
+
+    def release(self) -> None:
+        with self._lock:
+            self._users -= 1
+            if self._users > 0 or self._thread is None:
+                return
+            self._stop.set()
+            thread, self._thread = self._thread, None
+        thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)  # pyright: ignore[reportPrivateUsage]
+            if frame is not None:
+                self.samples.append((time.monotonic(), folded_stack(frame)))
+
+    def between(self, start: float, end: float) -> Counter[str]:
+        return Counter(stack for ts, stack in list(self.samples) if start <= ts <= end)
+
+
+class Profiler:
+    """On-demand profiling of the running bot.
+
+    - SIGUSR1 samples the event loop for `config.seconds` and writes a `.folded` flame graph
+    - SIGUSR2 starts tracemalloc, then on every next signal writes the top allocation changes
+      since the previous one
+    - `track()` around a request writes a flame graph of the loop when it took longer than
+      `config.slow_request_seconds`
+    """
+
+    def __init__(self, config: ProfilingConfig | None = None, thread_id: int | None = None) -> None:
+        self.config: ProfilingConfig = config or ProfilingConfig()
+        self.sampler: StackSampler = StackSampler(
+            thread_id if thread_id is not None else threading.get_ident(), self.config.interval
+        )
+        self._snapshot: tracemalloc.Snapshot | None = None
+        self._tasks: set[asyncio.Task[Path]] = set()
+
+    def _path(self, label: str, suffix: str) -> Path:
+        stamp = datetime.now(UTC).strftime("%Y%m%dT%H%M%S.%f")
+        return self.config.directory / f"{stamp}-{label}{suffix}"
+
+    async def profile(self, seconds: float | None = None) -> Path:
+        """Sample the event loop for `seconds` and write the stacks; returns the file."""
+        seconds = self.config.seconds if seconds is None else seconds
+        start = time.monotonic()
+        self.sampler.acquire()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            self.sampler.release()
+        path = write_folded(
+            self._path("loop", ".folded"), self.sampler.between(start, time.monotonic())
+        )
+        logger.info("Wrote %.0fs event loop profile to %s", seconds, path)
+        return path
+
+    @asynccontextmanager
+    async def track(self, label: str) -> AsyncGenerator[None]:
+        """Profile the block, keeping the result only if it is slow."""
+        threshold = self.config.slow_request_seconds
+        if threshold is None:
+            yield
+            return
+        start = time.monotonic()
+        self.sampler.acquire()
+        try:
+            yield
+        finally:
+            self.sampler.release()
+            end = time.monotonic()
+            if end - start > threshold:
+                path = write_folded(self._path(label, ".folded"), self.sampler.between(start, end))
+                logger.warning("%s took %.1fs, profile in %s", label, end - start, path)
+
+    def snapshot_memory(self) -> Path:
+        """Take a tracemalloc snapshot and write the biggest changes since the previous one."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, tracemalloc.__file__)]
+        )
+        top = self.config.top_allocations
+        if self._snapshot is None:
+            lines = [str(stat) for stat in snapshot.statistics("lineno")[:top]]
+        else:
+            lines = [str(stat) for stat in snapshot.compare_to(self._snapshot, "lineno")[:top]]
+        self._snapshot = snapshot
+        path = self._path("memory", ".txt")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _ = path.write_text("\n".join(lines) + "\n")
+        logger.info("Wrote memory snapshot to %s", path)
+        return path
+
+    def _start_profile(self) -> None:
+        task = asyncio.create_task(self.profile())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def install_signal_handlers(self, loop: asyncio.AbstractEventLoop) -> None:
+        # Neither the signals nor add_signal_handler exist on Windows
+        if not hasattr(signal, "SIGUSR1"):
+            logger.info("Profiling signals not supported on this platform")
+            return
+        loop.add_signal_handler(signal.SIGUSR1, self._start_profile)
+        loop.add_signal_handler(signal.SIGUSR2, self.snapshot_memory)
+        logger.debug("Profiling: SIGUSR1 profiles the loop, SIGUSR2 snapshots memory")
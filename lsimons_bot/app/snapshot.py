@@ -0,0 +1,65 @@
+import json
+import logging
+import os
+import struct
+import time
+import zlib
+from pathlib import Path
+from typing import Any, cast
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"LSBS"
+# Bump when the layout of the snapshotted data changes; older snapshots are then ignored
+VERSION = 1
+# Magic, version and the time the snapshot was written
+HEADER = struct.Struct("<4sHd")
+DEFAULT_MAX_AGE = 24 * 3600.0
+
+
+def encode_snapshot(data: dict[str, Any], created: float | None = None) -> bytes:
+    body = zlib.compress(json.dumps(data, separators=(",", ":")).encode())
+    return HEADER.pack(MAGIC, VERSION, time.time() if created is None else created) + body
+
+
+def decode_snapshot(raw: bytes, max_age: float = DEFAULT_MAX_AGE) -> dict[str, Any] | None:
+    """The snapshotted data, or None if `raw` is not a current snapshot of this version."""
+    if len(raw) < HEADER.size:
+        logger.warning("Snapshot too short, ignoring it")
+        return None
+    magic, version, created = cast(tuple[bytes, int, float], HEADER.unpack_from(raw))
+    if magic != MAGIC or version != VERSION:
+        logger.warning("Snapshot has format %r version %d, ignoring it", magic, version)
+        return None
+    age = time.time() - created
+    if age > max_age:
+        logger.info("Snapshot is %.0f minutes old, ignoring it", age / 60)
+        return None
+    try:
+        data = cast(object, json.loads(zlib.decompress(raw[HEADER.size :])))
+    except (zlib.error, ValueError) as e:
+        logger.warning("Snapshot is corrupt, ignoring it: %r", e)
+        return None
+    if not isinstance(data, dict):
+        logger.warning("Snapshot holds a %s, not an object, ignoring it", type(data).__name__)
+        return None
+    return cast(dict[str, Any], data)
+
+
+def write_snapshot(path: Path, data: dict[str, Any]) -> None:
+    """Write `data` to `path`, replacing it atomically so a reader never sees half a snapshot."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.tmp")
+    _ = tmp.write_bytes(encode_snapshot(data))
+    os.replace(tmp, path)
+
+
+def read_snapshot(path: Path, max_age: float = DEFAULT_MAX_AGE) -> dict[str, Any] | None:
+    try:
+        raw = path.read_bytes()
+    except FileNotFoundError:
+        return None
+    except OSError as e:
+        logger.warning("Could not read snapshot %s, ignoring it: %r", path, e)
+        return None
+    return decode_snapshot(raw, max_age)
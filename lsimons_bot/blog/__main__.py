@@ -3,24 +3,83 @@ import asyncio
 import logging
 import sys
 from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
 
-from lsimons_bot.blog.publish import check_and_publish
+from lsimons_bot.blog.backfill import (
+    DEFAULT_CHECKPOINT,
+    DEFAULT_CONCURRENCY,
+    DEFAULT_WINDOW_DAYS,
+    backfill,
+)
+from lsimons_bot.blog.config import get_env_vars
+from lsimons_bot.blog.publish import check_and_publish, create_clients
 
 
 @dataclass
 class BlogArgs:
     dry_run: bool = False
     verbose: bool = False
+    backfill: list[str] | None = None
+    window_days: int = DEFAULT_WINDOW_DAYS
+    output_dir: Path | None = None
+    checkpoint: Path = DEFAULT_CHECKPOINT
+    concurrency: int = DEFAULT_CONCURRENCY
 
 
 def _parse_args() -> BlogArgs:
     parser = argparse.ArgumentParser(description="Publish blog posts about recent GitHub activity")
     _ = parser.add_argument("--dry-run", action="store_true", help="Check but don't publish")
     _ = parser.add_argument("--verbose", "-v", action="store_true", help="Enable verbose logging")
+    _ = parser.add_argument(
+        "--backfill",
+        nargs=2,
+        metavar=("FROM", "TO"),
+        help="Write drafts for every window between two ISO dates instead of publishing",
+    )
+    _ = parser.add_argument(
+        "--window-days", type=int, help=f"Backfill window size (default {DEFAULT_WINDOW_DAYS})"
+    )
+    _ = parser.add_argument(
+        "--output-dir", type=Path, help="Write backfill drafts here instead of to WordPress"
+    )
+    _ = parser.add_argument(
+        "--checkpoint", type=Path, help=f"Backfill checkpoint file (default {DEFAULT_CHECKPOINT})"
+    )
+    _ = parser.add_argument(
+        "--concurrency",
+        type=int,
+        help=f"Drafts generated at once (default {DEFAULT_CONCURRENCY})",
+    )
     ns = parser.parse_args(namespace=BlogArgs())
     return ns
 
 
+def _parse_date(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value)
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=UTC)
+
+
+def run_backfill(args: BlogArgs) -> int:
+    assert args.backfill is not None
+    start, end = (_parse_date(value) for value in args.backfill)
+    results = asyncio.run(
+        backfill(
+            create_clients(get_env_vars()),
+            start,
+            end,
+            window_days=args.window_days,
+            output_dir=args.output_dir,
+            checkpoint_path=args.checkpoint,
+            concurrency=args.concurrency,
+            dry_run=args.dry_run,
+        )
+    )
+    for result in results:
+        print(f"{result.window.key}: {result.status} {result.detail}")
+    return 1 if any(result.failed for result in results) else 0
+
+
 def main() -> int:
     args = _parse_args()
 
@@ -33,6 +92,8 @@ def main() -> int:
     )
 
     try:
+        if args.backfill:
+            return run_backfill(args)
         result = asyncio.run(check_and_publish(dry_run=dry_run))
     except Exception as e:
         logging.error("Failed: %s", e)
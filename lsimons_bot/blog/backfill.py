@@ -0,0 +1,181 @@
+import asyncio
+import json
+import logging
+import os
+from bisect import bisect_left
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta
+from html import escape
+from pathlib import Path
+from typing import Self, cast
+
+from lsimons_bot.blog.content import generate_blog_post
+from lsimons_bot.blog.github import CommitInfo, CommitStats
+from lsimons_bot.blog.noise import fold_noise
+from lsimons_bot.blog.publish import BlogClients
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WINDOW_DAYS = 7
+DEFAULT_CONCURRENCY = 3
+DEFAULT_CHECKPOINT = Path(".blog-backfill.json")
+
+
+@dataclass
+class BackfillWindow:
+    start: datetime
+    end: datetime
+
+    @property
+    def key(self) -> str:
+        return f"{self.start.date().isoformat()}..{self.end.date().isoformat()}"
+
+
+@dataclass
+class WindowResult:
+    window: BackfillWindow
+    status: str
+    detail: str = ""
+
+    @property
+    def failed(self) -> bool:
+        return self.status == "failed"
+
+
+@dataclass
+class Checkpoint:
+    """Finished windows and their outcome, saved after every window so a rerun resumes."""
+
+    path: Path
+    done: dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: Path) -> Self:
+        if not path.exists():
+            return cls(path)
+        data = cast(dict[str, dict[str, str]], json.loads(path.read_text()))
+        return cls(path, dict(data.get("done", {})))
+
+    def record(self, result: WindowResult) -> None:
+        self.done[result.window.key] = f"{result.status}: {result.detail}"
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        _ = tmp.write_text(json.dumps({"done": self.done}, indent=2, sort_keys=True))
+        os.replace(tmp, self.path)
+
+
+def split_windows(
+    start: datetime, end: datetime, days: int = DEFAULT_WINDOW_DAYS
+) -> list[BackfillWindow]:
+    windows: list[BackfillWindow] = []
+    step = timedelta(days=days)
+    current = start
+    while current < end:
+        windows.append(BackfillWindow(current, min(current + step, end)))
+        current += step
+    return windows
+
+
+def partition(commits: list[CommitInfo], windows: list[BackfillWindow]) -> list[CommitStats]:
+    """Split one crawl's commits over the windows, by commit date."""
+    ordered = sorted(commits, key=lambda c: c.date)
+    dates = [c.date for c in ordered]
+    return [
+        CommitStats.from_commits(
+            ordered[bisect_left(dates, window.start) : bisect_left(dates, window.end)]
+        )
+        for window in windows
+    ]
+
+
+def _write_draft(output_dir: Path, window: BackfillWindow, title: str, content: str) -> Path:
+    output_dir.mkdir(parents=True, exist_ok=True)
+    path = output_dir / f"{window.start.date().isoformat()}.html"
+    _ = path.write_text(f"<h1>{escape(title)}</h1>\n{content}\n")
+    return path
+
+
+async def _generate_window(
+    clients: BlogClients,
+    window: BackfillWindow,
+    stats: CommitStats,
+    semaphore: asyncio.Semaphore,
+    output_dir: Path | None,
+) -> WindowResult:
+    if stats.partial:
+        return WindowResult(window, "failed", "GitHub crawl incomplete (rate limit)")
+    stats = fold_noise(stats, clients.noise)
+    if not stats.is_significant():
+        return WindowResult(window, "skipped", f"{stats.total_commits} commits")
+
+    try:
+        async with semaphore:
+            blog_content = await generate_blog_post(clients.llm, stats, clients.summaries)
+        if output_dir is not None:
+            path = _write_draft(output_dir, window, blog_content.title, blog_content.content)
+            return WindowResult(window, "written", str(path))
+        post = await asyncio.to_thread(
+            clients.wp.create_post,
+            title=blog_content.title,
+            content=blog_content.content,
+            status="draft",
+            date=window.end,
+        )
+        return WindowResult(window, "draft", post.link)
+    except Exception as e:
+        logger.error("Backfill of %s failed: %s", window.key, e)
+        return WindowResult(window, "failed", str(e))
+
+
+async def backfill(
+    clients: BlogClients,
+    start: datetime,
+    end: datetime,
+    window_days: int = DEFAULT_WINDOW_DAYS,
+    output_dir: Path | None = None,
+    checkpoint_path: Path = DEFAULT_CHECKPOINT,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    dry_run: bool = False,
+) -> list[WindowResult]:
+    """Write a post draft for every window of `window_days` between `start` and `end`.
+
+    Commits for all windows come from a single GitHub crawl over the whole range. Drafts are
+    generated concurrently, at most `concurrency` at a time, and go to WordPress as drafts or,
+    with `output_dir`, to local HTML files. Windows recorded in the checkpoint file are skipped,
+    so an interrupted backfill picks up where it stopped; failed windows are retried next time.
+    """
+    checkpoint = Checkpoint.load(checkpoint_path)
+    windows = [w for w in split_windows(start, end, window_days) if w.key not in checkpoint.done]
+    if not windows:
+        logger.info("Nothing to backfill, all windows are in %s", checkpoint_path)
+        return []
+
+    logger.info("Backfilling %d windows from %s to %s", len(windows), start, end)
+    stats = await asyncio.to_thread(clients.gh.get_commits_since, windows[0].start, windows[-1].end)
+    per_window = partition(stats.commits, windows)
+    if stats.partial:
+        # Any window may be missing commits; generate none of them as if complete
+        per_window = [replace(window_stats, partial=True) for window_stats in per_window]
+
+    if dry_run:
+        return [
+            WindowResult(
+                window,
+                "planned",
+                f"{window_stats.total_commits} commits{' (partial)' if stats.partial else ''}",
+            )
+            for window, window_stats in zip(windows, per_window, strict=True)
+        ]
+
+    semaphore = asyncio.Semaphore(concurrency)
+    tasks = [
+        asyncio.create_task(_generate_window(clients, window, window_stats, semaphore, output_dir))
+        for window, window_stats in zip(windows, per_window, strict=True)
+    ]
+    results: list[WindowResult] = []
+    for task in asyncio.as_completed(tasks):
+        result = await task
+        if not result.failed:
+            checkpoint.record(result)
+        results.append(result)
+    results.sort(key=lambda r: r.window.start)
+    return results
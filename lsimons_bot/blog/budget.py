@@ -0,0 +1,81 @@
+import logging
+import time
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+
+logger = logging.getLogger(__name__)
+
+# Requests left untouched for other users of the token
+RESERVE = 50
+# Longest a crawl sleeps for a rate limit before it gives up and defers the rest
+MAX_WAIT = 60.0
+# Back-off for a secondary rate limit that came without a Retry-After header
+SECONDARY_BACKOFF = 60.0
+
+
+class RateBudgetExhausted(Exception):
+    """The GitHub rate limit does not allow more requests within `MAX_WAIT`."""
+
+
+@dataclass
+class RateBudget:
+    """GitHub API requests left in the current rate-limit window, shared by all blog operations.
+
+    The primary limit is taken from the `X-RateLimit-Remaining` and `X-RateLimit-Reset` headers
+    of the last response, counted down as requests are spent. A secondary (abuse) limit blocks
+    all requests until its `Retry-After`. `spend()` sleeps through short waits and raises
+    `RateBudgetExhausted` for long ones, so callers can stop and report a partial result.
+    """
+
+    reserve: int = RESERVE
+    max_wait: float = MAX_WAIT
+    remaining: int | None = None
+    # Unix time at which `remaining` resets
+    reset: float = 0.0
+    blocked_until: float = 0.0
+    clock: Callable[[], float] = field(default=time.time, repr=False)
+    sleep: Callable[[float], None] = field(default=time.sleep, repr=False)
+
+    def observe(self, remaining: int, reset: float) -> None:
+        """Record the primary limit as reported by the last response."""
+        if remaining >= 0:
+            self.remaining = remaining
+            self.reset = reset
+
+    def observe_headers(self, headers: Mapping[str, str] | None) -> None:
+        """Record the limits from a (rate limited) response's headers."""
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
+        try:
+            if "x-ratelimit-remaining" in headers:
+                self.observe(
+                    int(headers["x-ratelimit-remaining"]),
+                    float(headers.get("x-ratelimit-reset", 0)),
+                )
+            retry_after = float(headers.get("retry-after", 0))
+        except ValueError:
+            retry_after = 0.0
+        if retry_after or self.remaining != 0:
+            # Out of primary quota is handled by `reset`; anything else is a secondary limit
+            self.blocked_until = self.clock() + (retry_after or SECONDARY_BACKOFF)
+
+    def wait_time(self, requests: int = 1) -> float:
+        now = self.clock()
+        wait = max(0.0, self.blocked_until - now)
+        if self.remaining is not None and self.remaining - requests < self.reserve:
+            wait = max(wait, self.reset - now)
+        return wait
+
+    def spend(self, requests: int = 1) -> None:
+        """Reserve `requests`, first sleeping for a short rate-limit wait if needed."""
+        wait = self.wait_time(requests)
+        if wait > self.max_wait:
+            raise RateBudgetExhausted(f"{self.remaining} requests left, {wait:.0f}s until reset")
+        if wait > 0:
+            logger.info("Waiting %.1fs for the GitHub rate limit", wait)
+            self.sleep(wait)
+            self.blocked_until = 0.0
+            if self.remaining is not None and self.clock() >= self.reset:
+                # A new window started; the next response tells how much is left
+                self.remaining = None
+        if self.remaining is not None:
+            self.remaining -= requests
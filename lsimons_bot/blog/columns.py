@@ -0,0 +1,147 @@
+import math
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, timedelta
+from typing import Protocol, Self
+
+SECONDS_PER_DAY = 86400
+# date.fromordinal() of the Unix epoch
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+class CommitRecord(Protocol):
+    """The fields of `CommitInfo` that the columns are built from."""
+
+    @property
+    def repo_name(self) -> str: ...
+    @property
+    def date(self) -> datetime: ...
+    @property
+    def additions(self) -> int: ...
+    @property
+    def deletions(self) -> int: ...
+
+
+@dataclass(slots=True)
+class RepoTotals:
+    commits: int = 0
+    additions: int = 0
+    deletions: int = 0
+
+    @property
+    def total_lines(self) -> int:
+        return self.additions + self.deletions
+
+
+class CommitColumns:
+    """Column-oriented, time-sorted view of a commit list, for aggregates over long histories.
+
+    Dates, additions and deletions live in `array` columns and repo names are interned and
+    stored once, so thousands of commits take a few bytes each and aggregates are single passes
+    over machine-typed arrays. Time ranges are found by bisecting the sorted timestamps.
+    """
+
+    __slots__: tuple[str, ...] = (
+        "additions",
+        "deletions",
+        "repo_ids",
+        "repos",
+        "timestamps",
+        "_sorted_sizes",
+    )
+
+    def __init__(self, commits: Iterable[CommitRecord] = ()) -> None:
+        self.repos: list[str] = []
+        self.repo_ids: array[int] = array("I")
+        self.timestamps: array[float] = array("d")
+        self.additions: array[int] = array("q")
+        self.deletions: array[int] = array("q")
+        self._sorted_sizes: list[int] | None = None
+
+        index: dict[str, int] = {}
+        for commit in sorted(commits, key=lambda c: c.date):
+            repo_id = index.get(commit.repo_name)
+            if repo_id is None:
+                repo_id = index[commit.repo_name] = len(self.repos)
+                self.repos.append(sys.intern(commit.repo_name))
+            self.repo_ids.append(repo_id)
+            self.timestamps.append(commit.date.timestamp())
+            self.additions.append(commit.additions)
+            self.deletions.append(commit.deletions)
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def _slice(self, start: int, stop: int) -> Self:
+        view = type(self)()
+        view.repos = self.repos
+        view.repo_ids = self.repo_ids[start:stop]
+        view.timestamps = self.timestamps[start:stop]
+        view.additions = self.additions[start:stop]
+        view.deletions = self.deletions[start:stop]
+        return view
+
+    def between(self, start: datetime, end: datetime) -> Self:
+        """Commits with `start <= date < end`."""
+        return self._slice(
+            bisect_left(self.timestamps, start.timestamp()),
+            bisect_left(self.timestamps, end.timestamp()),
+        )
+
+    @property
+    def total_lines(self) -> int:
+        return sum(self.additions) + sum(self.deletions)
+
+    def sizes(self) -> list[int]:
+        return [a + d for a, d in zip(self.additions, self.deletions, strict=True)]
+
+    def max_size(self) -> int:
+        return max(self.sizes(), default=0)
+
+    def size_percentile(self, p: float) -> float:
+        """Nearest-rank percentile of commit size (additions + deletions)."""
+        if self._sorted_sizes is None:
+            self._sorted_sizes = sorted(self.sizes())
+        if not self._sorted_sizes:
+            return 0.0
+        rank = max(0, math.ceil(p / 100 * len(self._sorted_sizes)) - 1)
+        return float(self._sorted_sizes[rank])
+
+    def per_repo_totals(self) -> dict[str, RepoTotals]:
+        totals = [RepoTotals() for _ in self.repos]
+        for repo_id, additions, deletions in zip(
+            self.repo_ids, self.additions, self.deletions, strict=True
+        ):
+            repo = totals[repo_id]
+            repo.commits += 1
+            repo.additions += additions
+            repo.deletions += deletions
+        return {self.repos[i]: t for i, t in enumerate(totals) if t.commits}
+
+    def daily_histogram(self) -> Counter[date]:
+        """Commits per UTC day."""
+        days = Counter(int(ts // SECONDS_PER_DAY) for ts in self.timestamps)
+        return Counter({date.fromordinal(_EPOCH_ORDINAL + day): n for day, n in days.items()})
+
+    def active_days(self) -> int:
+        return len({int(ts // SECONDS_PER_DAY) for ts in self.timestamps})
+
+    def rolling_max(self, window: timedelta) -> int:
+        """The largest number of commits inside any period of length `window`."""
+        width = window.total_seconds()
+        best = 0
+        for i, ts in enumerate(self.timestamps):
+            best = max(best, bisect_right(self.timestamps, ts + width, lo=i) - i)
+        return best
+
+    @property
+    def first(self) -> datetime | None:
+        return datetime.fromtimestamp(self.timestamps[0], UTC) if self.timestamps else None
+
+    @property
+    def last(self) -> datetime | None:
+        return datetime.fromtimestamp(self.timestamps[-1], UTC) if self.timestamps else None
@@ -12,6 +12,14 @@ REQUIRED_VARS = [
     "LLM_DEFAULT_MODEL",
 ]
 
+# Optional settings and their defaults
+OPTIONAL_VARS = {
+    # Comma-separated path patterns left out of commit line counts, on top of lockfiles
+    "BLOG_EXCLUDE_PATHS": "",
+    # Directory for bare git mirrors; when set, commit stats come from git instead of the API
+    "BLOG_MIRROR_DIR": "",
+}
+
 
 def validate_env_vars(required_vars: list[str]) -> dict[str, str]:
     missing_vars: list[str] = []
@@ -32,3 +40,7 @@ def validate_env_vars(required_vars: list[str]) -> dict[str, str]:
 
 def get_env_vars() -> dict[str, str]:
     return validate_env_vars(REQUIRED_VARS)
+
+
+def get_optional_env_vars() -> dict[str, str]:
+    return {var: os.environ.get(var, default) for var, default in OPTIONAL_VARS.items()}
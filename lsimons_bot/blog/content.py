@@ -1,9 +1,11 @@
+import asyncio
+import hashlib
 import logging
 from dataclasses import dataclass
 
 from lsimons_llm.async_client import AsyncLLMClient
 
-from lsimons_bot.blog.github import CommitStats
+from lsimons_bot.blog.github import CommitInfo, CommitStats
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +37,25 @@ Format your response exactly as:
 TITLE: <short punchy title>
 CONTENT: <your HTML content>"""
 
+SUMMARY_PROMPT_TEMPLATE = """Summarize part of my recent coding work for a blog post I'm writing.
+
+{label}:
+{lines}
+
+In 2-4 sentences of plain text, say what this work was about: the problems, the fixes and
+anything notable. Mention concrete file names, APIs or error messages when they matter.
+Reply with the summary only."""
+
+# Up to this many commits go into the post prompt as-is; larger sets are summarized per repo first
+DIRECT_COMMIT_LIMIT = 20
+# Bounds on the size of every prompt and on the number of summaries generated at once
+MAX_COMMITS_PER_SUMMARY = 40
+MAX_SUMMARIES_PER_PROMPT = 20
+MAX_CONCURRENT_SUMMARIES = 4
+MAX_CACHED_SUMMARIES = 1000
+
+type SummaryCache = dict[str, str]
+
 
 @dataclass
 class BlogContent:
@@ -44,17 +65,117 @@ class BlogContent:
 
 def _format_commits(stats: CommitStats) -> str:
     lines: list[str] = []
-    for commit in stats.commits[:20]:
+    for commit in stats.commits:
         lines.append(
             f"- [{commit.repo_name}] {commit.message} (+{commit.additions}/-{commit.deletions})"
         )
     return "\n".join(lines)
 
 
-async def generate_blog_post(llm: AsyncLLMClient, stats: CommitStats) -> BlogContent:
+def _commit_line(commit: CommitInfo) -> str:
+    return f"- {commit.sha} {commit.message} (+{commit.additions}/-{commit.deletions})"
+
+
+def _group_commits(stats: CommitStats) -> list[tuple[str, list[CommitInfo]]]:
+    """Group commits per repository, splitting big repositories into bounded chunks."""
+    by_repo: dict[str, list[CommitInfo]] = {}
+    for commit in stats.commits:
+        by_repo.setdefault(commit.repo_name, []).append(commit)
+
+    groups: list[tuple[str, list[CommitInfo]]] = []
+    for repo_name, commits in sorted(by_repo.items(), key=lambda item: -len(item[1])):
+        for start in range(0, len(commits), MAX_COMMITS_PER_SUMMARY):
+            groups.append((repo_name, commits[start : start + MAX_COMMITS_PER_SUMMARY]))
+    return groups
+
+
+def summary_key(label: str, lines: list[str]) -> str:
+    """Cache key for a summary; commit lines include the sha, so this hashes the commit set."""
+    data = "\n".join([label, *sorted(lines)])
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+class _Summarizer:
+    def __init__(self, llm: AsyncLLMClient, cache: SummaryCache) -> None:
+        self.llm: AsyncLLMClient = llm
+        self.cache: SummaryCache = cache
+        self.semaphore: asyncio.Semaphore = asyncio.Semaphore(MAX_CONCURRENT_SUMMARIES)
+
+    async def summarize(self, label: str, lines: list[str]) -> str:
+        key = summary_key(label, lines)
+        if key in self.cache:
+            return self.cache[key]
+
+        prompt = SUMMARY_PROMPT_TEMPLATE.format(label=label, lines="\n".join(lines))
+        async with self.semaphore:
+            response = await self.llm.chat(
+                messages=[
+                    {"role": "system", "content": SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt},
+                ],
+                temperature=0.3,
+            )
+        summary = " ".join(response.split())
+
+        self.cache[key] = summary
+        while len(self.cache) > MAX_CACHED_SUMMARIES:
+            del self.cache[next(iter(self.cache))]
+        return summary
+
+
+async def summarize_commits(
+    llm: AsyncLLMClient, stats: CommitStats, cache: SummaryCache | None = None
+) -> str:
+    """Map-reduce a large commit set into a bounded list of summaries for the post prompt.
+
+    Commits are summarized per repository, concurrently; if that still leaves too many summaries
+    they are summarized again in batches. Summaries are cached by commit set, so a rerun over
+    mostly the same commits only summarizes the groups that changed.
+    """
+    summarizer = _Summarizer(llm, cache if cache is not None else {})
+    groups = _group_commits(stats)
+    logger.info("Summarizing %d commits in %d groups", len(stats.commits), len(groups))
+
+    summaries = await asyncio.gather(
+        *(
+            summarizer.summarize(
+                f"Commits in {repo_name}", [_commit_line(commit) for commit in commits]
+            )
+            for repo_name, commits in groups
+        )
+    )
+    entries: list[str] = []
+    for (repo_name, commits), summary in zip(groups, summaries, strict=True):
+        added = sum(c.additions for c in commits)
+        deleted = sum(c.deletions for c in commits)
+        entries.append(f"- [{repo_name}] {len(commits)} commits (+{added}/-{deleted}): {summary}")
+
+    while len(entries) > MAX_SUMMARIES_PER_PROMPT:
+        batches = [
+            entries[start : start + MAX_SUMMARIES_PER_PROMPT]
+            for start in range(0, len(entries), MAX_SUMMARIES_PER_PROMPT)
+        ]
+        summaries = await asyncio.gather(
+            *(summarizer.summarize("Summaries of related work", batch) for batch in batches)
+        )
+        entries = [f"- {summary}" for summary in summaries]
+
+    header = (
+        f"{len(stats.commits)} commits in {len({c.repo_name for c in stats.commits})}"
+        " repositories, summarized:"
+    )
+    return "\n".join([header, *entries])
+
+
+async def generate_blog_post(
+    llm: AsyncLLMClient, stats: CommitStats, summary_cache: SummaryCache | None = None
+) -> BlogContent:
     logger.info("Generating blog post from %d commits", stats.total_commits)
 
-    commits_summary = _format_commits(stats)
+    if len(stats.commits) > DIRECT_COMMIT_LIMIT:
+        commits_summary = await summarize_commits(llm, stats, summary_cache)
+    else:
+        commits_summary = _format_commits(stats)
     prompt = POST_PROMPT_TEMPLATE.format(commits_summary=commits_summary)
 
     response = await llm.chat(
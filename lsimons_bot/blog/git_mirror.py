@@ -0,0 +1,236 @@
+import base64
+import json
+import logging
+import os
+import re
+import subprocess
+import sys
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Protocol, cast
+
+from lsimons_bot.blog.budget import RateBudgetExhausted
+from lsimons_bot.blog.github import (
+    GITHUB_AUTHOR_EMAIL,
+    CommitInfo,
+    CommitStats,
+    FileChange,
+    GitHubClient,
+)
+
+logger = logging.getLogger(__name__)
+
+# History fetched before `since`, so the first commit in range has its parent for --numstat
+SHALLOW_MARGIN = timedelta(days=1)
+FETCH_REFSPEC = "+refs/heads/*:refs/heads/*"
+STATE_FILE = "lsimons-mirror.json"
+# How git fails a --shallow-since clone or fetch when no commit is that recent
+NO_SHALLOW_COMMITS = "no commits selected for shallow requests"
+SOURCE_MIRROR = "mirror"
+
+# Separators in the `git log` output: record before each commit, unit between its fields
+_RECORD = "\x1e"
+_UNIT = "\x1f"
+_LOG_FORMAT = f"--format={_RECORD}%H{_UNIT}%aI{_UNIT}%s"
+_NUMSTAT_RE = re.compile(r"^(\d+|-)\t(\d+|-)\t(.+)$")
+
+
+class MirrorRepo(Protocol):
+    """The fields of a PyGithub `Repository` that mirroring needs."""
+
+    @property
+    def name(self) -> str: ...
+    @property
+    def clone_url(self) -> str: ...
+    @property
+    def pushed_at(self) -> datetime: ...
+
+
+@dataclass
+class MirrorState:
+    """What a mirror was last fetched for, to skip fetches of unchanged repos."""
+
+    pushed_at: float = 0.0
+    shallow_since: float = 0.0
+
+
+def _git(*args: str, cwd: Path | None = None, env: dict[str, str] | None = None) -> str:
+    result = subprocess.run(
+        ["git", *args],
+        cwd=cwd,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout
+
+
+def parse_log(output: str, repo_name: str) -> list[CommitInfo]:
+    """Parse `git log --numstat` output in `_LOG_FORMAT` into commits."""
+    commits: list[CommitInfo] = []
+    repo_name = sys.intern(repo_name)
+    for record in output.split(_RECORD)[1:]:
+        header, _, numstat = record.partition("\n")
+        sha, date, message = header.split(_UNIT, 2)
+        files: list[FileChange] = []
+        for line in numstat.splitlines():
+            match = _NUMSTAT_RE.match(line)
+            if match is None:
+                continue
+            # Binary files show "-" instead of line counts
+            additions = int(match[1]) if match[1] != "-" else 0
+            deletions = int(match[2]) if match[2] != "-" else 0
+            files.append(FileChange(match[3], additions, deletions))
+        commits.append(
+            CommitInfo(
+                repo_name=repo_name,
+                sha=sha[:7],
+                message=message,
+                date=datetime.fromisoformat(date).astimezone(UTC),
+                additions=sum(f.additions for f in files),
+                deletions=sum(f.deletions for f in files),
+                files=tuple(files),
+            )
+        )
+    return commits
+
+
+class GitMirror:
+    """Commit source that reads commit stats from local bare mirrors instead of the REST API.
+
+    Each of the user's repos (one API call lists them) is kept as a shallow bare clone in
+    `cache_dir`, fetched only when GitHub reports a push since the last fetch. Commits and their
+    line counts then come from one `git log --numstat` per repo, so a run costs one fetch per
+    changed repo however many commits there are.
+    """
+
+    def __init__(
+        self,
+        github: GitHubClient,
+        cache_dir: Path,
+        author_email: str = GITHUB_AUTHOR_EMAIL,
+    ) -> None:
+        self.github: GitHubClient = github
+        self.cache_dir: Path = cache_dir
+        self.author_email: str = author_email
+
+    def _env(self) -> dict[str, str]:
+        """Environment for git; the token goes in a config variable so it stays out of argv."""
+        env = {**os.environ, "GIT_TERMINAL_PROMPT": "0"}
+        if self.github.token:
+            credentials = base64.b64encode(f"x-access-token:{self.github.token}".encode())
+            env |= {
+                "GIT_CONFIG_COUNT": "1",
+                "GIT_CONFIG_KEY_0": "http.https://github.com/.extraHeader",
+                "GIT_CONFIG_VALUE_0": f"Authorization: Basic {credentials.decode()}",
+            }
+        return env
+
+    def _load_state(self, path: Path) -> MirrorState:
+        state_file = path / STATE_FILE
+        if not state_file.exists():
+            return MirrorState()
+        try:
+            data = cast(dict[str, float], json.loads(state_file.read_text()))
+            return MirrorState(float(data.get("pushed_at", 0)), float(data.get("shallow_since", 0)))
+        except ValueError:
+            return MirrorState()
+
+    def sync(self, repo: MirrorRepo, since: datetime) -> Path:
+        """Clone or fetch `repo` so it holds all commits since `since`; returns the mirror."""
+        path = self.cache_dir / f"{repo.name}.git"
+        shallow_since = since - SHALLOW_MARGIN
+        state = self._load_state(path)
+        pushed_at = repo.pushed_at.timestamp()
+        if (
+            path.exists()
+            and pushed_at <= state.pushed_at
+            and shallow_since.timestamp() >= state.shallow_since
+        ):
+            logger.debug("Mirror of %s is up to date", repo.name)
+            return path
+
+        # Never move the boundary forward; later runs keep the history they already have
+        if state.shallow_since:
+            shallow_since = min(shallow_since, datetime.fromtimestamp(state.shallow_since, UTC))
+        try:
+            self._fetch(path, repo, f"--shallow-since={int(shallow_since.timestamp())}")
+        except subprocess.CalledProcessError as e:
+            if NO_SHALLOW_COMMITS not in cast(str, e.stderr):
+                raise
+            # Nothing was committed since the boundary, so the newest commit is all there is to
+            # keep; the state is still saved so the next run does not fetch again
+            logger.debug("No commits in %s since %s", repo.name, shallow_since)
+            self._fetch(path, repo, "--depth=1")
+        state = MirrorState(pushed_at, shallow_since.timestamp())
+        _ = (path / STATE_FILE).write_text(json.dumps(asdict(state)))
+        return path
+
+    def _fetch(self, path: Path, repo: MirrorRepo, depth: str) -> None:
+        if path.exists():
+            logger.debug("Fetching %s", repo.name)
+            _ = _git(
+                "fetch", "--prune", depth, repo.clone_url, FETCH_REFSPEC, cwd=path, env=self._env()
+            )
+        else:
+            logger.debug("Cloning %s", repo.name)
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            _ = _git("clone", "--bare", depth, repo.clone_url, str(path), env=self._env())
+
+    def _deepen(self, path: Path, repo: MirrorRepo) -> None:
+        _ = _git("fetch", "--deepen=1", repo.clone_url, FETCH_REFSPEC, cwd=path, env=self._env())
+
+    def log(self, path: Path, since: datetime, until: datetime | None) -> str:
+        args = [
+            "log",
+            "HEAD",
+            f"--author=<{re.escape(self.author_email)}>",
+            f"--since={since.isoformat()}",
+            "--numstat",
+            "--no-renames",
+            _LOG_FORMAT,
+        ]
+        if until is not None:
+            args.append(f"--until={until.isoformat()}")
+        return _git(*args, cwd=path)
+
+    def _repo_commits(
+        self, repo: MirrorRepo, since: datetime, until: datetime | None
+    ) -> list[CommitInfo]:
+        path = self.sync(repo, since)
+        output = self.log(path, since, until)
+        shallow = path / "shallow"
+        if shallow.exists() and any(sha in output for sha in shallow.read_text().split() if sha):
+            # A commit at the shallow boundary has no parent, so --numstat would count the
+            # whole tree as added; fetch one more level and read the log again
+            self._deepen(path, repo)
+            output = self.log(path, since, until)
+        return parse_log(output, repo.name)
+
+    def get_commits_since(self, since: datetime, until: datetime | None = None) -> CommitStats:
+        logger.info("Reading commits since %s from mirrors in %s", since, self.cache_dir)
+        commits: list[CommitInfo] = []
+        partial = False
+        try:
+            repos = self.github.list_repos(since)
+        except RateBudgetExhausted as e:
+            logger.warning("GitHub rate limit reached, cannot list repos: %s", e)
+            repos = []
+            partial = True
+        for repo in repos:
+            try:
+                commits.extend(self._repo_commits(repo, since, until))
+            except subprocess.CalledProcessError as e:
+                logger.warning("Error mirroring %s: %s", repo.name, cast(str, e.stderr).strip())
+                partial = True
+        commits.sort(key=lambda c: c.date, reverse=True)
+        logger.info("Found %d commits since %s (via mirrors)", len(commits), since)
+        return CommitStats(
+            commits=commits,
+            total_commits=len(commits),
+            max_lines_in_commit=max((c.total_lines for c in commits), default=0),
+            source=SOURCE_MIRROR,
+            partial=partial,
+        )
@@ -1,16 +1,44 @@
 import logging
+import sys
+from collections.abc import Iterable
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import UTC, datetime
+from typing import Protocol, Self, cast
 
 from github import Github
+from github.Commit import Commit, CommitSearchResult
+from github.GithubException import RateLimitExceededException
+from github.GithubObject import NotSet
+from github.Repository import Repository
+
+from lsimons_bot.blog.budget import RateBudget, RateBudgetExhausted
+from lsimons_bot.blog.columns import CommitColumns
 
 logger = logging.getLogger(__name__)
 
 GITHUB_USERNAME = "lsimons-bot"
 GITHUB_AUTHOR_EMAIL = "bot@leosimons.com"
 
+# The commit search API returns at most this many results for a query
+SEARCH_RESULT_LIMIT = 1000
 
-@dataclass
+# How get_commits_since found the commits
+SOURCE_SEARCH = "search"
+SOURCE_SEARCH_AND_REPOS = "search+repos"
+SOURCE_REPOS = "repos"
+
+# Tries per repo when GitHub answers with a rate-limit error
+MAX_ATTEMPTS = 3
+
+
+@dataclass(slots=True)
+class FileChange:
+    path: str
+    additions: int
+    deletions: int
+
+
+@dataclass(slots=True)
 class CommitInfo:
     repo_name: str
     sha: str
@@ -18,6 +46,9 @@ class CommitInfo:
     date: datetime
     additions: int
     deletions: int
+    files: tuple[FileChange, ...] = ()
+    # Number of commits this entry stands for, after noise folding
+    folded: int = 1
 
     @property
     def total_lines(self) -> int:
@@ -29,57 +60,239 @@ class CommitStats:
     commits: list[CommitInfo]
     total_commits: int
     max_lines_in_commit: int
+    source: str = SOURCE_REPOS
+    # The crawl stopped early (rate limit), so `commits` may be incomplete
+    partial: bool = False
+
+    @classmethod
+    def from_commits(cls, commits: Iterable[CommitInfo]) -> Self:
+        commits = list(commits)
+        return cls(
+            commits=commits,
+            total_commits=len(commits),
+            max_lines_in_commit=max((c.total_lines for c in commits), default=0),
+        )
 
-    def is_significant(self, min_commits: int = 5, min_lines: int = 200) -> bool:
-        return self.total_commits > min_commits or self.max_lines_in_commit > min_lines
+    def columns(self) -> CommitColumns:
+        """Columnar copy of `commits` for aggregates; built on each call, so never stale."""
+        return CommitColumns(self.commits)
+
+    def is_significant(
+        self, min_commits: int = 5, min_lines: int = 200, min_active_days: int = 3
+    ) -> bool:
+        """Worth a post: many commits, one big commit, or work spread over several days."""
+        if self.total_commits > min_commits or self.max_lines_in_commit > min_lines:
+            return True
+        return self.columns().active_days() >= min_active_days
+
+
+class CommitSource(Protocol):
+    """Where the blog gets the bot's commits from: the GitHub API or local git mirrors."""
+
+    def get_commits_since(self, since: datetime, until: datetime | None = None) -> CommitStats: ...
 
 
 class GitHubClient:
-    def __init__(self, token: str) -> None:
+    def __init__(
+        self, token: str, use_search: bool = True, budget: RateBudget | None = None
+    ) -> None:
         self.client: Github = Github(token)
+        self.token: str = token
         self.username: str = GITHUB_USERNAME
+        self.use_search: bool = use_search
+        # Shared by every crawl made with this client, so runs see what earlier runs spent
+        self.budget: RateBudget = budget or RateBudget()
+        # Commits are immutable, so their stats (one REST call each) are fetched only once
+        self._commit_index: dict[str, CommitInfo] = {}
+
+    def _commit_info(self, repo_name: str, commit: Commit) -> CommitInfo:
+        stats = commit.stats
+        return CommitInfo(
+            repo_name=sys.intern(repo_name),
+            sha=commit.sha[:7],
+            message=commit.commit.message.split("\n")[0],
+            date=commit.commit.author.date,
+            additions=stats.additions if stats else 0,
+            deletions=stats.deletions if stats else 0,
+            files=tuple(FileChange(f.filename, f.additions, f.deletions) for f in commit.files),
+        )
+
+    def _observe(self) -> None:
+        """Update the budget from the rate-limit headers of the last core API response."""
+        remaining, _ = self.client.rate_limiting
+        self.budget.observe(remaining, self.client.rate_limiting_resettime)
+
+    def _index(self, repo_name: str, commit: Commit, commits: dict[str, CommitInfo]) -> bool:
+        """Add `commit` to `commits`, fetching its stats once; False if rate limiting stopped it.
+
+        The stats are a REST call per commit, so they fail the way listing does: rate limits are
+        retried, and any other error is logged and the commit skipped.
+        """
+        commit_info = self._commit_index.get(commit.sha)
+        if commit_info is not None:
+            commits[commit.sha] = commit_info
+            return True
+        for _ in range(MAX_ATTEMPTS):
+            self.budget.spend()
+            try:
+                commit_info = self._commit_info(repo_name, commit)
+            except RateLimitExceededException as e:
+                self.budget.observe_headers(e.headers)
+                continue
+            except Exception as e:
+                logger.warning("Error fetching commit %s in %s: %s", commit.sha, repo_name, e)
+                return True
+            self._commit_index[commit.sha] = commit_info
+            commits[commit.sha] = commit_info
+            self._observe()
+            return True
+        logger.warning("Rate limited fetching commit %s in %s", commit.sha, repo_name)
+        return False
 
-    def get_commits_since(self, since: datetime) -> CommitStats:
+    def list_repos(self, since: datetime) -> list[Repository]:
+        """The user's repos pushed to since `since`, most recently pushed first."""
+        self.budget.spend()
+        user = self.client.get_user(self.username)
+        repos = _plan_crawl(list(user.get_repos()), since)
+        self._observe()
+        return repos
+
+    def search_commits(
+        self, since: datetime, until: datetime | None = None
+    ) -> list[tuple[str, CommitSearchResult]] | None:
+        """Find the bot's commits across the user's repos with the commit search API.
+
+        Returns (repo full name, commit) pairs, or None when the search fails or may have missed
+        commits (fewer results than it counted, or more than the search API returns), so the
+        caller can fall back to listing commits per repo.
+        """
+        if until is None:
+            dates = f">={_search_date(since)}"
+        else:
+            dates = f"{_search_date(since)}..{_search_date(until)}"
+        query = f"author-email:{GITHUB_AUTHOR_EMAIL} user:{self.username} committer-date:{dates}"
+        try:
+            results = self.client.search_commits(query)
+            # Read from the first page, so an oversized search is not paged through for nothing
+            total = results.totalCount
+            if total > SEARCH_RESULT_LIMIT:
+                logger.info("Commit search incomplete (%d results)", total)
+                return None
+            found = [(result.repository.full_name, result) for result in results]
+        except Exception as e:
+            logger.warning("Commit search failed: %s", e)
+            return None
+        # A search that timed out returns fewer results than it counted
+        if len(found) < total:
+            logger.info("Commit search incomplete (%d of %d results)", len(found), total)
+            return None
+        logger.debug("Commit search found %d commits", len(found))
+        return found
+
+    def get_commits_since(self, since: datetime, until: datetime | None = None) -> CommitStats:
         logger.info("Fetching commits since %s for user %s", since, self.username)
-        commits: list[CommitInfo] = []
-        max_lines = 0
+        commits: dict[str, CommitInfo] = {}
 
         # PyGithub expects naive UTC datetimes
         since_naive = since.replace(tzinfo=None) if since.tzinfo else since
+        until_naive = until.replace(tzinfo=None) if until and until.tzinfo else until
 
-        user = self.client.get_user(self.username)
-        repos = list(user.get_repos())
-        logger.debug("Found %d repos for user %s", len(repos), self.username)
-        for repo in repos:
-            logger.debug("Processing repo: %s", repo.name)
+        partial = False
+        source = SOURCE_REPOS
+        try:
+            repos = self.list_repos(since)
+            logger.debug("Crawling %d repos for user %s", len(repos), self.username)
+
+            found = self.search_commits(since, until) if self.use_search else None
+            if found is not None:
+                names = {repo.full_name: repo.name for repo in repos}
+                for full_name, commit in found:
+                    # Only the listed repos, under the names a crawl gives their commits
+                    if full_name in names and not self._index(names[full_name], commit, commits):
+                        partial = True
+                # The search index does not cover private repos; list those the old way
+                repos = [repo for repo in repos if repo.private]
+                source = SOURCE_SEARCH_AND_REPOS if repos else SOURCE_SEARCH
+
+            for repo in repos:
+                if not self._crawl_repo(repo, since_naive, until_naive, commits):
+                    partial = True
+        except RateBudgetExhausted as e:
+            logger.warning("GitHub rate limit reached, deferring the rest of the crawl: %s", e)
+            partial = True
+
+        ordered = sorted(commits.values(), key=lambda c: c.date, reverse=True)
+        logger.info(
+            "Found %d commits since %s (via %s%s)",
+            len(ordered),
+            since,
+            source,
+            ", partial" if partial else "",
+        )
+
+        return CommitStats(
+            commits=ordered,
+            total_commits=len(ordered),
+            max_lines_in_commit=max((c.total_lines for c in ordered), default=0),
+            source=source,
+            partial=partial,
+        )
+
+    def _crawl_repo(
+        self,
+        repo: Repository,
+        since: datetime,
+        until: datetime | None,
+        commits: dict[str, CommitInfo],
+    ) -> bool:
+        """Add the bot's commits in `repo` to `commits`; False if rate limiting stopped it.
+
+        Any other error is permanent for this repo (empty, blocked or gone), so it is logged and
+        the repo skipped rather than holding back every later run.
+        """
+        logger.debug("Processing repo: %s", repo.name)
+        for _ in range(MAX_ATTEMPTS):
+            self.budget.spend()
             try:
-                repo_commits = list(repo.get_commits(author=GITHUB_AUTHOR_EMAIL, since=since_naive))
-                logger.debug("Repo %s: found %d commits", repo.name, len(repo_commits))
-                for commit in repo_commits:
-                    stats = commit.stats
-                    additions = stats.additions if stats else 0
-                    deletions = stats.deletions if stats else 0
-                    total = additions + deletions
-
-                    commit_info = CommitInfo(
-                        repo_name=repo.name,
-                        sha=commit.sha[:7],
-                        message=commit.commit.message.split("\n")[0],
-                        date=commit.commit.author.date,
-                        additions=additions,
-                        deletions=deletions,
-                    )
-                    commits.append(commit_info)
-                    max_lines = max(max_lines, total)
+                found = repo.get_commits(
+                    author=GITHUB_AUTHOR_EMAIL,
+                    since=since,
+                    until=NotSet if until is None else until,
+                )
+                repo_commits = list(found)
+            except RateLimitExceededException as e:
+                # Secondary limit or quota gone early; the next spend() waits or gives up
+                self.budget.observe_headers(e.headers)
+                continue
             except Exception as e:
                 logger.warning("Error fetching commits from %s: %s", repo.name, e)
-                continue
+                return True
+            self._observe()
+            logger.debug("Repo %s: found %d commits", repo.name, len(repo_commits))
+            complete = True
+            for commit in repo_commits:
+                complete = self._index(repo.name, commit, commits) and complete
+            return complete
+        logger.warning("Rate limited fetching commits from %s", repo.name)
+        return False
 
-        commits.sort(key=lambda c: c.date, reverse=True)
-        logger.info("Found %d commits since %s", len(commits), since)
 
-        return CommitStats(
-            commits=commits,
-            total_commits=len(commits),
-            max_lines_in_commit=max_lines,
-        )
+def _plan_crawl(repos: list[Repository], since: datetime) -> list[Repository]:
+    """Most recently pushed repos first, leaving out repos not pushed to since `since`."""
+    since = _utc(since)
+    planned: list[tuple[datetime, Repository]] = []
+    for repo in repos:
+        # None for empty repos, which were never pushed to, though PyGithub types it as datetime
+        pushed_at = cast(datetime | None, repo.pushed_at)
+        if pushed_at is not None and _utc(pushed_at) >= since:
+            planned.append((_utc(pushed_at), repo))
+    planned.sort(key=lambda item: item[0], reverse=True)
+    return [repo for _, repo in planned]
+
+
+def _utc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=UTC)
+
+
+def _search_date(value: datetime) -> str:
+    return value.astimezone(UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
@@ -0,0 +1,164 @@
+import fnmatch
+import logging
+import re
+from dataclasses import dataclass, field, replace
+from typing import cast
+
+from lsimons_bot.blog.github import CommitInfo, CommitStats, FileChange
+
+logger = logging.getLogger(__name__)
+
+# Generated files whose churn says nothing about the work; excluded from line counts by default
+LOCKFILE_PATTERNS = (
+    "*.lock",
+    "go.sum",
+    "package-lock.json",
+    "pnpm-lock.yaml",
+)
+
+# Conventional dependency-bot messages: "chore(deps): ...", "Bump x from 1.2 to 1.3", ...
+_DEPENDENCY_RE = re.compile(
+    r"^((build|chore|fix)\(deps(-dev)?\)"
+    + r"|bump the \S+ group"
+    + r"|update dependency\s"
+    + r"|(bump|update|upgrade)\s+\S+\s+(from\s+\S+\s+)?to\s+v?\d)",
+    re.IGNORECASE,
+)
+_REVERT_RE = re.compile(r'^revert\s+"(.+)"\s*$', re.IGNORECASE)
+_NUMBER_RE = re.compile(r"\b(v?\d+([.\-]\d+)*|[0-9a-f]{7,40})\b")
+_WORD_RE = re.compile(r"[a-z#]+")
+
+
+@dataclass
+class NoiseRules:
+    # fnmatch patterns, matched against the full path and the file name
+    exclude_paths: tuple[str, ...] = LOCKFILE_PATTERNS
+    # Jaccard similarity of message signatures above which two commits are near-duplicates
+    similarity: float = 0.6
+
+
+@dataclass
+class _Cluster:
+    signature: frozenset[str]
+    commits: list[CommitInfo] = field(default_factory=list)
+
+
+def parse_exclude_paths(value: str) -> tuple[str, ...]:
+    """Parse a comma-separated list of extra patterns, added to the lockfile defaults."""
+    extra = tuple(p.strip() for p in value.split(",") if p.strip())
+    return LOCKFILE_PATTERNS + extra
+
+
+def is_excluded(path: str, patterns: tuple[str, ...]) -> bool:
+    name = path.rsplit("/", 1)[-1]
+    return any(fnmatch.fnmatch(path, p) or fnmatch.fnmatch(name, p) for p in patterns)
+
+
+def signature(message: str) -> frozenset[str]:
+    """Words and word pairs of a message with numbers, versions and hashes masked out."""
+    found = cast(list[str], _WORD_RE.findall(_NUMBER_RE.sub("#", message.lower())))
+    words = [w.removesuffix("s") for w in found]
+    pairs = [f"{a} {b}" for a, b in zip(words, words[1:], strict=False)]
+    return frozenset(words + pairs)
+
+
+def similarity(a: frozenset[str], b: frozenset[str]) -> float:
+    if not a or not b:
+        return 1.0 if a == b else 0.0
+    return len(a & b) / len(a | b)
+
+
+def _count_lines(commit: CommitInfo, patterns: tuple[str, ...]) -> CommitInfo:
+    if not commit.files:
+        return commit
+    kept: list[FileChange] = [f for f in commit.files if not is_excluded(f.path, patterns)]
+    return replace(
+        commit,
+        additions=sum(f.additions for f in kept),
+        deletions=sum(f.deletions for f in kept),
+    )
+
+
+def _is_dependency_update(commit: CommitInfo, patterns: tuple[str, ...]) -> bool:
+    if _DEPENDENCY_RE.match(commit.message):
+        return True
+    return bool(commit.files) and all(is_excluded(f.path, patterns) for f in commit.files)
+
+
+def _aggregate(commits: list[CommitInfo], message: str) -> CommitInfo:
+    newest = max(commits, key=lambda c: c.date)
+    return replace(
+        newest,
+        message=message,
+        additions=sum(c.additions for c in commits),
+        deletions=sum(c.deletions for c in commits),
+        files=(),
+        folded=sum(c.folded for c in commits),
+    )
+
+
+def _fold_reverts(commits: list[CommitInfo]) -> tuple[list[CommitInfo], list[CommitInfo]]:
+    """Pair each revert with the commit it reverts; both collapse into one zero-line entry."""
+    by_message = {(c.repo_name, c.message): c for c in commits}
+    folded: list[CommitInfo] = []
+    paired: set[int] = set()
+    for commit in commits:
+        match = _REVERT_RE.match(commit.message)
+        original = by_message.get((commit.repo_name, match[1])) if match else None
+        if match is None or original is None or id(original) in paired:
+            continue
+        paired.update((id(commit), id(original)))
+        entry = _aggregate([commit, original], f"{match[1]} (reverted)")
+        folded.append(replace(entry, additions=0, deletions=0))
+    remaining = [c for c in commits if id(c) not in paired]
+    return remaining, folded
+
+
+def fold_noise(stats: CommitStats, rules: NoiseRules | None = None) -> CommitStats:
+    """Fold dependency bumps, revert pairs and near-duplicate commits into aggregate entries.
+
+    Line counts leave out files matching `rules.exclude_paths`, and dependency updates do not
+    count towards the biggest commit, so lockfile churn and typo-fix series no longer make a
+    quiet week look significant or take up prompt space.
+    """
+    rules = rules or NoiseRules()
+    commits = [_count_lines(c, rules.exclude_paths) for c in stats.commits]
+    commits, entries = _fold_reverts(commits)
+
+    dependencies: dict[str, list[CommitInfo]] = {}
+    clusters: dict[str, list[_Cluster]] = {}
+    for commit in sorted(commits, key=lambda c: c.date):
+        if _is_dependency_update(commit, rules.exclude_paths):
+            dependencies.setdefault(commit.repo_name, []).append(commit)
+            continue
+        sig = signature(commit.message)
+        repo_clusters = clusters.setdefault(commit.repo_name, [])
+        cluster = next(
+            (c for c in repo_clusters if similarity(sig, c.signature) >= rules.similarity), None
+        )
+        if cluster is None:
+            cluster = _Cluster(sig)
+            repo_clusters.append(cluster)
+        cluster.commits.append(commit)
+
+    max_lines = 0
+    for repo_clusters in clusters.values():
+        for cluster in repo_clusters:
+            max_lines = max(max_lines, *(c.total_lines for c in cluster.commits))
+            if len(cluster.commits) == 1:
+                entries.append(cluster.commits[0])
+            else:
+                first = cluster.commits[0].message
+                entries.append(_aggregate(cluster.commits, f"{first} (×{len(cluster.commits)})"))
+    for updates in dependencies.values():
+        entries.append(_aggregate(updates, f"Dependency updates (×{len(updates)})"))
+
+    entries.sort(key=lambda c: c.date, reverse=True)
+    logger.info("Folded %d commits into %d entries", len(stats.commits), len(entries))
+    return CommitStats(
+        commits=entries,
+        total_commits=len(entries),
+        max_lines_in_commit=max_lines,
+        source=stats.source,
+        partial=stats.partial,
+    )
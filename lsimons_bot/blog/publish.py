@@ -1,13 +1,17 @@
+import asyncio
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import UTC, datetime, timedelta
+from pathlib import Path
 
 from lsimons_llm import load_config
 from lsimons_llm.async_client import AsyncLLMClient
 
-from lsimons_bot.blog.config import get_env_vars
-from lsimons_bot.blog.content import generate_blog_post
-from lsimons_bot.blog.github import CommitStats, GitHubClient
+from lsimons_bot.blog.config import get_env_vars, get_optional_env_vars
+from lsimons_bot.blog.content import SummaryCache, generate_blog_post
+from lsimons_bot.blog.git_mirror import GitMirror
+from lsimons_bot.blog.github import CommitSource, CommitStats, GitHubClient
+from lsimons_bot.blog.noise import NoiseRules, fold_noise, parse_exclude_paths
 from lsimons_bot.blog.wordpress import BlogPost, WordPressClient
 
 logger = logging.getLogger(__name__)
@@ -23,9 +27,17 @@ class PublishResult:
     stats: CommitStats | None = None
 
 
-async def check_and_publish(dry_run: bool = False) -> PublishResult:
-    env = get_env_vars()
+@dataclass
+class BlogClients:
+    wp: WordPressClient
+    gh: CommitSource
+    llm: AsyncLLMClient
+    # Per-repository commit summaries, reused when a run covers the same commits again
+    summaries: SummaryCache = field(default_factory=dict)
+    noise: NoiseRules = field(default_factory=NoiseRules)
+
 
+def create_clients(env: dict[str, str]) -> BlogClients:
     wp = WordPressClient(
         username=env["WORDPRESS_USERNAME"],
         app_password=env["WORDPRESS_APPLICATION_PASSWORD"],
@@ -33,8 +45,34 @@ async def check_and_publish(dry_run: bool = False) -> PublishResult:
         client_secret=env["WORDPRESS_CLIENT_SECRET"],
         site_id=env["WORDPRESS_SITE_ID"],
     )
+    optional = get_optional_env_vars()
+    github = GitHubClient(token=env["GITHUB_WORDPRESS_TOKEN"])
+    mirror_dir = optional["BLOG_MIRROR_DIR"]
+    gh: CommitSource = GitMirror(github, Path(mirror_dir)) if mirror_dir else github
+    config = load_config(
+        base_url=env["LLM_BASE_URL"],
+        api_key=env["LLM_AUTH_TOKEN"],
+        model=env["LLM_DEFAULT_MODEL"],
+    )
+    llm = AsyncLLMClient(config)
+    exclude_paths = parse_exclude_paths(optional["BLOG_EXCLUDE_PATHS"])
+    return BlogClients(wp=wp, gh=gh, llm=llm, noise=NoiseRules(exclude_paths=exclude_paths))
+
+
+async def check_and_publish(
+    dry_run: bool = False, clients: BlogClients | None = None
+) -> PublishResult:
+    """Publish a post about recent commits if enough has happened since the last one.
+
+    Pass long-lived `clients` to reuse their connections, tokens and commit index between runs;
+    otherwise fresh clients are created from the environment.
+    """
+    if clients is None:
+        clients = create_clients(get_env_vars())
+    wp = clients.wp
 
-    latest_post = wp.get_latest_post()
+    # The clients are synchronous; keep their network calls off the event loop
+    latest_post = await asyncio.to_thread(wp.get_latest_post)
     now = datetime.now(UTC)
 
     if latest_post:
@@ -48,8 +86,16 @@ async def check_and_publish(dry_run: bool = False) -> PublishResult:
     else:
         since_date = now - timedelta(days=7)
 
-    gh = GitHubClient(token=env["GITHUB_WORDPRESS_TOKEN"])
-    stats = gh.get_commits_since(since_date)
+    stats = await asyncio.to_thread(clients.gh.get_commits_since, since_date)
+    stats = fold_noise(stats, clients.noise)
+
+    if stats.partial:
+        # Deciding on an incomplete commit list could skip or undersell a busy week
+        return PublishResult(
+            should_publish=False,
+            reason=f"Commit list incomplete ({stats.total_commits} commits so far), retrying later",
+            stats=stats,
+        )
 
     if not stats.is_significant():
         return PublishResult(
@@ -71,15 +117,10 @@ async def check_and_publish(dry_run: bool = False) -> PublishResult:
             stats=stats,
         )
 
-    config = load_config(
-        base_url=env["LLM_BASE_URL"],
-        api_key=env["LLM_AUTH_TOKEN"],
-        model=env["LLM_DEFAULT_MODEL"],
+    blog_content = await generate_blog_post(clients.llm, stats, clients.summaries)
+    post = await asyncio.to_thread(
+        wp.create_post, title=blog_content.title, content=blog_content.content
     )
-    llm = AsyncLLMClient(config)
-
-    blog_content = await generate_blog_post(llm, stats)
-    post = wp.create_post(title=blog_content.title, content=blog_content.content)
 
     return PublishResult(
         should_publish=True,
@@ -0,0 +1,79 @@
+import asyncio
+import logging
+import random
+from dataclasses import dataclass
+from datetime import UTC, datetime
+
+from lsimons_bot.blog.publish import BlogClients, PublishResult, check_and_publish
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_JITTER = 0.1
+
+
+@dataclass
+class SchedulerRun:
+    started_at: datetime
+    finished_at: datetime | None = None
+    result: PublishResult | None = None
+    error: str | None = None
+
+    @property
+    def status(self) -> str:
+        if self.finished_at is None:
+            return "running"
+        if self.error is not None:
+            return f"failed: {self.error}"
+        return self.result.reason if self.result else "done"
+
+
+class BlogScheduler:
+    """Runs `check_and_publish` periodically inside the bot process.
+
+    The same `BlogClients` are used for every run, so HTTP connections, the WordPress token and
+    the GitHub commit index stay warm. Runs never overlap; a tick that fires while the previous
+    run is still going is skipped.
+    """
+
+    def __init__(
+        self,
+        clients: BlogClients,
+        interval: float,
+        jitter: float = DEFAULT_JITTER,
+        dry_run: bool = False,
+    ) -> None:
+        self.clients: BlogClients = clients
+        self.interval: float = interval
+        self.jitter: float = jitter
+        self.dry_run: bool = dry_run
+        self.last_run: SchedulerRun | None = None
+        self._lock: asyncio.Lock = asyncio.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._lock.locked()
+
+    def next_delay(self) -> float:
+        return self.interval * (1 + random.uniform(-self.jitter, self.jitter))
+
+    async def run_once(self) -> SchedulerRun | None:
+        if self._lock.locked():
+            logger.info("Previous blog run still in progress, skipping")
+            return None
+
+        async with self._lock:
+            run = SchedulerRun(started_at=datetime.now(UTC))
+            self.last_run = run
+            try:
+                run.result = await check_and_publish(dry_run=self.dry_run, clients=self.clients)
+                logger.info("Blog run finished: %s", run.result.reason)
+            except Exception as e:
+                run.error = str(e)
+                logger.error("Blog run failed: %s", e)
+            run.finished_at = datetime.now(UTC)
+            return run
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(self.next_delay())
+            _ = await self.run_once()
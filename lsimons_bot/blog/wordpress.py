@@ -35,13 +35,15 @@ class WordPressClient:
         self.site_id: str = site_id
         self.base_url: str = f"{BASE_URL}/{site_id}/posts"
         self._access_token: str | None = None
+        # One session per client keeps connections to the WordPress.com API warm between calls
+        self.session: requests.Session = requests.Session()
 
     def _get_access_token(self) -> str:
         if self._access_token:
             return self._access_token
 
         logger.debug("Fetching OAuth2 access token")
-        response = requests.post(
+        response = self.session.post(
             TOKEN_URL,
             data={
                 "client_id": self.client_id,
@@ -62,35 +64,47 @@ class WordPressClient:
         return {"Authorization": f"Bearer {self._get_access_token()}"}
 
     def get_latest_post(self) -> BlogPost | None:
-        logger.debug("Fetching latest post from %s", self.base_url)
-        response = requests.get(
+        posts = self.get_recent_posts(count=1)
+        return posts[0] if posts else None
+
+    def get_recent_posts(self, count: int = 5) -> list[BlogPost]:
+        logger.debug("Fetching %d recent posts from %s", count, self.base_url)
+        response = self.session.get(
             self.base_url,
-            params={"per_page": 1, "orderby": "date", "order": "desc"},
+            params={"per_page": count, "orderby": "date", "order": "desc"},
             timeout=30,
         )
         response.raise_for_status()
         posts = cast(list[dict[str, object]], response.json())
 
-        if not posts:
-            return None
+        return [
+            BlogPost(
+                id=int(cast(int, post["id"])),
+                title=cast(dict[str, str], post["title"])["rendered"],
+                date=datetime.fromisoformat(cast(str, post["date_gmt"])).replace(tzinfo=UTC),
+                link=cast(str, post["link"]),
+            )
+            for post in posts
+        ]
 
-        post = posts[0]
-        title_obj = cast(dict[str, str], post["title"])
-        return BlogPost(
-            id=int(cast(int, post["id"])),
-            title=title_obj["rendered"],
-            date=datetime.fromisoformat(cast(str, post["date_gmt"])).replace(tzinfo=UTC),
-            link=cast(str, post["link"]),
-        )
-
-    def create_post(self, title: str, content: str) -> BlogPost:
+    def create_post(
+        self, title: str, content: str, status: str = "publish", date: datetime | None = None
+    ) -> BlogPost:
+        """Create a post; `status="draft"` keeps it for review, `date` backdates it."""
         logger.info("Creating new blog post: %s", title)
-        response = requests.post(
-            self.base_url,
-            headers=self._headers(),
-            json={"title": title, "content": content, "status": "publish"},
-            timeout=60,
+        payload = {"title": title, "content": content, "status": status}
+        if date is not None:
+            payload["date_gmt"] = date.astimezone(UTC).replace(tzinfo=None).isoformat()
+        response = self.session.post(
+            self.base_url, headers=self._headers(), json=payload, timeout=60
         )
+        if response.status_code == 401:
+            # Cached token was revoked or expired; fetch a fresh one and retry once
+            logger.debug("Access token rejected, refreshing")
+            self._access_token = None
+            response = self.session.post(
+                self.base_url, headers=self._headers(), json=payload, timeout=60
+            )
         response.raise_for_status()
         post = cast(dict[str, object], response.json())
         title_obj = cast(dict[str, str], post["title"])
@@ -98,6 +112,6 @@ class WordPressClient:
         return BlogPost(
             id=int(cast(int, post["id"])),
             title=title_obj["rendered"],
-            date=datetime.now(UTC),
+            date=date or datetime.now(UTC),
             link=cast(str, post["link"]),
         )
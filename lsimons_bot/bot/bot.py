@@ -1,10 +1,13 @@
 import random
 from collections.abc import Iterable
+from typing import Any, cast
 
 from openai.types.chat import ChatCompletionMessageParam
 
 type Message = ChatCompletionMessageParam
 type Messages = Iterable[Message]
+# (channel_id, thread_ts) of a Slack thread
+type ThreadKey = tuple[str, str]
 
 
 LOADING_MESSAGES = [
@@ -36,25 +39,68 @@ RESPONSE_MESSAGES = [
 SYSTEM_CONTENT = """
 You're an assistant in a Slack workspace.
 You don't have access to anything in the Slack workspace except for the current thread.
-You also don't have access to any external database or knowledge base or API.
+You also don't have access to any external database or API.
+Sometimes the prompt includes reference notes from your knowledge base, each with its source.
+Use them when they answer the question and mention the source; ignore them when they don't.
 Do not try to guess or fabricate any information.
-When you include markdown text, convert it to be Slack compatible.
 When a prompt has Slack's special syntax like <@USER_ID> or <#CHANNEL_ID>,
 you must keep them as-is in your response.
 
 Your name is lsimons-bot.
 You are the assistant to Leo Simons, an engineer at Schuberg Philis.
-Unfortunately you don't know anything else about Leo Simons.
-That means you are not a very good assistant.
-When the user asks about Leo Simons or Schuberg Philis, apologize for not being able to help more.
+You only know about Leo Simons and Schuberg Philis what the reference notes tell you.
+When the user asks about them and the notes don't have the answer,
+apologize for not being able to help more.
 You always respond in a professional and friendly manner.
 Your favorite smiley is :nerd_face:, but you limit the use of smileys.
 """
 
 
+# Slack shows about this many characters of an assistant thread title
+MAX_TITLE_CHARS = 50
+
+TITLE_PROMPT = f"""
+Write a title for a Slack conversation that starts with the user's message below.
+Use at most {MAX_TITLE_CHARS} characters and the language of the message.
+Return only the title, without quotes or a trailing period.
+"""
+
+
+def short_title(text: str, max_chars: int = MAX_TITLE_CHARS) -> str:
+    """`text` on one line, cut at a word boundary to fit in `max_chars`."""
+    text = " ".join(text.split())
+    if len(text) <= max_chars:
+        return text
+    cut = text.rfind(" ", 0, max_chars)
+    return text[: cut if cut > 0 else max_chars - 1].rstrip(" ,.;:") + "…"
+
+
+def title_prompt(text: str) -> list[Message]:
+    return [
+        {"role": "system", "content": TITLE_PROMPT},
+        {"role": "user", "content": text},
+    ]
+
+
+# Anthropic-style prompt caching hint; LiteLLM passes it through to backends that support it
+CACHE_CONTROL = {"type": "ephemeral"}
+
+
+def with_cache_control(message: Message) -> Message:
+    """Return a copy of `message` whose content is marked as the end of a cacheable prefix."""
+    content = message.get("content")
+    if not isinstance(content, str):
+        return message
+    marked = cast(dict[str, Any], dict(message))
+    marked["content"] = [{"type": "text", "text": content, "cache_control": CACHE_CONTROL}]
+    # cache_control is not a key of the OpenAI text part type, so the marked copy cannot be
+    # typed as a message; it is one on the wire
+    return cast(Message, cast(object, marked))
+
+
 class Bot:
-    def __init__(self) -> None:
-        pass
+    def __init__(self, prompt_caching: bool = False) -> None:
+        self.prompt_caching: bool = prompt_caching
 
     def loading_messages(self) -> list[str]:
         return LOADING_MESSAGES
@@ -65,13 +111,40 @@ class Bot:
     def pick_response_message(self) -> str:
         return random.choice(RESPONSE_MESSAGES)
 
-    async def chat(self, messages: Messages) -> str:
+    def build_messages(
+        self,
+        messages: Messages,
+        prompt_caching: bool | None = None,
+        context: str | None = None,
+    ) -> list[Message]:
+        """Lay out the prompt as a stable prefix followed by the newest turn.
+
+        The prefix (system prompt plus all earlier thread turns) is byte-identical from one turn
+        of a thread to the next, so provider prompt caches can reuse it. With `prompt_caching`
+        enabled, the end of the system prompt and the end of the prefix get cache-control hints.
+        `prompt_caching` overrides the instance setting for a single call. `context`, such as
+        retrieved reference notes for the newest turn, goes between the prefix and that turn.
+        """
         system_message: Message = {"role": "system", "content": self.system_content()}
-        all_messages: Messages = []
-        all_messages.append(system_message)
+        all_messages: list[Message] = [system_message]
         all_messages.extend(messages)
 
-        return await self.chat_completion(all_messages)
+        if prompt_caching is None:
+            prompt_caching = self.prompt_caching
+        if prompt_caching:
+            all_messages[0] = with_cache_control(all_messages[0])
+            if len(all_messages) > 2:
+                all_messages[-2] = with_cache_control(all_messages[-2])
+        if context is not None:
+            all_messages.insert(len(all_messages) - 1, {"role": "system", "content": context})
+        return all_messages
+
+    async def chat(self, messages: Messages, thread: ThreadKey | None = None) -> str:
+        return await self.chat_completion(self.build_messages(messages))
+
+    async def title(self, text: str) -> str:
+        """A short title for a thread that starts with `text`."""
+        return short_title(text)
 
     async def chat_completion(self, messages: Messages) -> str:
         return self.pick_response_message()
@@ -0,0 +1,160 @@
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass, field
+from typing import Any, cast
+
+from lsimons_bot.bot.bot import Message, ThreadKey
+
+logger = logging.getLogger(__name__)
+
+type Summarize = Callable[[str, list[Message]], Awaitable[str]]
+
+SUMMARY_PROMPT = """
+You maintain a running summary of a Slack conversation between a user and an assistant.
+You get the summary so far (possibly empty) and the turns that came after it.
+Return an updated summary that covers both. Keep facts, names, decisions, open questions and
+anything the user asked the assistant to remember. Keep Slack syntax like <@USER_ID> as-is.
+Write at most a few short paragraphs and return only the summary.
+"""
+
+SUMMARY_HEADER = "Summary of the earlier part of this thread:"
+
+
+@dataclass
+class MemoryRules:
+    """When a thread gets compacted. Zero `max_turns` keeps the full history."""
+
+    # Compact once this many turns are not covered by the summary
+    max_turns: int = 20
+    # Number of most recent turns that are always sent verbatim
+    keep_recent: int = 8
+    summary_model: str | None = None
+    max_threads: int = 500
+
+
+@dataclass
+class ThreadSummary:
+    text: str
+    # Number of leading thread turns folded into `text`
+    covered: int
+    fingerprint: str
+    updated: float = field(default_factory=time.time)
+
+
+def fingerprint(messages: list[Message]) -> str:
+    data = json.dumps(messages, sort_keys=True, default=str)
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+def summary_message(text: str) -> Message:
+    return {"role": "system", "content": f"{SUMMARY_HEADER}\n{text}"}
+
+
+def summary_prompt(previous: str, turns: list[Message]) -> list[Message]:
+    lines = [f"{m.get('role')}: {m.get('content')}" for m in turns]
+    transcript = "\n\n".join(lines)
+    return [
+        {"role": "system", "content": SUMMARY_PROMPT},
+        {
+            "role": "user",
+            "content": f"Summary so far:\n{previous or '(none)'}\n\nNew turns:\n{transcript}",
+        },
+    ]
+
+
+class ThreadMemory:
+    """Keeps long assistant threads small by replacing old turns with a rolling summary.
+
+    Summaries are kept per `(channel_id, thread_ts)` and built in the background, so a request
+    never waits for one: until the summary is ready the request simply sends more turns. When a
+    thread grows further the summary is extended with just the new turns, not regenerated.
+    """
+
+    def __init__(self, summarize: Summarize, rules: MemoryRules | None = None) -> None:
+        self.summarize: Summarize = summarize
+        self.rules: MemoryRules = rules or MemoryRules()
+        self.summaries: OrderedDict[ThreadKey, ThreadSummary] = OrderedDict()
+        self._tasks: dict[ThreadKey, asyncio.Task[None]] = {}
+
+    def summary(self, thread: ThreadKey, messages: list[Message]) -> ThreadSummary | None:
+        """The stored summary for `thread`, if the turns it covers are still the same."""
+        summary = self.summaries.get(thread)
+        if summary is None:
+            return None
+        if summary.covered > len(messages) or (
+            fingerprint(messages[: summary.covered]) != summary.fingerprint
+        ):
+            # Older turns were edited or deleted; start over
+            del self.summaries[thread]
+            return None
+        self.summaries.move_to_end(thread)
+        return summary
+
+    def compact(self, thread: ThreadKey, messages: list[Message]) -> list[Message]:
+        """Return the summary plus the turns it does not cover, scheduling a new summary if due."""
+        summary = self.summary(thread, messages)
+        covered = summary.covered if summary else 0
+        if self.rules.max_turns and len(messages) - covered > self.rules.max_turns:
+            self._schedule(thread, messages, summary)
+        if summary is None:
+            return messages
+        return [summary_message(summary.text), *messages[covered:]]
+
+    def _schedule(
+        self, thread: ThreadKey, messages: list[Message], summary: ThreadSummary | None
+    ) -> None:
+        turns = messages[: len(messages) - self.rules.keep_recent]
+        if thread in self._tasks or len(turns) <= (summary.covered if summary else 0):
+            return
+        task = asyncio.create_task(self._extend(thread, turns, summary))
+        self._tasks[thread] = task
+        task.add_done_callback(lambda _: self._tasks.pop(thread, None))
+
+    async def _extend(
+        self, thread: ThreadKey, turns: list[Message], summary: ThreadSummary | None
+    ) -> None:
+        start = summary.covered if summary else 0
+        previous = summary.text if summary else ""
+        try:
+            text = await self.summarize(previous, turns[start:])
+        except Exception as e:
+            logger.warning("Summarizing thread %s failed: %s", thread, e)
+            return
+
+        self.summaries[thread] = ThreadSummary(text, len(turns), fingerprint(turns))
+        self.summaries.move_to_end(thread)
+        while len(self.summaries) > self.rules.max_threads:
+            _ = self.summaries.popitem(last=False)
+        logger.debug("Thread %s summary now covers %d turns", thread, len(turns))
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        """The summaries, least recently used first."""
+        return [
+            {"channel": channel, "thread_ts": thread_ts, **asdict(summary)}
+            for (channel, thread_ts), summary in self.summaries.items()
+        ]
+
+    def restore(self, data: list[dict[str, Any]], max_age: float) -> None:
+        """Load snapshotted summaries, skipping those not updated in the last `max_age` seconds."""
+        cutoff = time.time() - max_age
+        for item in data[-self.rules.max_threads :]:
+            if item["updated"] < cutoff:
+                continue
+            thread = (item["channel"], item["thread_ts"])
+            self.summaries[thread] = ThreadSummary(
+                cast(str, item["text"]),
+                cast(int, item["covered"]),
+                cast(str, item["fingerprint"]),
+                cast(float, item["updated"]),
+            )
+            self.summaries.move_to_end(thread)
+
+    async def wait(self) -> None:
+        """Wait for summaries that are being generated; for tests and shutdown."""
+        if self._tasks:
+            _ = await asyncio.gather(*self._tasks.values(), return_exceptions=True)
@@ -0,0 +1,82 @@
+import math
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, cast
+
+from lsimons_bot.llm.client import ChatResult
+
+DEFAULT_WINDOW = 500
+
+
+class LatencyStats:
+    """Latency samples over a sliding window of the most recent observations."""
+
+    def __init__(self, window: int = DEFAULT_WINDOW) -> None:
+        self.count: int = 0
+        self.total: float = 0.0
+        self._samples: deque[float] = deque(maxlen=window)
+
+    def record(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self._samples.append(seconds)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, p: float) -> float:
+        if not self._samples:
+            return 0.0
+        ordered = sorted(self._samples)
+        rank = max(0, math.ceil(p / 100 * len(ordered)) - 1)
+        return ordered[rank]
+
+    def snapshot(self) -> dict[str, Any]:
+        return {"count": self.count, "total": self.total, "samples": list(self._samples)}
+
+    def restore(self, data: dict[str, Any]) -> None:
+        self.count = int(cast(int, data["count"]))
+        self.total = float(cast(float, data["total"]))
+        self._samples.clear()
+        self._samples.extend(float(sample) for sample in cast(list[float], data["samples"]))
+
+    def summary(self) -> str:
+        return (
+            f"n={self.count} mean={self.mean:.2f}s p50={self.percentile(50):.2f}s"
+            f" p95={self.percentile(95):.2f}s"
+        )
+
+
+@dataclass
+class LLMMetrics:
+    requests: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+    cache_write_tokens: int = 0
+    # Time to first token, split by whether the prompt prefix was served from cache
+    ttft_cached: LatencyStats = field(default_factory=LatencyStats)
+    ttft_uncached: LatencyStats = field(default_factory=LatencyStats)
+
+    def record(self, result: ChatResult) -> None:
+        self.requests += 1
+        self.prompt_tokens += result.prompt_tokens
+        self.completion_tokens += result.completion_tokens
+        self.cached_tokens += result.cached_tokens
+        self.cache_write_tokens += result.cache_write_tokens
+        if result.time_to_first_token is not None:
+            ttft = self.ttft_cached if result.cached_tokens else self.ttft_uncached
+            ttft.record(result.time_to_first_token)
+
+    @property
+    def cache_hit_ratio(self) -> float:
+        return self.cached_tokens / self.prompt_tokens if self.prompt_tokens else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.requests} requests, {self.prompt_tokens} prompt tokens"
+            f" ({self.cache_hit_ratio:.0%} cached, {self.cache_write_tokens} written to cache),"
+            f" {self.completion_tokens} completion tokens;"
+            f" ttft cached: {self.ttft_cached.summary()}; uncached: {self.ttft_uncached.summary()}"
+        )
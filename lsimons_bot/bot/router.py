@@ -0,0 +1,140 @@
+import logging
+from dataclasses import dataclass, field
+from typing import Any, cast
+
+from lsimons_bot.bot.bot import Message, Messages
+from lsimons_bot.bot.metrics import LatencyStats
+
+logger = logging.getLogger(__name__)
+
+FAST_ROUTE = "fast"
+PRIMARY_ROUTE = "primary"
+
+# Rough heuristic for English text; good enough to compare against a threshold
+CHARS_PER_TOKEN = 4
+
+COMPLEX_MARKERS = (
+    "```",
+    "analy",
+    "compare",
+    "debug",
+    "design",
+    "explain",
+    "step by step",
+    "summarize",
+    "write",
+)
+
+
+@dataclass
+class Route:
+    name: str
+    model: str
+    reason: str
+
+
+@dataclass
+class RoutingRules:
+    """When a turn is simple enough for the fast model. Turns outside these limits go primary."""
+
+    fast_model: str | None = None
+    max_fast_tokens: int = 500
+    max_fast_turns: int = 6
+    max_fast_message_chars: int = 200
+    complex_markers: tuple[str, ...] = COMPLEX_MARKERS
+
+
+@dataclass
+class RouteStats:
+    latency: LatencyStats = field(default_factory=LatencyStats)
+    time_to_first_token: LatencyStats = field(default_factory=LatencyStats)
+    prompt_tokens: int = 0
+
+    def summary(self) -> str:
+        return (
+            f"latency {self.latency.summary()}; ttft {self.time_to_first_token.summary()};"
+            f" {self.prompt_tokens} prompt tokens"
+        )
+
+
+def _text(message: Message) -> str:
+    content = message.get("content")
+    if isinstance(content, str):
+        return content
+    if content is None:
+        return ""
+    return " ".join(str(part.get("text", "")) for part in content)
+
+
+def estimate_tokens(messages: list[Message]) -> int:
+    chars = sum(len(_text(message)) for message in messages)
+    return chars // CHARS_PER_TOKEN + 1
+
+
+class ModelRouter:
+    """Sends short, simple turns to a fast model and everything else to the primary model.
+
+    Per-route latency is recorded so the thresholds in `RoutingRules` can be tuned from data.
+    """
+
+    def __init__(self, primary_model: str, rules: RoutingRules | None = None) -> None:
+        self.primary_model: str = primary_model
+        self.rules: RoutingRules = rules or RoutingRules()
+        self.stats: dict[str, RouteStats] = {}
+
+    @property
+    def primary(self) -> Route:
+        return Route(PRIMARY_ROUTE, self.primary_model, "default")
+
+    def route(self, messages: Messages) -> Route:
+        rules = self.rules
+        if not rules.fast_model:
+            return self.primary
+
+        conversation = [m for m in messages if m.get("role") != "system"]
+        if not conversation:
+            return self.primary
+        latest = _text(conversation[-1]).lower()
+
+        if len(conversation) > rules.max_fast_turns:
+            return Route(PRIMARY_ROUTE, self.primary_model, "long thread")
+        if estimate_tokens(conversation) > rules.max_fast_tokens:
+            return Route(PRIMARY_ROUTE, self.primary_model, "long context")
+        if len(latest) > rules.max_fast_message_chars:
+            return Route(PRIMARY_ROUTE, self.primary_model, "long message")
+        if any(marker in latest for marker in rules.complex_markers):
+            return Route(PRIMARY_ROUTE, self.primary_model, "complex request")
+        return Route(FAST_ROUTE, rules.fast_model, "short and simple")
+
+    def record(
+        self,
+        route: Route,
+        duration: float,
+        time_to_first_token: float | None = None,
+        prompt_tokens: int = 0,
+    ) -> None:
+        stats = self.stats.setdefault(route.name, RouteStats())
+        stats.latency.record(duration)
+        if time_to_first_token is not None:
+            stats.time_to_first_token.record(time_to_first_token)
+        stats.prompt_tokens += prompt_tokens
+
+    def summary(self) -> str:
+        return "; ".join(f"{name}: {stats.summary()}" for name, stats in self.stats.items())
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            name: {
+                "latency": stats.latency.snapshot(),
+                "time_to_first_token": stats.time_to_first_token.snapshot(),
+                "prompt_tokens": stats.prompt_tokens,
+            }
+            for name, stats in self.stats.items()
+        }
+
+    def restore(self, data: dict[str, dict[str, Any]]) -> None:
+        for name, route in data.items():
+            stats = self.stats.setdefault(name, RouteStats())
+            stats.latency.restore(cast(dict[str, Any], route["latency"]))
+            stats.time_to_first_token.restore(cast(dict[str, Any], route["time_to_first_token"]))
+            stats.prompt_tokens = int(cast(int, route["prompt_tokens"]))
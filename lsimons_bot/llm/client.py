@@ -0,0 +1,110 @@
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import cast
+
+from openai import AsyncOpenAI
+from openai.types.chat import ChatCompletionMessageParam
+from openai.types.completion_usage import CompletionUsage
+
+from lsimons_bot.tracing.trace import span, traceparent
+
+logger = logging.getLogger(__name__)
+
+# Model name fragments of backends that need explicit cache_control hints for prompt caching.
+# Others (OpenAI, Azure OpenAI) cache long identical prefixes automatically.
+CACHE_CONTROL_MODELS = ("claude", "anthropic")
+
+
+def supports_cache_control(model: str) -> bool:
+    return any(fragment in model.lower() for fragment in CACHE_CONTROL_MODELS)
+
+
+@dataclass
+class ChatResult:
+    content: str
+    model: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+    cache_write_tokens: int = 0
+    time_to_first_token: float | None = None
+    duration: float = 0.0
+
+
+def _cached_tokens(usage: CompletionUsage) -> tuple[int, int]:
+    """Return (cache read, cache write) token counts from an OpenAI-style usage block.
+
+    LiteLLM reports Anthropic cache writes as an extra `cache_creation_input_tokens` field.
+    """
+    details = usage.prompt_tokens_details
+    cached = (details.cached_tokens or 0) if details else 0
+    written = cast(int | None, getattr(usage, "cache_creation_input_tokens", None)) or 0
+    return cached, written
+
+
+class LLMClient:
+    """Streaming chat client for the LiteLLM proxy, reporting timing and token usage."""
+
+    def __init__(self, base_url: str, api_key: str, model: str) -> None:
+        self.client: AsyncOpenAI = AsyncOpenAI(base_url=base_url, api_key=api_key)
+        self.model: str = model
+
+    async def chat_completion(
+        self,
+        messages: list[ChatCompletionMessageParam],
+        model: str | None = None,
+        on_first_token: Callable[[], None] | None = None,
+    ) -> ChatResult:
+        model = model or self.model
+        with span("llm.chat_completion", model=model) as current:
+            result = await self._stream(messages, model, on_first_token)
+            current.set("prompt_tokens", result.prompt_tokens)
+            current.set("completion_tokens", result.completion_tokens)
+            current.set("cached_tokens", result.cached_tokens)
+            current.set("time_to_first_token", result.time_to_first_token)
+        return result
+
+    async def _stream(
+        self,
+        messages: list[ChatCompletionMessageParam],
+        model: str,
+        on_first_token: Callable[[], None] | None,
+    ) -> ChatResult:
+        start = time.perf_counter()
+        first_token_at: float | None = None
+        parts: list[str] = []
+        usage: CompletionUsage | None = None
+
+        stream = await self.client.chat.completions.create(
+            model=model,
+            messages=messages,
+            stream=True,
+            stream_options={"include_usage": True},
+            # Lets the proxy's own spans join the bot's trace
+            extra_headers=traceparent(),
+        )
+        async for chunk in stream:
+            if chunk.usage is not None:
+                usage = chunk.usage
+            for choice in chunk.choices:
+                if choice.delta.content:
+                    if first_token_at is None:
+                        first_token_at = time.perf_counter()
+                        if on_first_token is not None:
+                            on_first_token()
+                    parts.append(choice.delta.content)
+
+        end = time.perf_counter()
+        result = ChatResult(
+            content="".join(parts),
+            model=model,
+            time_to_first_token=first_token_at - start if first_token_at is not None else None,
+            duration=end - start,
+        )
+        if usage is not None:
+            result.prompt_tokens = usage.prompt_tokens
+            result.completion_tokens = usage.completion_tokens
+            result.cached_tokens, result.cache_write_tokens = _cached_tokens(usage)
+        return result
@@ -0,0 +1,220 @@
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from openai.types.chat import ChatCompletionMessageParam
+
+from lsimons_bot.bot.metrics import LatencyStats
+from lsimons_bot.llm.client import ChatResult, LLMClient
+from lsimons_bot.tracing.trace import span
+
+logger = logging.getLogger(__name__)
+
+# Until a model has this many samples its p95 is not trusted and the default hedge delay is used
+MIN_HEDGE_SAMPLES = 20
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class CircuitBreaker:
+    """Stops sending requests to a model after repeated failures, probing again after a cooldown."""
+
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold: int = failure_threshold
+        self.reset_timeout: float = reset_timeout
+        self.failures: int = 0
+        self.opened_at: float | None = None
+        self._clock: Callable[[], float] = clock
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if self._clock() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        return self.state != "open"
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == "half-open" or self.failures >= self.failure_threshold:
+            self.opened_at = self._clock()
+
+
+@dataclass
+class ResilienceConfig:
+    fallback_model: str | None = None
+    # Overall deadline for one request, including any hedged attempt
+    budget: float = 60.0
+    # Hedge delay used until enough time-to-first-token samples are available
+    default_hedge_delay: float = 8.0
+    min_hedge_delay: float = 1.0
+    hedge_percentile: float = 95
+
+
+class _Attempt:
+    def __init__(self, llm: LLMClient, messages: list[ChatCompletionMessageParam], model: str):
+        self.model: str = model
+        self.started: float = time.perf_counter()
+        self.first_token: asyncio.Event = asyncio.Event()
+        self.task: asyncio.Task[ChatResult] = asyncio.create_task(
+            llm.chat_completion(messages, model=model, on_first_token=self.first_token.set)
+        )
+
+    @property
+    def won(self) -> bool:
+        """Produced a token, or finished successfully without streaming any."""
+        if self.first_token.is_set():
+            return True
+        return self.task.done() and not self.task.cancelled() and self.task.exception() is None
+
+    @property
+    def failed(self) -> bool:
+        return self.task.done() and not self.won
+
+
+class ResilientLLM:
+    """Deadline-bounded chat completions with hedging to a fallback model.
+
+    If the first attempt has not produced a token by the model's p95 time to first token, a hedged
+    attempt is sent to the fallback model. Whichever streams first wins and the other is cancelled.
+    A circuit breaker per model keeps requests away from a backend that keeps failing.
+    """
+
+    def __init__(self, llm: LLMClient, config: ResilienceConfig | None = None) -> None:
+        self.llm: LLMClient = llm
+        self.config: ResilienceConfig = config or ResilienceConfig()
+        self.breakers: dict[str, CircuitBreaker] = {}
+        self.ttft: dict[str, LatencyStats] = {}
+
+    def breaker(self, model: str) -> CircuitBreaker:
+        return self.breakers.setdefault(model, CircuitBreaker())
+
+    def hedge_delay(self, model: str) -> float:
+        stats = self.ttft.get(model)
+        if stats is None or stats.count < MIN_HEDGE_SAMPLES:
+            return self.config.default_hedge_delay
+        return max(self.config.min_hedge_delay, stats.percentile(self.config.hedge_percentile))
+
+    def _candidates(self, model: str) -> list[str]:
+        models = [model]
+        fallback = self.config.fallback_model
+        if fallback and fallback != model:
+            models.append(fallback)
+        available = [m for m in models if self.breaker(m).allow()]
+        if not available:
+            raise CircuitOpenError(f"Circuit open for {', '.join(models)}")
+        return available
+
+    async def chat_completion(
+        self, messages: list[ChatCompletionMessageParam], model: str | None = None
+    ) -> ChatResult:
+        with span("llm.request", model=model or self.llm.model) as current:
+            result = await self._complete(messages, model)
+            current.set("winner", result.model)
+        return result
+
+    async def _complete(
+        self, messages: list[ChatCompletionMessageParam], model: str | None
+    ) -> ChatResult:
+        candidates = self._candidates(model or self.llm.model)
+        attempts: list[_Attempt] = []
+        try:
+            async with asyncio.timeout(self.config.budget):
+                winner = await self._race(messages, candidates, attempts)
+                try:
+                    result = await winner.task
+                except Exception:
+                    self.breaker(winner.model).record_failure()
+                    raise
+        except TimeoutError:
+            logger.warning("LLM request exceeded its %.0fs budget", self.config.budget)
+            for attempt in attempts:
+                if not attempt.task.done():
+                    self.breaker(attempt.model).record_failure()
+            raise
+        finally:
+            for attempt in attempts:
+                if not attempt.task.done():
+                    _ = attempt.task.cancel()
+
+        self.breaker(winner.model).record_success()
+        if result.time_to_first_token is not None:
+            self._record_ttft(winner.model, result.time_to_first_token)
+        return result
+
+    def _record_ttft(self, model: str, seconds: float) -> None:
+        self.ttft.setdefault(model, LatencyStats()).record(seconds)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Time to first token per model; restoring it spares the hedge delay a cold start."""
+        return {model: stats.snapshot() for model, stats in self.ttft.items()}
+
+    def restore(self, data: dict[str, dict[str, Any]]) -> None:
+        for model, stats in data.items():
+            self.ttft.setdefault(model, LatencyStats()).restore(stats)
+
+    async def _race(
+        self,
+        messages: list[ChatCompletionMessageParam],
+        candidates: list[str],
+        attempts: list[_Attempt],
+    ) -> _Attempt:
+        remaining = list(candidates)
+        last_error: BaseException | None = None
+
+        while True:
+            live = [a for a in attempts if not a.failed]
+            if not live:
+                if not remaining:
+                    assert last_error is not None
+                    raise last_error
+                attempts.append(_Attempt(self.llm, messages, remaining.pop(0)))
+                continue
+
+            # Only wait for the hedge deadline while there is something left to hedge with
+            timeout = self.hedge_delay(live[0].model) if remaining else None
+            waiters = [asyncio.create_task(a.first_token.wait()) for a in live]
+            done, _ = await asyncio.wait(
+                [*waiters, *(a.task for a in live)],
+                timeout=timeout,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            for waiter in waiters:
+                _ = waiter.cancel()
+
+            for attempt in live:
+                if attempt.won:
+                    for other in attempts:
+                        if other is not attempt and not other.task.done():
+                            logger.debug("Cancelling slower attempt on %s", other.model)
+                            _ = other.task.cancel()
+                            # Censored sample: its first token would have come later than this.
+                            # Recording it keeps the p95 from drifting down as slow attempts lose.
+                            self._record_ttft(other.model, time.perf_counter() - other.started)
+                    return attempt
+                if attempt.failed:
+                    last_error = attempt.task.exception()
+                    logger.warning("LLM attempt on %s failed: %s", attempt.model, last_error)
+                    self.breaker(attempt.model).record_failure()
+
+            if not done and remaining:
+                model = remaining.pop(0)
+                logger.info("No token after %.1fs, hedging to %s", timeout, model)
+                attempts.append(_Attempt(self.llm, messages, model))
@@ -0,0 +1,81 @@
+import argparse
+import asyncio
+import logging
+import sys
+from dataclasses import dataclass
+
+from lsimons_bot.loadtest.fake_slack import FakeSlack
+from lsimons_bot.loadtest.load import (
+    DEFAULT_RATE,
+    DEFAULT_THREADS,
+    DEFAULT_TIMEOUT,
+    DEFAULT_TURNS,
+    LoadConfig,
+    run_load,
+)
+
+DEFAULT_PORT = 3333
+
+
+@dataclass
+class LoadArgs:
+    threads: int = DEFAULT_THREADS
+    rate: float = DEFAULT_RATE
+    turns: int = DEFAULT_TURNS
+    timeout: float = DEFAULT_TIMEOUT
+    host: str = "127.0.0.1"
+    port: int = DEFAULT_PORT
+    verbose: bool = False
+
+
+def _parse_args() -> LoadArgs:
+    parser = argparse.ArgumentParser(
+        description="Run a local fake Slack and replay assistant threads against the bot"
+    )
+    _ = parser.add_argument(
+        "--threads", type=int, help=f"Assistant threads to start (default {DEFAULT_THREADS})"
+    )
+    _ = parser.add_argument(
+        "--rate", type=float, help=f"New threads per second (default {DEFAULT_RATE})"
+    )
+    _ = parser.add_argument(
+        "--turns", type=int, help=f"User messages per thread (default {DEFAULT_TURNS})"
+    )
+    _ = parser.add_argument(
+        "--timeout", type=float, help=f"Seconds to wait for a reply (default {DEFAULT_TIMEOUT})"
+    )
+    _ = parser.add_argument("--host", help="Address to listen on (default 127.0.0.1)")
+    _ = parser.add_argument("--port", type=int, help=f"Port to listen on (default {DEFAULT_PORT})")
+    _ = parser.add_argument("--verbose", "-v", action="store_true", help="Enable verbose logging")
+    return parser.parse_args(namespace=LoadArgs())
+
+
+async def run(args: LoadArgs) -> int:
+    slack = FakeSlack(args.host, args.port)
+    await slack.start()
+    print(f"Start the bot with SLACK_API_URL={slack.api_url} to begin", flush=True)
+    try:
+        _ = await slack.connected.wait()
+        report = await run_load(
+            slack,
+            LoadConfig(
+                threads=args.threads, rate=args.rate, turns=args.turns, timeout=args.timeout
+            ),
+        )
+    finally:
+        await slack.stop()
+    print(report.summary())
+    return 1 if report.dropped or report.unanswered else 0
+
+
+def main() -> int:
+    args = _parse_args()
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format="%(levelname)s: %(message)s",
+    )
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
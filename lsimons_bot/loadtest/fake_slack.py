@@ -0,0 +1,295 @@
+import asyncio
+import itertools
+import json
+import logging
+import time
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any, cast
+
+from aiohttp import WSMsgType, web
+
+logger = logging.getLogger(__name__)
+
+type ThreadKey = tuple[str, str]
+type Message = dict[str, str]
+type ApiMethod = Callable[[dict[str, object]], Awaitable[dict[str, Any]]]
+
+TEAM_ID = "T0FAKE"
+APP_ID = "A0FAKE"
+BOT_ID = "B0FAKE"
+BOT_USER_ID = "U0FAKEBOT"
+USER_ID = "U0FAKEUSER"
+# Slack redelivers an event that is not acknowledged within this many seconds
+ACK_TIMEOUT = 3.0
+MAX_RETRIES = 3
+
+
+@dataclass
+class Delivery:
+    """One event sent over Socket Mode, with its acknowledgements."""
+
+    envelope_id: str
+    sent_at: float
+    acked_at: float | None = None
+    acks: int = 0
+    attempts: int = 1
+    acked: asyncio.Event = field(default_factory=asyncio.Event)
+
+    @property
+    def ack_latency(self) -> float | None:
+        return None if self.acked_at is None else self.acked_at - self.sent_at
+
+
+class FakeSlack:
+    """Local stand-in for Slack: a Socket Mode WebSocket plus the Web API methods the bot calls.
+
+    Point the bot at it with `SLACK_API_URL` set to `api_url`; `apps.connections.open` then hands
+    out this server's WebSocket. Threads and the bot's replies are kept in memory, so
+    `conversations.replies` returns what was said, and events that are not acknowledged within
+    `ack_timeout` are redelivered like Slack does.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        ack_timeout: float = ACK_TIMEOUT,
+        max_retries: int = MAX_RETRIES,
+    ) -> None:
+        self.host: str = host
+        self.port: int = port
+        self.ack_timeout: float = ack_timeout
+        self.max_retries: int = max_retries
+        self.connected: asyncio.Event = asyncio.Event()
+        self.calls: Counter[str] = Counter()
+        self.deliveries: dict[str, Delivery] = {}
+        self.threads: dict[ThreadKey, list[Message]] = {}
+        self._sockets: list[web.WebSocketResponse] = []
+        self._next_socket: int = 0
+        self._ids: itertools.count[int] = itertools.count(1)
+        self._last_ts: float = 0.0
+        self._replies: asyncio.Condition = asyncio.Condition()
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._runner: web.AppRunner | None = None
+        self._methods: dict[str, ApiMethod] = {
+            "auth.test": self._auth_test,
+            "apps.connections.open": self._connections_open,
+            "chat.postMessage": self._post_message,
+            "chat.update": self._update_message,
+            "conversations.replies": self._replies_for,
+        }
+
+    @property
+    def api_url(self) -> str:
+        return f"http://{self.host}:{self.port}/api/"
+
+    async def start(self) -> None:
+        app = web.Application()
+        _ = app.router.add_post("/api/{method}", self._api)
+        _ = app.router.add_get("/api/{method}", self._api)
+        _ = app.router.add_get("/link", self._socket)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        if self.port == 0:
+            self.port = cast(int, self._runner.addresses[0][1])
+        logger.info("Fake Slack listening on %s", self.api_url)
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            _ = task.cancel()
+        for ws in list(self._sockets):
+            _ = await ws.close()
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    def new_ts(self) -> str:
+        """A message timestamp, unique and increasing like Slack's."""
+        self._last_ts = max(self._last_ts + 0.000001, time.time())
+        return f"{self._last_ts:.6f}"
+
+    # Web API
+
+    async def _api(self, request: web.Request) -> web.Response:
+        method = request.match_info["method"]
+        self.calls[method] += 1
+        params: dict[str, object] = dict(request.query)
+        if request.content_type == "application/json":
+            params |= cast(dict[str, object], await request.json())
+        elif request.can_read_body:
+            params |= dict(await request.post())
+        handler = self._methods.get(method)
+        body = await handler(params) if handler else {"ok": True}
+        return web.json_response(body)
+
+    async def _auth_test(self, _: dict[str, object]) -> dict[str, Any]:
+        return {
+            "ok": True,
+            "url": "https://fake.slack.com/",
+            "team": "Fake",
+            "team_id": TEAM_ID,
+            "user": "lsimons-bot",
+            "user_id": BOT_USER_ID,
+            "bot_id": BOT_ID,
+            "is_enterprise_install": False,
+        }
+
+    async def _connections_open(self, _: dict[str, object]) -> dict[str, Any]:
+        return {"ok": True, "url": f"ws://{self.host}:{self.port}/link"}
+
+    async def _post_message(self, params: dict[str, object]) -> dict[str, Any]:
+        channel = str(params.get("channel", ""))
+        ts = self.new_ts()
+        message: Message = {
+            "type": "message",
+            "bot_id": BOT_ID,
+            "user": BOT_USER_ID,
+            "text": str(params.get("text", "")),
+            "ts": ts,
+        }
+        thread_ts = params.get("thread_ts")
+        if thread_ts:
+            message["thread_ts"] = str(thread_ts)
+            self.threads.setdefault((channel, str(thread_ts)), []).append(message)
+        async with self._replies:
+            self._replies.notify_all()
+        return {"ok": True, "channel": channel, "ts": ts, "message": message}
+
+    async def _update_message(self, params: dict[str, object]) -> dict[str, Any]:
+        return {"ok": True, "channel": params.get("channel"), "ts": params.get("ts")}
+
+    async def _replies_for(self, params: dict[str, object]) -> dict[str, Any]:
+        key = (str(params.get("channel", "")), str(params.get("ts", "")))
+        return {"ok": True, "messages": self.threads.get(key, []), "has_more": False}
+
+    # Socket Mode
+
+    async def _socket(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        _ = await ws.prepare(request)
+        await ws.send_json(
+            {
+                "type": "hello",
+                "num_connections": len(self._sockets) + 1,
+                "connection_info": {"app_id": APP_ID},
+            }
+        )
+        self._sockets.append(ws)
+        self.connected.set()
+        try:
+            async for msg in ws:
+                if msg.type == WSMsgType.TEXT:
+                    self._ack(cast(dict[str, object], json.loads(cast(str, msg.data))))
+        finally:
+            self._sockets.remove(ws)
+            if not self._sockets:
+                self.connected.clear()
+        return ws
+
+    def _ack(self, data: dict[str, object]) -> None:
+        delivery = self.deliveries.get(str(data.get("envelope_id")))
+        if delivery is None:
+            return
+        delivery.acks += 1
+        if delivery.acked_at is None:
+            delivery.acked_at = time.monotonic()
+            delivery.acked.set()
+
+    async def send_event(self, event: dict[str, Any]) -> Delivery:
+        """Send an Events API event to a connected app, redelivering it until acknowledged."""
+        _ = await self.connected.wait()
+        envelope_id = f"env-{next(self._ids)}"
+        delivery = Delivery(envelope_id, time.monotonic())
+        self.deliveries[envelope_id] = delivery
+        payload = {
+            "token": "fake",
+            "team_id": TEAM_ID,
+            "api_app_id": APP_ID,
+            "event": event,
+            "type": "event_callback",
+            "event_id": f"Ev{envelope_id}",
+            "event_time": int(time.time()),
+            "authorizations": [
+                {"team_id": TEAM_ID, "user_id": BOT_USER_ID, "is_bot": True},
+            ],
+        }
+        await self._send(delivery, payload, retry_reason="")
+        task = asyncio.create_task(self._redeliver(delivery, payload))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return delivery
+
+    async def _send(self, delivery: Delivery, payload: dict[str, Any], retry_reason: str) -> None:
+        ws = self._sockets[self._next_socket % len(self._sockets)]
+        self._next_socket += 1
+        await ws.send_json(
+            {
+                "envelope_id": delivery.envelope_id,
+                "payload": payload,
+                "type": "events_api",
+                "accepts_response_payload": False,
+                "retry_attempt": delivery.attempts - 1,
+                "retry_reason": retry_reason,
+            }
+        )
+
+    async def _redeliver(self, delivery: Delivery, payload: dict[str, Any]) -> None:
+        while delivery.attempts <= self.max_retries:
+            try:
+                _ = await asyncio.wait_for(delivery.acked.wait(), self.ack_timeout)
+                return
+            except TimeoutError:
+                pass
+            delivery.attempts += 1
+            if not self._sockets:
+                continue
+            logger.debug("Redelivering %s", delivery.envelope_id)
+            await self._send(delivery, payload, retry_reason="timeout")
+
+    # Conversation helpers for load generation
+
+    async def start_thread(self, channel: str) -> tuple[str, Delivery]:
+        """Open an assistant thread in `channel`; returns its `thread_ts`."""
+        thread_ts = self.new_ts()
+        self.threads[(channel, thread_ts)] = []
+        delivery = await self.send_event(
+            {
+                "type": "assistant_thread_started",
+                "assistant_thread": {
+                    "user_id": USER_ID,
+                    "context": {},
+                    "channel_id": channel,
+                    "thread_ts": thread_ts,
+                },
+                "event_ts": thread_ts,
+            }
+        )
+        return thread_ts, delivery
+
+    async def user_message(self, channel: str, thread_ts: str, text: str) -> tuple[str, Delivery]:
+        """Post a user message in an assistant thread; returns its `ts`."""
+        ts = self.new_ts()
+        message: Message = {
+            "type": "message",
+            "user": USER_ID,
+            "text": text,
+            "ts": ts,
+            "thread_ts": thread_ts,
+        }
+        self.threads.setdefault((channel, thread_ts), []).append(message)
+        event = {**message, "channel": channel, "channel_type": "im", "event_ts": ts}
+        return ts, await self.send_event(event)
+
+    def _reply_after(self, key: ThreadKey, ts: str) -> bool:
+        return any(
+            m.get("bot_id") and float(m["ts"]) > float(ts) for m in self.threads.get(key, [])
+        )
+
+    async def wait_for_reply(self, channel: str, thread_ts: str, after: str) -> None:
+        """Wait until the bot posts in the thread after message `after`."""
+        key = (channel, thread_ts)
+        async with self._replies:
+            _ = await self._replies.wait_for(lambda: self._reply_after(key, after))
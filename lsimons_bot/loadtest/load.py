@@ -0,0 +1,122 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+
+from lsimons_bot.bot.metrics import LatencyStats
+from lsimons_bot.loadtest.fake_slack import Delivery, FakeSlack
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_THREADS = 20
+DEFAULT_RATE = 5.0
+DEFAULT_TURNS = 1
+DEFAULT_TIMEOUT = 120.0
+# Keep every sample; a load run is bounded by its thread and turn counts
+LATENCY_WINDOW = 100_000
+
+
+@dataclass
+class LoadConfig:
+    threads: int = DEFAULT_THREADS
+    # New assistant threads started per second
+    rate: float = DEFAULT_RATE
+    # User messages per thread, each sent after the reply to the previous one
+    turns: int = DEFAULT_TURNS
+    # How long to wait for a reply before counting the message as unanswered
+    timeout: float = DEFAULT_TIMEOUT
+    prompt: str = "Hello, this is load test message {turn} in thread {thread}."
+
+
+@dataclass
+class LoadReport:
+    ack_latency: LatencyStats = field(default_factory=lambda: LatencyStats(LATENCY_WINDOW))
+    response_latency: LatencyStats = field(default_factory=lambda: LatencyStats(LATENCY_WINDOW))
+    events: int = 0
+    # Events never acknowledged, even after redelivery
+    dropped: int = 0
+    # Events acknowledged more than once, i.e. a redelivery the app handled again
+    duplicated: int = 0
+    messages: int = 0
+    unanswered: int = 0
+    duration: float = 0.0
+
+    def record_deliveries(self, deliveries: list[Delivery]) -> None:
+        for delivery in deliveries:
+            self.events += 1
+            latency = delivery.ack_latency
+            if latency is None:
+                self.dropped += 1
+            else:
+                self.ack_latency.record(latency)
+            if delivery.acks > 1:
+                self.duplicated += 1
+
+    def summary(self) -> str:
+        answered = self.messages - self.unanswered
+        throughput = answered / self.duration if self.duration else 0.0
+        ack_p99 = self.ack_latency.percentile(99)
+        response_p99 = self.response_latency.percentile(99)
+        return "\n".join(
+            [
+                f"duration: {self.duration:.1f}s, {throughput:.2f} answered messages/s",
+                f"events: {self.events}, dropped {self.dropped}, duplicated {self.duplicated}",
+                f"messages: {self.messages}, unanswered {self.unanswered}",
+                f"ack latency: {self.ack_latency.summary()} p99={ack_p99:.3f}s",
+                f"response latency: {self.response_latency.summary()} p99={response_p99:.2f}s",
+            ]
+        )
+
+
+async def _wait_for_reply(
+    slack: FakeSlack, channel: str, thread_ts: str, after: str, timeout: float
+) -> bool:
+    try:
+        await asyncio.wait_for(slack.wait_for_reply(channel, thread_ts, after), timeout)
+    except TimeoutError:
+        return False
+    return True
+
+
+async def _run_thread(
+    slack: FakeSlack, config: LoadConfig, index: int, report: LoadReport
+) -> list[Delivery]:
+    await asyncio.sleep(index / config.rate)
+    channel = f"D{index:08d}"
+    thread_ts, started = await slack.start_thread(channel)
+    deliveries = [started]
+    # The greeting comes first; wait for it so it is not taken for an answer
+    _ = await _wait_for_reply(slack, channel, thread_ts, thread_ts, config.timeout)
+
+    for turn in range(config.turns):
+        text = config.prompt.format(turn=turn + 1, thread=index + 1)
+        start = time.monotonic()
+        ts, delivery = await slack.user_message(channel, thread_ts, text)
+        deliveries.append(delivery)
+        report.messages += 1
+        if await _wait_for_reply(slack, channel, thread_ts, ts, config.timeout):
+            report.response_latency.record(time.monotonic() - start)
+        else:
+            report.unanswered += 1
+            logger.warning("No reply in %s/%s within %.0fs", channel, thread_ts, config.timeout)
+    return deliveries
+
+
+async def run_load(slack: FakeSlack, config: LoadConfig) -> LoadReport:
+    """Replay `config.threads` assistant threads against the app connected to `slack`.
+
+    Threads start at `config.rate` per second and run concurrently. Acknowledgement latency is
+    measured per event, response latency from sending a user message to the first bot message
+    after it in the thread.
+    """
+    _ = await slack.connected.wait()
+    report = LoadReport()
+    start = time.monotonic()
+    results = await asyncio.gather(
+        *(_run_thread(slack, config, i, report) for i in range(config.threads))
+    )
+    report.duration = time.monotonic() - start
+    # Give late acknowledgements and redeliveries a chance to show up
+    await asyncio.sleep(min(slack.ack_timeout, 1.0))
+    report.record_deliveries([d for deliveries in results for d in deliveries])
+    return report
@@ -0,0 +1,121 @@
+import argparse
+import sys
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+
+from lsimons_bot.retrieval.bench import (
+    DEFAULT_DOCUMENTS,
+    DEFAULT_QUERIES,
+    run_benchmark,
+    sample_queries,
+    synthetic_documents,
+)
+from lsimons_bot.retrieval.index import RetrievalIndex, build_index, read_documents
+from lsimons_bot.retrieval.retriever import DEFAULT_TOP_K
+
+DEFAULT_INDEX = Path("retrieval/index.bin")
+
+
+@dataclass
+class RetrievalArgs:
+    command: str = ""
+    directory: Path | None = None
+    index: Path = DEFAULT_INDEX
+    query: str = ""
+    top: int = DEFAULT_TOP_K
+    documents: int = DEFAULT_DOCUMENTS
+    queries: int = DEFAULT_QUERIES
+
+
+def _parse_args() -> RetrievalArgs:
+    parser = argparse.ArgumentParser(description="Build and query the assistant's document index")
+    # Subcommand options always overwrite the namespace, so they carry their own defaults
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="Index the documents in a directory")
+    _ = build.add_argument("directory", type=Path, help="Directory of .md, .txt and .rst files")
+    _ = build.add_argument(
+        "--index", type=Path, default=DEFAULT_INDEX, help=f"Index file (default {DEFAULT_INDEX})"
+    )
+
+    query = commands.add_parser("query", help="Show the best matching chunks for a query")
+    _ = query.add_argument("query")
+    _ = query.add_argument(
+        "--index", type=Path, default=DEFAULT_INDEX, help=f"Index file (default {DEFAULT_INDEX})"
+    )
+    _ = query.add_argument(
+        "--top", type=int, default=DEFAULT_TOP_K, help=f"Chunks to show (default {DEFAULT_TOP_K})"
+    )
+
+    bench = commands.add_parser("bench", help="Time index build and query latency")
+    _ = bench.add_argument(
+        "directory",
+        type=Path,
+        nargs="?",
+        help=f"Documents to index (default {DEFAULT_DOCUMENTS} synthetic documents)",
+    )
+    _ = bench.add_argument(
+        "--documents",
+        type=int,
+        default=DEFAULT_DOCUMENTS,
+        help=f"Synthetic documents (default {DEFAULT_DOCUMENTS})",
+    )
+    _ = bench.add_argument(
+        "--queries",
+        type=int,
+        default=DEFAULT_QUERIES,
+        help=f"Queries to time (default {DEFAULT_QUERIES})",
+    )
+    _ = bench.add_argument(
+        "--top", type=int, default=DEFAULT_TOP_K, help=f"Chunks per query (default {DEFAULT_TOP_K})"
+    )
+    return parser.parse_args(namespace=RetrievalArgs())
+
+
+def _build(args: RetrievalArgs) -> int:
+    assert args.directory is not None
+    if not args.directory.is_dir():
+        print(f"No directory at {args.directory}", file=sys.stderr)
+        return 1
+    chunks = build_index(args.directory, args.index)
+    print(f"Indexed {chunks} chunks from {args.directory} into {args.index}")
+    return 0
+
+
+def _query(args: RetrievalArgs) -> int:
+    index = RetrievalIndex.open(args.index)
+    try:
+        for hit in index.search(args.query, args.top):
+            print(f"{hit.score:6.2f}  {hit.source}")
+            print(f"        {hit.text[:200]!r}")
+    finally:
+        index.close()
+    return 0
+
+
+def _bench(args: RetrievalArgs) -> int:
+    if args.directory is not None:
+        chunks = list(read_documents(args.directory))
+    else:
+        chunks = list(synthetic_documents(args.documents))
+    queries = sample_queries(chunks, args.queries)
+    with tempfile.TemporaryDirectory() as directory:
+        report = run_benchmark(chunks, queries, Path(directory) / "index.bin", args.top)
+    print(report.summary())
+    return 0
+
+
+def main() -> int:
+    args = _parse_args()
+    match args.command:
+        case "build":
+            return _build(args)
+        case "query":
+            return _query(args)
+        case _:
+            return _bench(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
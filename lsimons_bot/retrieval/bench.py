@@ -0,0 +1,83 @@
+import random
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from lsimons_bot.bot.metrics import LatencyStats
+from lsimons_bot.retrieval.index import Chunk, RetrievalIndex, encode_index, tokenize
+
+DEFAULT_DOCUMENTS = 2000
+DEFAULT_QUERIES = 1000
+# Words per synthetic paragraph and paragraphs per document
+PARAGRAPH_WORDS = 60
+DOCUMENT_PARAGRAPHS = 5
+
+
+def _vocabulary(size: int, rng: random.Random) -> list[str]:
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return ["".join(rng.choices(letters, k=rng.randint(3, 10))) for _ in range(size)]
+
+
+def synthetic_documents(documents: int, seed: int = 0) -> Iterator[Chunk]:
+    """Paragraphs of words drawn with a Zipf-like skew, so some terms have long posting lists."""
+    rng = random.Random(seed)
+    words = _vocabulary(20_000, rng)
+    weights = [1 / (rank + 1) for rank in range(len(words))]
+    for i in range(documents):
+        for p in range(DOCUMENT_PARAGRAPHS):
+            text = " ".join(rng.choices(words, weights, k=PARAGRAPH_WORDS))
+            yield Chunk(f"doc-{i}.md > section {p}", text)
+
+
+def sample_queries(chunks: list[Chunk], count: int, seed: int = 0) -> list[str]:
+    """Queries of two to four words taken from random chunks, like a question about them."""
+    rng = random.Random(seed)
+    queries: list[str] = []
+    while len(queries) < count and chunks:
+        tokens = tokenize(rng.choice(chunks).text)
+        if tokens:
+            queries.append(" ".join(rng.sample(tokens, min(len(tokens), rng.randint(2, 4)))))
+    return queries
+
+
+@dataclass
+class BenchReport:
+    chunks: int = 0
+    terms: int = 0
+    index_bytes: int = 0
+    build_seconds: float = 0.0
+    open_seconds: float = 0.0
+    query: LatencyStats = field(default_factory=lambda: LatencyStats(window=100_000))
+
+    def summary(self) -> str:
+        q = self.query
+        return (
+            f"{self.chunks} chunks, {self.terms} terms, {self.index_bytes / 1e6:.1f} MB;"
+            f" build {self.build_seconds:.2f}s, open {self.open_seconds * 1000:.2f}ms;"
+            f" {q.count} queries p50={q.percentile(50) * 1000:.3f}ms"
+            f" p95={q.percentile(95) * 1000:.3f}ms p99={q.percentile(99) * 1000:.3f}ms"
+        )
+
+
+def run_benchmark(chunks: list[Chunk], queries: list[str], path: Path, top_k: int) -> BenchReport:
+    """Time building `chunks` into an index at `path`, opening it and running `queries`."""
+    report = BenchReport()
+    start = time.perf_counter()
+    data = encode_index(chunks)
+    _ = path.write_bytes(data)
+    report.build_seconds = time.perf_counter() - start
+    report.index_bytes = len(data)
+
+    start = time.perf_counter()
+    index = RetrievalIndex.open(path)
+    report.open_seconds = time.perf_counter() - start
+    report.chunks, report.terms = index.chunks, index.terms
+    try:
+        for query in queries:
+            start = time.perf_counter()
+            _ = index.search(query, top_k)
+            report.query.record(time.perf_counter() - start)
+    finally:
+        index.close()
+    return report
@@ -0,0 +1,325 @@
+import heapq
+import math
+import mmap
+import re
+import struct
+import sys
+from array import array
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Self, cast
+
+MAGIC = b"LSRI"
+# Bump when the file layout changes; an index of another version must be rebuilt
+VERSION = 1
+# Magic, version, byte order, chunk and term counts, average chunk length, then the offsets of
+# the eight sections: term offsets, term bytes, posting starts, posting chunk ids, posting term
+# frequencies, chunk length norms, chunk text offsets and chunk text. Numbers are native-endian
+# uint32 (norms float32), so the arrays are used in place; the byte order flag catches an index
+# built on another kind of machine
+HEADER = struct.Struct("<4sHBxIIf8Q")
+type Header = tuple[bytes, int, int, int, int, float, *tuple[int, ...]]
+ALIGN = 8
+
+# Files indexed by `build_index`
+DOCUMENT_SUFFIXES = (".md", ".markdown", ".txt", ".rst")
+# Paragraphs are packed into chunks of up to this many characters
+MAX_CHUNK_CHARS = 1200
+
+# BM25 parameters, the usual defaults
+K1 = 1.2
+B = 0.75
+# Postings read per query term. Posting lists are stored best match first, so for a term in
+# more chunks than this only the weakest matches of a weak term are left out
+MAX_POSTINGS = 1000
+
+TOKEN = re.compile(r"\w+")
+# Too common to say anything about a chunk; leaving them out keeps posting lists short
+# fmt: off
+STOPWORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "but", "by", "for", "from", "has", "have", "he",
+    "her", "his", "i", "if", "in", "into", "is", "it", "its", "me", "my", "no", "not", "of", "on",
+    "or", "our", "she", "so", "that", "the", "their", "them", "then", "there", "these", "they",
+    "this", "to", "was", "we", "were", "what", "when", "where", "which", "who", "will", "with",
+    "you", "your",
+})
+# fmt: on
+
+
+def tokenize(text: str) -> list[str]:
+    return [
+        token
+        for token in cast(list[str], TOKEN.findall(text.lower()))
+        if token not in STOPWORDS and not (len(token) == 1 and token.isalpha())
+    ]
+
+
+@dataclass
+class Chunk:
+    # Document path relative to the indexed directory, and the heading the text is under
+    source: str
+    text: str
+
+
+@dataclass
+class Hit:
+    chunk: int
+    score: float
+    source: str
+    text: str
+
+
+def _heading(paragraph: str) -> str | None:
+    first = paragraph.lstrip().split("\n", 1)[0]
+    if first.startswith("#"):
+        return first.lstrip("#").strip() or None
+    return None
+
+
+def chunk_document(source: str, text: str, max_chars: int = MAX_CHUNK_CHARS) -> list[Chunk]:
+    """Split a document into chunks of whole paragraphs, each labelled with its heading."""
+    chunks: list[Chunk] = []
+    heading: str | None = None
+    current: list[str] = []
+    size = 0
+    # Inside a ``` block a line starting with # is a comment, not a heading
+    fenced = False
+
+    def flush() -> None:
+        nonlocal size
+        if current:
+            label = f"{source} > {heading}" if heading else source
+            chunks.append(Chunk(label, "\n\n".join(current)))
+            current.clear()
+            size = 0
+
+    for paragraph in re.split(r"\n\s*\n", text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        new_heading = None if fenced else _heading(paragraph)
+        if new_heading is not None:
+            flush()
+            heading = new_heading
+        if paragraph.count("```") % 2:
+            fenced = not fenced
+        while len(paragraph) > max_chars:
+            # A paragraph longer than a chunk is cut at the last space that fits
+            cut = paragraph.rfind(" ", 0, max_chars)
+            cut = cut if cut > 0 else max_chars
+            flush()
+            current.append(paragraph[:cut])
+            flush()
+            paragraph = paragraph[cut:].lstrip()
+        if size and size + len(paragraph) > max_chars:
+            flush()
+        current.append(paragraph)
+        size += len(paragraph) + 2
+    flush()
+    return chunks
+
+
+def read_documents(directory: Path) -> Iterator[Chunk]:
+    for path in sorted(directory.rglob("*")):
+        if path.is_file() and path.suffix.lower() in DOCUMENT_SUFFIXES:
+            text = path.read_text(encoding="utf-8", errors="replace")
+            yield from chunk_document(path.relative_to(directory).as_posix(), text)
+
+
+def _pad(out: bytearray) -> int:
+    out.extend(b"\0" * (-len(out) % ALIGN))
+    return len(out)
+
+
+def _norms(lengths: array[int]) -> array[float]:
+    """The BM25 length normalisation of each chunk, so a query does not recompute it."""
+    average = sum(lengths) / len(lengths) if lengths else 0.0
+    return array("f", (K1 * (1 - B + B * length / average) for length in lengths))
+
+
+def encode_index(chunks: Iterable[Chunk]) -> bytes:
+    """Lay out an inverted index over `chunks` in the format `RetrievalIndex` reads."""
+    postings: dict[bytes, list[tuple[int, int]]] = {}
+    lengths = array("I")
+    texts: list[bytes] = []
+    for chunk_id, chunk in enumerate(chunks):
+        tokens = tokenize(f"{chunk.source}\n{chunk.text}")
+        lengths.append(len(tokens))
+        texts.append(f"{chunk.source}\n{chunk.text}".encode())
+        for term, tf in Counter(tokens).items():
+            postings.setdefault(term.encode(), []).append((chunk_id, tf))
+
+    norms = _norms(lengths)
+    # Sorted by their bytes, so a lookup can binary search the terms in the file
+    terms = sorted(postings)
+    term_offsets, posting_starts = array("I", [0]), array("I", [0])
+    chunk_ids, frequencies = array("I"), array("I")
+    for term in terms:
+        term_offsets.append(term_offsets[-1] + len(term))
+        # Highest BM25 term weight first, so a search can stop after MAX_POSTINGS
+        ranked = sorted(postings[term], key=lambda p: p[1] / (p[1] + norms[p[0]]), reverse=True)
+        for chunk_id, tf in ranked:
+            chunk_ids.append(chunk_id)
+            frequencies.append(tf)
+        posting_starts.append(len(chunk_ids))
+    text_offsets = array("I", [0])
+    for text in texts:
+        text_offsets.append(text_offsets[-1] + len(text))
+
+    sections: list[bytes] = [
+        term_offsets.tobytes(),
+        b"".join(terms),
+        posting_starts.tobytes(),
+        chunk_ids.tobytes(),
+        frequencies.tobytes(),
+        norms.tobytes(),
+        text_offsets.tobytes(),
+        b"".join(texts),
+    ]
+    out = bytearray(HEADER.size)
+    offsets: list[int] = []
+    for section in sections:
+        offsets.append(_pad(out))
+        out.extend(section)
+    average = sum(lengths) / len(lengths) if lengths else 0.0
+    HEADER.pack_into(
+        out,
+        0,
+        MAGIC,
+        VERSION,
+        sys.byteorder == "little",
+        len(lengths),
+        len(terms),
+        average,
+        *offsets,
+    )
+    return bytes(out)
+
+
+def build_index(directory: Path, path: Path) -> int:
+    """Index the documents under `directory` into `path`; returns the number of chunks."""
+    data = encode_index(read_documents(directory))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.tmp")
+    _ = tmp.write_bytes(data)
+    _ = tmp.replace(path)
+    return cast(Header, HEADER.unpack_from(data))[3]
+
+
+class IndexFormatError(Exception):
+    pass
+
+
+class RetrievalIndex:
+    """A BM25 index over document chunks, read straight from a memory-mapped file.
+
+    Opening the index maps the file and nothing else; the term table, posting lists and chunk
+    texts are read in place, so startup time and memory do not grow with the corpus. A lookup
+    binary searches the sorted terms and scores only the chunks in the query terms' postings.
+    """
+
+    def __init__(self, data: mmap.mmap | bytes) -> None:
+        if len(data) < HEADER.size:
+            raise IndexFormatError("file too short")
+        header = cast(Header, HEADER.unpack_from(data))
+        magic, version, little_endian, chunks, terms, average, *offsets = header
+        if magic != MAGIC:
+            raise IndexFormatError("not a retrieval index")
+        if version != VERSION:
+            raise IndexFormatError(f"index version {version}, expected {VERSION}; rebuild it")
+        if bool(little_endian) != (sys.byteorder == "little"):
+            raise IndexFormatError("index was built on a machine with another byte order")
+        self._data: mmap.mmap | bytes = data
+        self.chunks: int = chunks
+        self.terms: int = terms
+        self.average_length: float = average
+        term_offsets, term_bytes, starts, chunk_ids, frequencies, norms, texts, text_bytes = offsets
+        self._term_bytes: int = term_bytes
+        self._text_bytes: int = text_bytes
+        self._view: memoryview[int] = memoryview(data)
+        # Each section is checked against the file before it is read, so a truncated or
+        # damaged index fails here instead of with an IndexError or cut-off text later
+        self._term_offsets: memoryview[int] = self._uints(term_offsets, terms + 1)
+        self._check(term_bytes, self._term_offsets[terms])
+        self._posting_starts: memoryview[int] = self._uints(starts, terms + 1)
+        postings = self._posting_starts[terms]
+        self._chunk_ids: memoryview[int] = self._uints(chunk_ids, postings)
+        self._frequencies: memoryview[int] = self._uints(frequencies, postings)
+        self._check(norms, 4 * chunks)
+        self._norms: memoryview[float] = self._view[norms : norms + 4 * chunks].cast("f")
+        self._text_offsets: memoryview[int] = self._uints(texts, chunks + 1)
+        self._check(text_bytes, self._text_offsets[chunks])
+
+    def _check(self, offset: int, size: int) -> None:
+        if offset < HEADER.size or offset + size > len(self._view):
+            raise IndexFormatError("file truncated or damaged; rebuild it")
+
+    def _uints(self, offset: int, count: int) -> memoryview[int]:
+        self._check(offset, 4 * count)
+        return self._view[offset : offset + 4 * count].cast("I")
+
+    @classmethod
+    def open(cls, path: Path) -> Self:
+        with path.open("rb") as f:
+            if path.stat().st_size < HEADER.size:
+                # Also keeps mmap from failing on an empty file
+                raise IndexFormatError("file too short")
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(data)
+
+    def close(self) -> None:
+        for view in (
+            self._term_offsets,
+            self._posting_starts,
+            self._chunk_ids,
+            self._frequencies,
+            self._norms,
+            self._text_offsets,
+            self._view,
+        ):
+            view.release()
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+
+    def _term(self, i: int) -> bytes:
+        start = self._term_bytes + self._term_offsets[i]
+        return self._data[start : self._term_bytes + self._term_offsets[i + 1]]
+
+    def _find(self, term: bytes) -> int | None:
+        low, high = 0, self.terms
+        while low < high:
+            middle = (low + high) // 2
+            if self._term(middle) < term:
+                low = middle + 1
+            else:
+                high = middle
+        return low if low < self.terms and self._term(low) == term else None
+
+    def chunk(self, chunk_id: int) -> tuple[str, str]:
+        """The source label and text of a chunk."""
+        start = self._text_bytes + self._text_offsets[chunk_id]
+        end = self._text_bytes + self._text_offsets[chunk_id + 1]
+        source, _, text = self._data[start:end].decode().partition("\n")
+        return source, text
+
+    def search(self, query: str, count: int = 5, max_postings: int = MAX_POSTINGS) -> list[Hit]:
+        """The `count` chunks that best match `query`, best first."""
+        scores: dict[int, float] = {}
+        for term in set(tokenize(query)):
+            i = self._find(term.encode())
+            if i is None:
+                continue
+            start, end = self._posting_starts[i], self._posting_starts[i + 1]
+            df = end - start
+            weight = math.log(1 + (self.chunks - df + 0.5) / (df + 0.5)) * (K1 + 1)
+            end = min(end, start + max_postings)
+            norms, get = self._norms, scores.get
+            # Slicing the memoryviews copies nothing; zip keeps the per-posting work minimal
+            for chunk_id, tf in zip(
+                self._chunk_ids[start:end], self._frequencies[start:end], strict=True
+            ):
+                scores[chunk_id] = get(chunk_id, 0.0) + weight * tf / (tf + norms[chunk_id])
+        best = heapq.nlargest(count, scores.items(), key=lambda item: item[1])
+        return [Hit(chunk_id, score, *self.chunk(chunk_id)) for chunk_id, score in best]
@@ -0,0 +1,55 @@
+import logging
+import time
+
+from lsimons_bot.bot.router import CHARS_PER_TOKEN
+from lsimons_bot.retrieval.index import Hit, RetrievalIndex
+from lsimons_bot.tracing.trace import span
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOP_K = 5
+DEFAULT_MAX_TOKENS = 1000
+
+CONTEXT_HEADER = "Reference notes that may help answer the next message, with their source:"
+
+
+class Retriever:
+    """Turns a question into reference notes from the index, within a token budget."""
+
+    def __init__(
+        self,
+        index: RetrievalIndex,
+        top_k: int = DEFAULT_TOP_K,
+        max_tokens: int = DEFAULT_MAX_TOKENS,
+    ) -> None:
+        self.index: RetrievalIndex = index
+        self.top_k: int = top_k
+        self.max_tokens: int = max_tokens
+
+    def retrieve(self, query: str) -> list[Hit]:
+        with span("retrieval.search") as current:
+            start = time.perf_counter()
+            hits = self.index.search(query, self.top_k)
+            current.set("hits", len(hits))
+        logger.debug(
+            "Retrieved %d chunks in %.2fms", len(hits), (time.perf_counter() - start) * 1000
+        )
+        return hits
+
+    def context(self, query: str) -> str | None:
+        """The best matching chunks for `query` as one text, or None if nothing matched.
+
+        Chunks are added best first while they fit in `max_tokens`; one that does not fit is
+        skipped in favour of shorter, lower ranked ones.
+        """
+        budget = self.max_tokens * CHARS_PER_TOKEN - len(CONTEXT_HEADER)
+        notes: list[str] = []
+        for hit in self.retrieve(query):
+            note = f"[{hit.source}]\n{hit.text}"
+            if len(note) + 2 > budget:
+                continue
+            notes.append(note)
+            budget -= len(note) + 2
+        if not notes:
+            return None
+        return "\n\n".join([CONTEXT_HEADER, *notes])
@@ -1,18 +1,36 @@
 # pyright: reportUnknownMemberType=none, reportUnknownVariableType=none
 from slack_bolt.async_app import AsyncApp, AsyncAssistant
 
+from lsimons_bot.app.profiling import Profiler
 from lsimons_bot.bot.bot import Bot
+from lsimons_bot.slack.users import UserDirectory
+from lsimons_bot.slack.work_log import WorkLog
+from lsimons_bot.slack.work_queue import WorkQueue, queued
 
-from .assistant_message import assistant_message_handler_maker
+from .assistant_message import assistant_busy, assistant_message_handler_maker
 from .assistant_thread_started import assistant_thread_started
 
 
-def register(app: AsyncApp, bot: Bot) -> None:
+def register(
+    app: AsyncApp,
+    bot: Bot,
+    profiler: Profiler | None = None,
+    work_queue: WorkQueue | None = None,
+    work_log: WorkLog | None = None,
+    users: UserDirectory | None = None,
+) -> None:
     assistant = AsyncAssistant()
-    _ = assistant.thread_started(assistant_thread_started)
-    _ = assistant.user_message(
-        assistant_message_handler_maker(
-            bot,
-        )
+    thread_started = assistant_thread_started
+    user_message = assistant_message_handler_maker(
+        bot,
+        profiler,
+        work_log,
+        users,
     )
+    if work_queue is not None:
+        # Greeting and answers share the thread's queue, so the greeting is posted first
+        thread_started = queued(work_queue, thread_started)
+        user_message = queued(work_queue, user_message, on_rejected=assistant_busy)
+    _ = assistant.thread_started(thread_started)
+    _ = assistant.user_message(user_message)
     _ = app.use(assistant)
@@ -1,6 +1,7 @@
 # pyright: reportUnknownMemberType=none
 import logging
 from asyncio import sleep
+from contextlib import AbstractContextManager, nullcontext
 from typing import Any, cast
 
 from slack_bolt.async_app import (
@@ -9,17 +10,32 @@ from slack_bolt.async_app import (
     AsyncSetStatus,
     AsyncSetTitle,
 )
+from slack_bolt.kwargs_injection.async_args import AsyncArgs
 from slack_sdk.web.async_client import AsyncWebClient
 from slack_sdk.web.async_slack_response import AsyncSlackResponse
 
-from lsimons_bot.bot.bot import Bot, Messages
+from lsimons_bot.app.profiling import Profiler
+from lsimons_bot.bot.bot import Bot, Messages, ThreadKey
+from lsimons_bot.slack.assistant.thread_titles import ThreadTitler
+from lsimons_bot.slack.mrkdwn import response_messages
+from lsimons_bot.slack.users import UserDirectory
+from lsimons_bot.slack.work_log import LoggedRequest, WorkLog
+from lsimons_bot.tracing.trace import span
 
 logger = logging.getLogger(__name__)
 
+BUSY_MESSAGE = "Sorry, I'm handling too many conversations right now. Please try again in a minute."
+
 
 def assistant_message_handler_maker(
     bot: Bot,
+    profiler: Profiler | None = None,
+    work_log: WorkLog | None = None,
+    users: UserDirectory | None = None,
+    titler: ThreadTitler | None = None,
 ):
+    titler = titler or ThreadTitler(bot)
+
     async def assistant_message(
         context: AsyncBoltContext,
         payload: dict[str, Any],
@@ -28,53 +44,110 @@ def assistant_message_handler_maker(
         set_title: AsyncSetTitle,
         client: AsyncWebClient,
     ) -> None:
-        user_message = cast(str, payload.get("text", ""))
-        logger.debug(">> assistant_message('%s',...)", user_message)
-        channel_id = context.channel_id
-        thread_ts = context.thread_ts
-        messages: Messages = []
-        loading_messages = bot.loading_messages()
-
-        if len(user_message) <= 50:
-            _ = await set_title(user_message)
-
-        _ = await set_status(status="thinking...", loading_messages=loading_messages)
-        await sleep(0.05)
-
-        if channel_id is not None and thread_ts is not None:
-            try:
-                messages = await read_thread(client, channel_id, thread_ts)
-            except Exception as e:
-                logger.error("Error reading the message thread: %s", e)
-                _ = await say(f"Error reading the message thread: {e}")
-                return
-        else:
-            messages = [{"role": "user", "content": user_message}]
-        logger.debug("message thread: %s", messages)
+        async with profiler.track("assistant_message") if profiler else nullcontext():
+            with (
+                span(
+                    "slack.assistant_message",
+                    channel=context.channel_id,
+                    thread_ts=context.thread_ts,
+                ),
+                _logged(work_log, context, payload),
+            ):
+                user_message = cast(str, payload.get("text", ""))
+                logger.debug(">> assistant_message('%s',...)", user_message)
+                channel_id = context.channel_id
+                thread_ts = context.thread_ts
+                messages: Messages = []
+                loading_messages = bot.loading_messages()
+
+                thread: ThreadKey | None = None
+                if channel_id is not None and thread_ts is not None:
+                    thread = (channel_id, thread_ts)
 
-        await sleep(0.05)
-        response = await bot.chat(messages)
-        _ = await say(response)
-        logger.debug("<< assistant_message()")
+                _ = await set_status(status="thinking...", loading_messages=loading_messages)
+                await sleep(0.05)
+
+                if thread is not None:
+                    try:
+                        messages = await read_thread(client, *thread, users)
+                    except Exception as e:
+                        logger.error("Error reading the message thread: %s", e)
+                        _ = await say(f"Error reading the message thread: {e}")
+                        return
+                    # Only from the thread's first message, which the thread itself tells us, so
+                    # a restart or a forgotten thread is not retitled from a later message. In
+                    # the background; the answer does not wait for the title
+                    if _user_turns(messages) <= 1:
+                        titler.start(thread, user_message, set_title)
+                else:
+                    messages = [{"role": "user", "content": user_message}]
+                logger.debug("message thread: %s", messages)
+
+                await sleep(0.05)
+                response = await bot.chat(messages, thread=thread)
+                for message in response_messages(response):
+                    _ = await say(**message)
+                logger.debug("<< assistant_message()")
 
     return assistant_message
 
 
-async def read_thread(client: AsyncWebClient, channel_id: str, thread_ts: str) -> Messages:
-    messages: Messages = []
-    replies: AsyncSlackResponse = await client.conversations_replies(
-        channel=channel_id,
-        ts=thread_ts,
-        oldest=thread_ts,
-        limit=100,
+def _user_turns(messages: Messages) -> int:
+    return sum(1 for message in messages if message["role"] == "user")
+
+
+def _logged(
+    work_log: WorkLog | None, context: AsyncBoltContext, payload: dict[str, Any]
+) -> AbstractContextManager[object]:
+    """Record the request in the work log, so a restart can pick it up again."""
+    if work_log is None or context.channel_id is None or context.thread_ts is None:
+        return nullcontext()
+    return work_log.track(
+        LoggedRequest(
+            channel=context.channel_id,
+            thread_ts=context.thread_ts,
+            message_ts=cast(str, payload.get("ts", "")),
+            text=cast(str, payload.get("text", "")),
+        )
     )
-    raw_messages = cast(list[dict[str, Any]], replies.get("messages", []))
+
+
+async def assistant_busy(args: AsyncArgs) -> None:
+    """Tell the user their message was dropped because the work queue is full."""
+    _ = await args.say(BUSY_MESSAGE)
+
+
+async def read_thread(
+    client: AsyncWebClient,
+    channel_id: str,
+    thread_ts: str,
+    users: UserDirectory | None = None,
+) -> Messages:
+    """The thread as chat messages; with a user directory, user turns name their speaker.
+
+    Names come from the directory only, so a thread with many people costs no extra API calls.
+    """
+    messages: Messages = []
+    with span("slack.read_thread") as current:
+        replies: AsyncSlackResponse = await client.conversations_replies(
+            channel=channel_id,
+            ts=thread_ts,
+            oldest=thread_ts,
+            limit=100,
+        )
+        raw_messages = cast(list[dict[str, Any]], replies.get("messages", []))
+        current.set("replies", len(raw_messages))
     for message in raw_messages:
         message_text = cast(str, message.get("text", ""))
         if message_text.strip() == "":
             continue
+        if users is not None:
+            message_text = users.resolve_mentions(message_text)
         bot_id = message.get("bot_id")
         if bot_id is None:
+            speaker = users.name(cast(str, message.get("user", ""))) if users else None
+            if speaker is not None:
+                message_text = f"{speaker}: {message_text}"
             messages.append({"role": "user", "content": message_text})
         else:
             messages.append({"role": "assistant", "content": message_text})
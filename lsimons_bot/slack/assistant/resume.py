@@ -0,0 +1,86 @@
+# pyright: reportUnknownMemberType=none
+import logging
+import time
+
+from slack_sdk.web.async_client import AsyncWebClient
+
+from lsimons_bot.bot.bot import Bot
+from lsimons_bot.slack.assistant.assistant_message import read_thread
+from lsimons_bot.slack.mrkdwn import response_messages
+from lsimons_bot.slack.users import UserDirectory
+from lsimons_bot.slack.work_log import LoggedRequest, WorkLog
+from lsimons_bot.slack.work_queue import WorkQueue
+
+logger = logging.getLogger(__name__)
+
+# A request cut off this many times is not tried again
+MAX_ATTEMPTS = 2
+# Older questions get an apology instead of a late answer
+MAX_AGE = 15 * 60.0
+
+RESTART_MESSAGE = (
+    "Sorry, I was restarted while working on your message and couldn't finish."
+    " Please send it again."
+)
+
+
+async def resume_request(
+    client: AsyncWebClient,
+    bot: Bot,
+    work_log: WorkLog,
+    request: LoggedRequest,
+    max_age: float = MAX_AGE,
+    users: UserDirectory | None = None,
+) -> None:
+    """Answer a request cut off by a restart, or apologise when it is too old to pick up."""
+    channel, thread_ts = request.channel, request.thread_ts
+    work_log.retry(request)
+    if request.attempts >= MAX_ATTEMPTS or time.time() - request.created > max_age:
+        logger.info("Giving up on request %s after a restart", request.id)
+        _ = await client.chat_postMessage(
+            channel=channel, thread_ts=thread_ts, text=RESTART_MESSAGE
+        )
+        work_log.fail(request)
+        return
+
+    logger.info("Resuming request %s after a restart", request.id)
+    with work_log.track(request):
+        messages = list(await read_thread(client, channel, thread_ts, users))
+        if messages and messages[-1]["role"] == "assistant":
+            # The answer went out before the restart
+            return
+        _ = await client.assistant_threads_setStatus(
+            channel_id=channel, thread_ts=thread_ts, status="thinking..."
+        )
+        response = await bot.chat(messages, thread=(channel, thread_ts))
+        for message in response_messages(response):
+            _ = await client.chat_postMessage(channel=channel, thread_ts=thread_ts, **message)
+
+
+async def resume_requests(
+    client: AsyncWebClient,
+    bot: Bot,
+    work_log: WorkLog,
+    work_queue: WorkQueue | None = None,
+    users: UserDirectory | None = None,
+) -> None:
+    """Pick up the requests a previous run left unfinished.
+
+    With a work queue they go through it, in order with new messages in the same thread.
+    """
+    requests = work_log.unfinished()
+    if not requests:
+        return
+    logger.info("Found %d requests unfinished by the previous run", len(requests))
+    for request in requests:
+
+        async def resume(request: LoggedRequest = request) -> None:
+            await resume_request(client, bot, work_log, request, users=users)
+
+        if work_queue is None:
+            try:
+                await resume()
+            except Exception as e:
+                logger.error("Resuming request %s failed: %r", request.id, e)
+        else:
+            _ = await work_queue.submit((request.channel, request.thread_ts), resume)
@@ -0,0 +1,59 @@
+import asyncio
+import logging
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+
+from lsimons_bot.bot.bot import Bot, ThreadKey, short_title
+from lsimons_bot.tracing.trace import span
+
+logger = logging.getLogger(__name__)
+
+type SetTitle = Callable[[str], Awaitable[object]]
+
+# Threads remembered as titled, so a redelivered first message is not titled twice
+MAX_THREADS = 1000
+
+
+class ThreadTitler:
+    """Titles assistant threads from their first message, in the background.
+
+    `start` returns at once; the title is generated and set in a task, so answering never waits
+    on it. Short messages are their own title, longer ones are summarized by `bot.title`. The
+    caller starts it only for a thread's first message; threads titled recently are skipped.
+    """
+
+    def __init__(self, bot: Bot, max_threads: int = MAX_THREADS) -> None:
+        self.bot: Bot = bot
+        self.max_threads: int = max_threads
+        # Titles set per thread, least recently titled first
+        self.titles: OrderedDict[ThreadKey, str] = OrderedDict()
+        self._tasks: dict[ThreadKey, asyncio.Task[None]] = {}
+
+    def start(self, thread: ThreadKey, text: str, set_title: SetTitle) -> None:
+        if thread in self.titles or thread in self._tasks or not text.strip():
+            return
+        task = asyncio.create_task(self._title(thread, text, set_title))
+        self._tasks[thread] = task
+        task.add_done_callback(lambda _: self._tasks.pop(thread, None))
+
+    async def _title(self, thread: ThreadKey, text: str, set_title: SetTitle) -> None:
+        with span("slack.thread_title"):
+            try:
+                title = await self.bot.title(text)
+            except Exception as e:
+                logger.warning("Generating a title for thread %s failed: %r", thread, e)
+                title = short_title(text)
+            try:
+                _ = await set_title(title)
+            except Exception as e:
+                logger.warning("Setting the title of thread %s failed: %r", thread, e)
+                return
+        self.titles[thread] = title
+        while len(self.titles) > self.max_threads:
+            _ = self.titles.popitem(last=False)
+        logger.debug("Thread %s titled %r", thread, title)
+
+    async def wait(self) -> None:
+        """Wait for titles that are being generated; for tests and shutdown."""
+        if self._tasks:
+            _ = await asyncio.gather(*self._tasks.values(), return_exceptions=True)
@@ -1,8 +1,9 @@
 # pyright: reportUnknownMemberType=none, reportUnknownVariableType=none
 from slack_bolt.async_app import AsyncApp
 
-from .app_home_opened import app_home_opened
+from .app_home_opened import app_home_opened_handler_maker
+from .home_view import HomeView
 
 
-def register(app: AsyncApp) -> None:
-    _ = app.event("app_home_opened")(app_home_opened)
+def register(app: AsyncApp, home_view: HomeView) -> None:
+    _ = app.event("app_home_opened")(app_home_opened_handler_maker(home_view))
@@ -1,7 +1,26 @@
+# pyright: reportUnknownMemberType=none
 import logging
+from typing import Any, cast
+
+from slack_sdk.web.async_client import AsyncWebClient
+
+from .home_view import HomeView
 
 logger = logging.getLogger(__name__)
 
 
-async def app_home_opened() -> None:
-    pass
+def app_home_opened_handler_maker(
+    home_view: HomeView,
+):
+    async def app_home_opened(event: dict[str, Any], client: AsyncWebClient) -> None:
+        user_id = cast(str, event.get("user", ""))
+        logger.debug(">> app_home_opened('%s',...)", user_id)
+
+        if event.get("tab", "home") != "home":
+            logger.debug("ignoring %s tab", event.get("tab"))
+            return
+
+        _ = await client.views_publish(user_id=user_id, view=home_view.view)
+        logger.debug("<< app_home_opened()")
+
+    return app_home_opened
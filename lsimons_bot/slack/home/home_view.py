@@ -0,0 +1,159 @@
+import asyncio
+import html
+import logging
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from lsimons_bot.blog.github import CommitInfo, CommitSource
+from lsimons_bot.blog.scheduler import BlogScheduler
+from lsimons_bot.blog.wordpress import BlogPost, WordPressClient
+
+logger = logging.getLogger(__name__)
+
+REFRESH_INTERVAL_SECONDS = 15 * 60
+ACTIVITY_WINDOW = timedelta(days=7)
+# Re-fetch a little history on every refresh so commits that land late are not missed
+FETCH_OVERLAP = timedelta(hours=1)
+RECENT_POSTS_COUNT = 5
+TOP_REPOS_COUNT = 5
+
+type View = dict[str, Any]
+type Block = dict[str, Any]
+
+
+@dataclass
+class HomeActivity:
+    posts: list[BlogPost] = field(default_factory=list[BlogPost])
+    commits: list[CommitInfo] = field(default_factory=list[CommitInfo])
+    refreshed_at: datetime | None = None
+    publisher_status: str | None = None
+
+
+def _escape(text: str) -> str:
+    return html.unescape(text).replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def _section(text: str) -> Block:
+    return {"type": "section", "text": {"type": "mrkdwn", "text": text}}
+
+
+def _posts_blocks(posts: list[BlogPost]) -> list[Block]:
+    blocks: list[Block] = [{"type": "header", "text": {"type": "plain_text", "text": "Blog"}}]
+    if not posts:
+        blocks.append(_section("No blog posts yet."))
+        return blocks
+    lines = [f"• <{post.link}|{_escape(post.title)}> ({post.date:%Y-%m-%d})" for post in posts]
+    blocks.append(_section("\n".join(lines)))
+    return blocks
+
+
+def _commits_blocks(commits: list[CommitInfo]) -> list[Block]:
+    days = ACTIVITY_WINDOW.days
+    blocks: list[Block] = [
+        {"type": "header", "text": {"type": "plain_text", "text": f"GitHub (last {days} days)"}}
+    ]
+    if not commits:
+        blocks.append(_section("No commits."))
+        return blocks
+    additions = sum(c.additions for c in commits)
+    deletions = sum(c.deletions for c in commits)
+    per_repo = Counter(c.repo_name for c in commits)
+    blocks.append(
+        _section(
+            f"*{len(commits)}* commits in *{len(per_repo)}* repos (+{additions}/-{deletions} lines)"
+        )
+    )
+    lines = [f"• `{repo}`: {count}" for repo, count in per_repo.most_common(TOP_REPOS_COUNT)]
+    blocks.append(_section("\n".join(lines)))
+    return blocks
+
+
+def render_home_view(activity: HomeActivity) -> View:
+    blocks: list[Block] = [
+        _section(
+            "Hi! I'm *lsimons-bot*, the assistant to Leo Simons. Here's what I've been up to."
+        ),
+    ]
+    blocks.extend(_posts_blocks(activity.posts))
+    blocks.extend(_commits_blocks(activity.commits))
+    if activity.publisher_status is not None:
+        blocks.append(_section(f"*Blog publisher:* {_escape(activity.publisher_status)}"))
+    if activity.refreshed_at is not None:
+        ts = int(activity.refreshed_at.timestamp())
+        fallback = f"{activity.refreshed_at:%Y-%m-%d %H:%M} UTC"
+        blocks.append(
+            {
+                "type": "context",
+                "elements": [
+                    {
+                        "type": "mrkdwn",
+                        "text": f"Updated <!date^{ts}^{{date_short_pretty}} {{time}}|{fallback}>",
+                    }
+                ],
+            }
+        )
+    return {"type": "home", "blocks": blocks}
+
+
+class HomeView:
+    """Pre-rendered App Home view, kept up to date by a background refresher.
+
+    `app_home_opened` only ever reads `view`, so publishing never waits on WordPress or GitHub.
+    """
+
+    def __init__(
+        self,
+        wp: WordPressClient | None = None,
+        gh: CommitSource | None = None,
+        scheduler: BlogScheduler | None = None,
+    ) -> None:
+        self.wp: WordPressClient | None = wp
+        self.gh: CommitSource | None = gh
+        self.scheduler: BlogScheduler | None = scheduler
+        self.activity: HomeActivity = HomeActivity()
+        self.view: View = render_home_view(self.activity)
+        self._commits: dict[tuple[str, str], CommitInfo] = {}
+        self._last_fetch: datetime | None = None
+
+    async def refresh(self) -> None:
+        now = datetime.now(UTC)
+        posts = self.activity.posts
+        if self.wp is not None:
+            posts = await asyncio.to_thread(self.wp.get_recent_posts, RECENT_POSTS_COUNT)
+
+        if self.gh is not None:
+            cutoff = now - ACTIVITY_WINDOW
+            since = cutoff if self._last_fetch is None else self._last_fetch - FETCH_OVERLAP
+            stats = await asyncio.to_thread(self.gh.get_commits_since, since)
+            for commit in stats.commits:
+                self._commits[(commit.repo_name, commit.sha)] = commit
+            self._commits = {k: c for k, c in self._commits.items() if c.date >= cutoff}
+            self._last_fetch = now
+
+        commits = sorted(self._commits.values(), key=lambda c: c.date, reverse=True)
+        self.activity = HomeActivity(
+            posts=posts,
+            commits=commits,
+            refreshed_at=now,
+            publisher_status=self._publisher_status(),
+        )
+        self.view = render_home_view(self.activity)
+        logger.debug("Home view refreshed: %d posts, %d commits", len(posts), len(commits))
+
+    def _publisher_status(self) -> str | None:
+        if self.scheduler is None:
+            return None
+        last_run = self.scheduler.last_run
+        if last_run is None:
+            return "not run yet"
+        return f"{last_run.status} ({last_run.started_at:%Y-%m-%d %H:%M} UTC)"
+
+    async def run(self, interval: float = REFRESH_INTERVAL_SECONDS) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.warning("Error refreshing home view: %s", e)
+            await asyncio.sleep(interval)
@@ -1,10 +1,16 @@
 # pyright: reportUnknownMemberType=none, reportUnknownVariableType=none
 from slack_bolt.async_app import AsyncApp
 
+from lsimons_bot.slack.work_queue import WorkQueue, queued
+
 from .app_mention import app_mention
 from .message import message
 
 
-def register(app: AsyncApp) -> None:
-    _ = app.event("message")(message)
-    _ = app.event("app_mention")(app_mention)
+def register(app: AsyncApp, work_queue: WorkQueue | None = None) -> None:
+    if work_queue is None:
+        _ = app.event("message")(message)
+        _ = app.event("app_mention")(app_mention)
+    else:
+        _ = app.event("message")(queued(work_queue, message))
+        _ = app.event("app_mention")(queued(work_queue, app_mention))
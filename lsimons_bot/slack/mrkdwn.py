@@ -0,0 +1,222 @@
+import re
+from typing import NotRequired, TypedDict, cast
+
+# Slack limits: a section block's text is capped at 3000 characters and a message at 50 blocks.
+# Messages are also kept well below the 40k character cap so they stay readable.
+MAX_SECTION_CHARS = 3000
+MAX_BLOCKS_PER_MESSAGE = 50
+MAX_MESSAGE_CHARS = 12000
+
+FENCE = "```"
+HORIZONTAL_RULE = "──────────"
+
+
+class SlackMessage(TypedDict):
+    """Keyword arguments for `say()` / `chat.postMessage`."""
+
+    text: str
+    blocks: NotRequired[list[dict[str, object]]]
+
+
+_FENCE_RE = re.compile(r"^\s*(```|~~~)")
+_HEADING_RE = re.compile(r"^\s{0,3}#{1,6}\s+(.*?)\s*#*\s*$")
+_HR_RE = re.compile(r"^\s{0,3}([-*_])(\s*\1){2,}\s*$")
+_BULLET_RE = re.compile(r"^(\s*)[-*+]\s+(.*)$")
+_QUOTE_RE = re.compile(r"^(\s*>+\s?)(.*)$")
+_TABLE_RE = re.compile(r"^\s*\|.*\|\s*$")
+_TABLE_SEPARATOR_RE = re.compile(r"^\s*\|?\s*:?-{2,}:?\s*(\|\s*:?-{2,}:?\s*)*\|?\s*$")
+
+_CODE_SPAN_RE = re.compile(r"(`+)(.+?)\1")
+# Slack's own markup that must pass through untouched: mentions, channels, dates and links
+_SLACK_TOKEN_RE = re.compile(r"<(?:[@#!][^>\s]*|(?:https?|mailto):[^>\s]*)(?:\|[^>]*)?>")
+_ENTITY_RE = re.compile(r"&(?:amp|lt|gt);")
+# A link target may hold one level of balanced parentheses, as in Wikipedia URLs
+_URL = r"((?:[^()\s]|\([^()\s]*\))+)"
+_IMAGE_RE = re.compile(r"!\[([^\]]*)\]\(" + _URL + r"(?:\s+\"[^\"]*\")?\)")
+_LINK_RE = re.compile(r"\[([^\]]+)\]\(" + _URL + r"(?:\s+\"[^\"]*\")?\)")
+_BOLD_ITALIC_RE = re.compile(r"\*\*\*(?=\S)(.+?)(?<=\S)\*\*\*")
+_BOLD_RE = re.compile(r"(\*\*|__)(?=\S)(.+?)(?<=\S)\1")
+_ITALIC_RE = re.compile(r"(?<![*\w])\*(?=\S)(.+?)(?<=\S)\*(?![*\w])")
+_STRIKE_RE = re.compile(r"~~(?=\S)(.+?)(?<=\S)~~")
+
+# Placeholder for converted bold markers, so the italic pass does not see them as `*`
+_BOLD = "\x00"
+
+
+def _escape(text: str) -> str:
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def _escape_text(text: str) -> str:
+    """Escape &, < and > for Slack, leaving Slack markup and existing entities alone."""
+    parts: list[str] = []
+    last = 0
+    for match in _SLACK_TOKEN_RE.finditer(text):
+        parts.append(_escape_plain(text[last : match.start()]))
+        parts.append(match.group(0))
+        last = match.end()
+    parts.append(_escape_plain(text[last:]))
+    return "".join(parts)
+
+
+def _escape_plain(text: str) -> str:
+    pieces = _ENTITY_RE.split(text)
+    entities = cast(list[str], _ENTITY_RE.findall(text))
+    out = [_escape(pieces[0])]
+    for entity, piece in zip(entities, pieces[1:], strict=True):
+        out.append(entity)
+        out.append(_escape(piece))
+    return "".join(out)
+
+
+def _convert_text(text: str) -> str:
+    text = _escape_text(text)
+    text = _IMAGE_RE.sub(lambda m: f"<{m[2]}|{m[1]}>" if m[1] else f"<{m[2]}>", text)
+    text = _LINK_RE.sub(lambda m: f"<{m[2]}|{m[1]}>", text)
+    text = _BOLD_ITALIC_RE.sub(lambda m: f"{_BOLD}_{m[1]}_{_BOLD}", text)
+    text = _BOLD_RE.sub(lambda m: f"{_BOLD}{m[2]}{_BOLD}", text)
+    text = _ITALIC_RE.sub(lambda m: f"_{m[1]}_", text)
+    text = _STRIKE_RE.sub(lambda m: f"~{m[1]}~", text)
+    return text.replace(_BOLD, "*")
+
+
+def convert_inline(line: str) -> str:
+    """Convert inline markdown (emphasis, links, images) to mrkdwn; code spans are kept as-is."""
+    parts: list[str] = []
+    last = 0
+    for match in _CODE_SPAN_RE.finditer(line):
+        parts.append(_convert_text(line[last : match.start()]))
+        parts.append(f"`{_escape(match[2].strip())}`")
+        last = match.end()
+    parts.append(_convert_text(line[last:]))
+    return "".join(parts)
+
+
+class MrkdwnConverter:
+    """Incremental markdown to mrkdwn converter.
+
+    `feed()` accepts arbitrary chunks (for example streamed LLM tokens) and returns the converted
+    text of every line completed so far; `flush()` converts whatever is left.
+    """
+
+    def __init__(self) -> None:
+        self._pending: str = ""
+        self._in_fence: bool = False
+        self._table: list[str] = []
+
+    def feed(self, chunk: str) -> str:
+        self._pending += chunk
+        *lines, self._pending = self._pending.split("\n")
+        return "".join(self._convert_line(line) for line in lines)
+
+    def flush(self) -> str:
+        out: list[str] = []
+        if self._pending:
+            out.append(self._convert_line(self._pending))
+            self._pending = ""
+        out.append(self._flush_table())
+        if self._in_fence:
+            out.append(FENCE + "\n")
+            self._in_fence = False
+        return "".join(out)
+
+    def _flush_table(self) -> str:
+        if not self._table:
+            return ""
+        rows = [_escape(row.strip()) for row in self._table if not _TABLE_SEPARATOR_RE.match(row)]
+        self._table = []
+        return "\n".join([FENCE, *rows, FENCE]) + "\n"
+
+    def _convert_line(self, line: str) -> str:
+        if self._in_fence:
+            if _FENCE_RE.match(line):
+                self._in_fence = False
+                return FENCE + "\n"
+            return _escape(line) + "\n"
+
+        if _TABLE_RE.match(line) or (self._table and _TABLE_SEPARATOR_RE.match(line)):
+            self._table.append(line)
+            return ""
+        out = self._flush_table()
+
+        if _FENCE_RE.match(line):
+            self._in_fence = True
+            return out + FENCE + "\n"
+        return out + self._convert_block(line) + "\n"
+
+    def _convert_block(self, line: str) -> str:
+        if match := _HEADING_RE.match(line):
+            return f"*{convert_inline(match[1]).replace('*', '')}*"
+        if _HR_RE.match(line):
+            return HORIZONTAL_RULE
+        if match := _BULLET_RE.match(line):
+            return f"{match[1]}• {convert_inline(match[2])}"
+        if match := _QUOTE_RE.match(line):
+            return f"> {convert_inline(match[2])}"
+        return convert_inline(line)
+
+
+def markdown_to_mrkdwn(text: str) -> str:
+    converter = MrkdwnConverter()
+    return (converter.feed(text) + converter.flush()).rstrip("\n")
+
+
+def split_mrkdwn(text: str, limit: int = MAX_SECTION_CHARS) -> list[str]:
+    """Split mrkdwn into pieces of at most `limit` characters, preferring line boundaries.
+
+    A code block cut in two is closed at the end of one piece and reopened in the next.
+    """
+    reserve = len(FENCE) + 1
+    chunks: list[str] = []
+    current: list[str] = []
+    size = 0
+    in_fence = False
+
+    def close() -> None:
+        nonlocal current, size
+        if in_fence:
+            current.append(FENCE)
+        chunk = "\n".join(current).strip("\n")
+        if chunk.replace(FENCE, "").strip():
+            chunks.append(chunk)
+        current = [FENCE] if in_fence else []
+        size = len(FENCE) + 1 if in_fence else 0
+
+    for line in text.split("\n"):
+        pieces = [
+            line[i : i + limit - 2 * reserve] for i in range(0, len(line), limit - 2 * reserve)
+        ]
+        for piece in pieces or [""]:
+            if size + len(piece) + 1 > limit - reserve and current:
+                close()
+            current.append(piece)
+            size += len(piece) + 1
+        if line.strip() == FENCE:
+            in_fence = not in_fence
+    close()
+    return chunks
+
+
+def response_messages(text: str) -> list[SlackMessage]:
+    """Turn an LLM answer into one or more Slack messages made of mrkdwn section blocks."""
+    sections = split_mrkdwn(markdown_to_mrkdwn(text))
+    if not sections:
+        return [{"text": text or "…"}]
+
+    messages: list[SlackMessage] = []
+    current: list[str] = []
+    for section in sections:
+        too_long = sum(len(s) for s in current) + len(section) > MAX_MESSAGE_CHARS
+        if current and (len(current) >= MAX_BLOCKS_PER_MESSAGE or too_long):
+            messages.append(_message(current))
+            current = []
+        current.append(section)
+    messages.append(_message(current))
+    return messages
+
+
+def _message(sections: list[str]) -> SlackMessage:
+    return {
+        "text": "\n".join(sections),
+        "blocks": [{"type": "section", "text": {"type": "mrkdwn", "text": s}} for s in sections],
+    }
@@ -0,0 +1,420 @@
+# pyright: reportUnknownMemberType=none, reportUnknownVariableType=none, reportUnknownArgumentType=none
+import asyncio
+import logging
+import time
+from collections import Counter, OrderedDict
+from collections.abc import Awaitable, Callable
+from ssl import SSLContext
+from typing import Any, Self, TypedDict, Unpack, cast, override
+
+from aiohttp import ClientSession, FormData
+from slack_bolt.async_app import AsyncApp, AsyncBoltContext
+from slack_sdk.errors import SlackApiError
+from slack_sdk.http_retry.async_handler import AsyncRetryHandler
+from slack_sdk.web.async_client import AsyncWebClient
+from slack_sdk.web.async_slack_response import AsyncSlackResponse
+
+from lsimons_bot.tracing.trace import span
+
+logger = logging.getLogger(__name__)
+
+type Payload = dict[str, Any]
+type Send = Callable[[Payload], Awaitable[AsyncSlackResponse]]
+type Key = tuple[str, ...]
+
+# Slack's documented per-method tiers, in requests per minute per workspace
+TIER_LIMITS: dict[int, float] = {1: 1, 2: 20, 3: 50, 4: 100}
+DEFAULT_TIER = 3
+METHOD_TIERS: dict[str, int] = {
+    "assistant.threads.setStatus": 3,
+    "assistant.threads.setSuggestedPrompts": 3,
+    "assistant.threads.setTitle": 3,
+    "auth.test": 4,
+    "chat.update": 3,
+    "conversations.history": 3,
+    "conversations.replies": 3,
+    "users.info": 4,
+    "users.list": 2,
+    "views.publish": 4,
+}
+# chat.postMessage has its own "special" limit: about one message per second per channel
+POST_MESSAGE_RATE = 1.0
+POST_MESSAGE_BURST = 3
+
+# Calls that only decorate the conversation. They yield to user-visible posts, are dropped
+# rather than retried when rate limited, and give up after COSMETIC_MAX_WAIT seconds.
+COSMETIC_METHODS = frozenset(
+    {
+        "assistant.threads.setStatus",
+        "assistant.threads.setSuggestedPrompts",
+        "assistant.threads.setTitle",
+    }
+)
+COSMETIC_MAX_WAIT = 2.0
+# Calls where only the latest payload per key matters; a queued call is replaced by a newer one
+COALESCED_METHODS = frozenset(
+    {"assistant.threads.setStatus", "assistant.threads.setTitle", "chat.update"}
+)
+# Calls that are skipped when their payload equals the last one sent for the same key
+IDEMPOTENT_METHODS = frozenset({"assistant.threads.setStatus", "assistant.threads.setTitle"})
+
+MAX_RETRIES = 2
+MAX_REMEMBERED_KEYS = 1000
+
+
+class TokenBucket:
+    """Refills at `rate` tokens per second up to `burst`; a 429 blocks it for Retry-After."""
+
+    def __init__(
+        self, rate: float, burst: float, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.rate: float = rate
+        self.burst: float = burst
+        self.tokens: float = burst
+        self.blocked_until: float = 0.0
+        self._clock: Callable[[], float] = clock
+        self._updated: float = clock()
+
+    def _refill(self) -> float:
+        now = self._clock()
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        return now
+
+    def delay(self) -> float:
+        """Seconds until a token is available; zero if one is available now."""
+        now = self._refill()
+        wait = max(0.0, self.blocked_until - now)
+        if self.tokens < 1:
+            wait = max(wait, (1 - self.tokens) / self.rate)
+        return wait
+
+    def take(self) -> bool:
+        if self.delay() > 0:
+            return False
+        self.tokens -= 1
+        return True
+
+    def block(self, seconds: float) -> None:
+        self.blocked_until = max(self.blocked_until, self._clock() + seconds)
+        self.tokens = 0
+
+
+def retry_after(error: SlackApiError) -> float | None:
+    """The Retry-After of a 429 response, or None if the error is not a rate limit."""
+    response = error.response
+    if response.status_code != 429:
+        return None
+    value: Any = None
+    for name, header in response.headers.items():
+        if str(name).lower() == "retry-after":
+            value = header
+    if isinstance(value, list | tuple):
+        value = value[0] if value else None
+    if value is None:
+        return 1.0
+    try:
+        return float(str(value))
+    except ValueError:
+        return 1.0
+
+
+class _Pending:
+    def __init__(self, payload: Payload) -> None:
+        self.payload: Payload = payload
+        self.future: asyncio.Future[AsyncSlackResponse | None] = (
+            asyncio.get_running_loop().create_future()
+        )
+
+
+class SlackRateLimiter:
+    """Shared rate-limit state for every Web API client of the app.
+
+    Each method gets a token bucket sized to its Slack tier (chat.postMessage gets one per
+    channel). Calls wait for a token instead of running into 429s; when Slack still answers 429
+    the bucket is paused for the Retry-After period and the call is retried. Repeated status,
+    title and message updates for the same thread are coalesced so only the latest is sent.
+    Cosmetic calls wait while user-visible posts are queued and are dropped instead of stalling
+    the handler. `call()` returns None for a call that was skipped.
+    """
+
+    def __init__(
+        self,
+        method_tiers: dict[str, int] | None = None,
+        max_retries: int = MAX_RETRIES,
+        cosmetic_max_wait: float = COSMETIC_MAX_WAIT,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.method_tiers: dict[str, int] = METHOD_TIERS | (method_tiers or {})
+        self.max_retries: int = max_retries
+        self.cosmetic_max_wait: float = cosmetic_max_wait
+        self.buckets: dict[Key, TokenBucket] = {}
+        self.stats: Counter[str] = Counter()
+        self._clock: Callable[[], float] = clock
+        self._visible_waiting: int = 0
+        self._pending: dict[Key, _Pending] = {}
+        self._key_locks: dict[Key, asyncio.Lock] = {}
+        self._last_sent: OrderedDict[Key, Payload] = OrderedDict()
+
+    def bucket(self, api_method: str, payload: Payload) -> TokenBucket:
+        if api_method == "chat.postMessage":
+            key = (api_method, _field(payload, "channel"))
+            rate, burst = POST_MESSAGE_RATE, POST_MESSAGE_BURST
+        else:
+            key = (api_method,)
+            per_minute = TIER_LIMITS[self.method_tiers.get(api_method, DEFAULT_TIER)]
+            rate, burst = per_minute / 60, max(1, per_minute // 10)
+        if key not in self.buckets:
+            self.buckets[key] = TokenBucket(rate, burst, clock=self._clock)
+        return self.buckets[key]
+
+    async def call(
+        self, api_method: str, payload: Payload, send: Send
+    ) -> AsyncSlackResponse | None:
+        if api_method in COALESCED_METHODS:
+            return await self._coalesced(api_method, payload, send)
+        return await self._send(api_method, payload, send)
+
+    async def _coalesced(
+        self, api_method: str, payload: Payload, send: Send
+    ) -> AsyncSlackResponse | None:
+        key = _coalesce_key(api_method, payload)
+        pending = self._pending.get(key)
+        if pending is not None:
+            # A call for the same key is still queued: let it send this newer payload instead
+            pending.payload = payload
+            self.stats["coalesced"] += 1
+            return await asyncio.shield(pending.future)
+
+        pending = self._pending[key] = _Pending(payload)
+        lock = self._key_locks.setdefault(key, asyncio.Lock())
+        try:
+            # Only one call per key is in flight, so updates reach Slack in order
+            async with lock:
+                bucket = self.bucket(api_method, payload)
+                acquired = await self._acquire(bucket, api_method in COSMETIC_METHODS)
+                # From here on newer calls queue up behind this one instead of replacing it
+                _ = self._pending.pop(key, None)
+                payload = pending.payload
+                if not acquired:
+                    response = self._drop(api_method)
+                elif api_method in IDEMPOTENT_METHODS and self._last_sent.get(key) == payload:
+                    self.stats["unchanged"] += 1
+                    response = None
+                else:
+                    response = await self._send(api_method, payload, send, acquired=True)
+                    self._remember(key, payload)
+            pending.future.set_result(response)
+            return response
+        except BaseException as e:
+            if self._pending.get(key) is pending:
+                del self._pending[key]
+            if isinstance(e, asyncio.CancelledError):
+                _ = pending.future.cancel()
+            else:
+                pending.future.set_exception(e)
+                # Waiters that were coalesced into this call see the error; nobody else has to
+                _ = pending.future.exception()
+            raise
+        finally:
+            if key not in self._pending and not lock.locked():
+                _ = self._key_locks.pop(key, None)
+
+    def _remember(self, key: Key, payload: Payload) -> None:
+        self._last_sent[key] = payload
+        self._last_sent.move_to_end(key)
+        while len(self._last_sent) > MAX_REMEMBERED_KEYS:
+            _ = self._last_sent.popitem(last=False)
+
+    async def _acquire(self, bucket: TokenBucket, cosmetic: bool) -> bool:
+        deadline = self._clock() + self.cosmetic_max_wait if cosmetic else None
+        if not cosmetic:
+            self._visible_waiting += 1
+        try:
+            while True:
+                delay = bucket.delay()
+                if cosmetic and self._visible_waiting:
+                    delay = max(delay, 0.05)
+                if delay <= 0 and bucket.take():
+                    return True
+                if deadline is not None and self._clock() + delay > deadline:
+                    return False
+                await asyncio.sleep(delay)
+        finally:
+            if not cosmetic:
+                self._visible_waiting -= 1
+
+    def _drop(self, api_method: str) -> None:
+        logger.debug("Dropping %s, rate limit would delay it too long", api_method)
+        self.stats["dropped"] += 1
+
+    async def _send(
+        self, api_method: str, payload: Payload, send: Send, acquired: bool = False
+    ) -> AsyncSlackResponse | None:
+        cosmetic = api_method in COSMETIC_METHODS
+        bucket = self.bucket(api_method, payload)
+        attempt = 0
+        while True:
+            if not acquired and not await self._acquire(bucket, cosmetic):
+                return self._drop(api_method)
+            acquired = False
+            try:
+                return await send(payload)
+            except SlackApiError as e:
+                wait = retry_after(e)
+                if wait is None:
+                    raise
+                self.stats["rate_limited"] += 1
+                bucket.block(wait)
+                logger.warning("Slack rate limited %s, retrying after %.0fs", api_method, wait)
+                if cosmetic:
+                    self.stats["dropped"] += 1
+                    return None
+                if attempt >= self.max_retries:
+                    raise
+                attempt += 1
+
+
+def _coalesce_key(api_method: str, payload: Payload) -> Key:
+    if api_method == "chat.update":
+        return (api_method, _field(payload, "channel"), _field(payload, "ts"))
+    return (api_method, _field(payload, "channel_id"), _field(payload, "thread_ts"))
+
+
+def _field(payload: Payload, name: str) -> str:
+    return str(cast(object, payload.get(name, "")))
+
+
+class _ClientOptions(TypedDict, total=False):
+    """Keyword arguments of `AsyncWebClient`."""
+
+    token: str | None
+    base_url: str
+    timeout: int
+    ssl: SSLContext | None
+    proxy: str | None
+    session: ClientSession | None
+    trust_env_in_session: bool
+    headers: dict[str, str] | None
+    user_agent_prefix: str | None
+    user_agent_suffix: str | None
+    team_id: str | None
+    logger: logging.Logger | None
+    retry_handlers: list[AsyncRetryHandler] | None
+
+
+class RateLimitedWebClient(AsyncWebClient):
+    """`AsyncWebClient` that sends every Web API call through a shared `SlackRateLimiter`."""
+
+    def __init__(self, *, limiter: SlackRateLimiter, **options: Unpack[_ClientOptions]) -> None:
+        super().__init__(**options)
+        self.limiter: SlackRateLimiter = limiter
+
+    @classmethod
+    def wrap(cls, client: AsyncWebClient, limiter: SlackRateLimiter) -> Self:
+        return cls(
+            token=client.token,
+            base_url=client.base_url,
+            timeout=client.timeout,
+            ssl=client.ssl,
+            proxy=client.proxy,
+            session=client.session,
+            trust_env_in_session=client.trust_env_in_session,
+            headers=client.headers,
+            team_id=client.default_params.get("team_id"),
+            logger=client.logger,
+            retry_handlers=client.retry_handlers.copy(),
+            limiter=limiter,
+        )
+
+    @override
+    async def api_call(
+        self,
+        api_method: str,
+        *,
+        http_verb: str = "POST",
+        files: dict[str, Any] | None = None,
+        data: dict[str, Any] | FormData | None = None,
+        params: dict[str, Any] | None = None,
+        json: dict[str, Any] | None = None,
+        headers: dict[str, Any] | None = None,
+        auth: dict[str, Any] | None = None,
+    ) -> AsyncSlackResponse:
+        with span(f"slack.{api_method}") as current:
+            response = await self._limited_call(
+                api_method,
+                http_verb=http_verb,
+                files=files,
+                data=data,
+                params=params,
+                json=json,
+                headers=headers,
+                auth=auth,
+            )
+            if isinstance(response.data, dict) and response.data.get("skipped"):
+                # Dropped by the limiter, e.g. a status update superseded by a newer one
+                current.set("skipped", True)
+            return response
+
+    async def _limited_call(
+        self,
+        api_method: str,
+        *,
+        http_verb: str,
+        files: dict[str, Any] | None,
+        data: dict[str, Any] | FormData | None,
+        params: dict[str, Any] | None,
+        json: dict[str, Any] | None,
+        headers: dict[str, Any] | None,
+        auth: dict[str, Any] | None,
+    ) -> AsyncSlackResponse:
+        base_call = super().api_call
+
+        # slack_sdk puts the method arguments in exactly one of json, params or data
+        async def send(payload: Payload) -> AsyncSlackResponse:
+            return await base_call(
+                api_method,
+                http_verb=http_verb,
+                files=files,
+                data=payload if data is not None else None,
+                params=payload if params is not None else None,
+                json=payload if json is not None else None,
+                headers=headers,
+                auth=auth,
+            )
+
+        if isinstance(data, FormData):
+            # A prebuilt form body has no arguments to key or coalesce on
+            return await base_call(
+                api_method, http_verb=http_verb, files=files, data=data, headers=headers, auth=auth
+            )
+        payload = json if json is not None else params if params is not None else data
+        if payload is None:
+            return await base_call(
+                api_method, http_verb=http_verb, files=files, headers=headers, auth=auth
+            )
+
+        response = await self.limiter.call(api_method, payload, send)
+        if response is None:
+            return AsyncSlackResponse(
+                client=self,
+                http_verb=http_verb,
+                api_url=self.base_url + api_method,
+                req_args={"json": payload},
+                data={"ok": True, "skipped": True},
+                headers={},
+                status_code=200,
+            )
+        return response
+
+
+def register(app: AsyncApp, limiter: SlackRateLimiter) -> None:
+    """Give every listener a client bound to `limiter`. Register before any other middleware."""
+
+    async def rate_limit_middleware(
+        context: AsyncBoltContext, next: Callable[[], Awaitable[None]]
+    ) -> None:
+        context["client"] = RateLimitedWebClient.wrap(context.client, limiter)
+        await next()
+
+    _ = app.use(rate_limit_middleware)
@@ -0,0 +1,94 @@
+# pyright: reportUnknownMemberType=none
+import asyncio
+import logging
+import re
+from typing import Any, cast
+
+from slack_bolt.async_app import AsyncApp
+from slack_sdk.web.async_client import AsyncWebClient
+
+logger = logging.getLogger(__name__)
+
+# users.list pages are capped at 200 members
+PAGE_SIZE = 200
+# Events keep the directory current; a full reload catches any that were missed
+RELOAD_INTERVAL_SECONDS = 12 * 3600
+
+# <@U123> or <@U123|label>
+MENTION = re.compile(r"<@([UW][A-Z0-9]+)(?:\|[^>]*)?>")
+
+
+def display_name(user: dict[str, Any]) -> str | None:
+    profile = cast(dict[str, Any], user.get("profile") or {})
+    name = (
+        profile.get("display_name")
+        or profile.get("real_name")
+        or user.get("real_name")
+        or user.get("name")
+    )
+    return cast(str, name) if name else None
+
+
+class UserDirectory:
+    """Names of the workspace's users by user id, so reading a thread never calls `users.info`.
+
+    `load` fetches every user with a paginated `users.list`; `user_change` and `team_join` events
+    keep the names current in between. A user missing from the directory is shown by id.
+    """
+
+    def __init__(self) -> None:
+        self.names: dict[str, str] = {}
+        self.loaded: bool = False
+
+    def name(self, user_id: str) -> str | None:
+        return self.names.get(user_id)
+
+    def update(self, user: dict[str, Any]) -> None:
+        user_id = cast(str | None, user.get("id"))
+        name = display_name(user)
+        if user_id is not None and name is not None:
+            self.names[user_id] = name
+
+    def resolve_mentions(self, text: str) -> str:
+        """Follow each known `<@USER_ID>` mention with the user's name, keeping the mention."""
+
+        def resolve(match: re.Match[str]) -> str:
+            name = self.names.get(match.group(1))
+            return f"<@{match.group(1)}> ({name})" if name else match.group(0)
+
+        return MENTION.sub(resolve, text)
+
+    async def load(self, client: AsyncWebClient) -> None:
+        names: dict[str, str] = {}
+        cursor: str | None = None
+        while True:
+            response = await client.users_list(limit=PAGE_SIZE, cursor=cursor)
+            for user in cast(list[dict[str, Any]], response.get("members", [])):
+                user_id = cast(str | None, user.get("id"))
+                name = display_name(user)
+                if user_id is not None and name is not None:
+                    names[user_id] = name
+            metadata = cast(dict[str, Any], response.get("response_metadata") or {})
+            cursor = cast(str | None, metadata.get("next_cursor"))
+            if not cursor:
+                break
+        # Swapped in whole, so a lookup never sees a half-loaded directory
+        self.names = names
+        self.loaded = True
+        logger.info("Loaded %d users into the user directory", len(names))
+
+    async def run(self, client: AsyncWebClient, interval: float = RELOAD_INTERVAL_SECONDS) -> None:
+        while True:
+            try:
+                await self.load(client)
+            except Exception as e:
+                logger.warning("Error loading the user directory: %s", e)
+            await asyncio.sleep(interval)
+
+
+def register(app: AsyncApp, users: UserDirectory) -> None:
+    async def user_changed(event: dict[str, Any]) -> None:
+        users.update(cast(dict[str, Any], event.get("user") or {}))
+
+    _ = app.event("user_change")(user_changed)
+    _ = app.event("team_join")(user_changed)
@@ -0,0 +1,169 @@
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from collections.abc import Generator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, cast
+
+logger = logging.getLogger(__name__)
+
+STATE_ACCEPTED = "accepted"
+STATE_DONE = "done"
+STATE_FAILED = "failed"
+# Writes are batched and committed together this often
+FLUSH_INTERVAL = 0.05
+# Finished requests are kept this long, for looking back at what happened
+KEEP_SECONDS = 7 * 24 * 3600
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS requests (
+    id TEXT PRIMARY KEY,
+    channel TEXT NOT NULL,
+    thread_ts TEXT NOT NULL,
+    message_ts TEXT NOT NULL,
+    text TEXT NOT NULL,
+    state TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created REAL NOT NULL,
+    updated REAL NOT NULL
+)
+"""
+_INSERT = (
+    "INSERT OR IGNORE INTO requests"
+    " (id, channel, thread_ts, message_ts, text, state, created, updated)"
+    " VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+_SET_STATE = "UPDATE requests SET state = ?, updated = ? WHERE id = ?"
+_RETRY = "UPDATE requests SET attempts = attempts + 1, updated = ? WHERE id = ?"
+_UNFINISHED = (
+    "SELECT channel, thread_ts, message_ts, text, state, attempts, created"
+    " FROM requests WHERE state = ? ORDER BY created"
+)
+
+type Write = tuple[str, tuple[Any, ...]]
+
+
+@dataclass
+class LoggedRequest:
+    channel: str
+    thread_ts: str
+    message_ts: str
+    text: str
+    state: str = STATE_ACCEPTED
+    attempts: int = 0
+    created: float = 0.0
+
+    @property
+    def id(self) -> str:
+        return f"{self.channel}:{self.message_ts}"
+
+
+class WorkLog:
+    """Durable record of accepted assistant requests, in a SQLite database in WAL mode.
+
+    `accept`, `finish` and `fail` only queue the write; `run()` commits everything queued in one
+    transaction every `flush_interval` seconds, off the event loop. A request accepted just
+    before a crash can be lost, but the per-request cost is an append to a list instead of an
+    fsync. Requests still `accepted` at startup were cut off by a restart.
+    """
+
+    def __init__(self, path: Path, flush_interval: float = FLUSH_INTERVAL) -> None:
+        self.path: Path = path
+        self.flush_interval: float = flush_interval
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._db: sqlite3.Connection = sqlite3.connect(path, check_same_thread=False)
+        # WAL with synchronous=NORMAL fsyncs on checkpoints, not on every commit
+        _ = self._db.execute("PRAGMA journal_mode=WAL")
+        _ = self._db.execute("PRAGMA synchronous=NORMAL")
+        _ = self._db.execute(_SCHEMA)
+        self._db.commit()
+        self._lock: threading.Lock = threading.Lock()
+        self._pending: list[Write] = []
+
+    def accept(self, request: LoggedRequest) -> None:
+        now = time.time()
+        self._pending.append(
+            (
+                _INSERT,
+                (
+                    request.id,
+                    request.channel,
+                    request.thread_ts,
+                    request.message_ts,
+                    request.text,
+                    STATE_ACCEPTED,
+                    request.created or now,
+                    now,
+                ),
+            )
+        )
+
+    def finish(self, request: LoggedRequest) -> None:
+        self._pending.append((_SET_STATE, (STATE_DONE, time.time(), request.id)))
+
+    def fail(self, request: LoggedRequest) -> None:
+        self._pending.append((_SET_STATE, (STATE_FAILED, time.time(), request.id)))
+
+    def retry(self, request: LoggedRequest) -> None:
+        request.attempts += 1
+        self._pending.append((_RETRY, (time.time(), request.id)))
+
+    @contextmanager
+    def track(self, request: LoggedRequest) -> Generator[LoggedRequest]:
+        """Accept `request` for the block; it stays unfinished only if the block is cancelled."""
+        self.accept(request)
+        try:
+            yield request
+        except asyncio.CancelledError:
+            # Shutting down mid-request: leave it for the next start to pick up
+            raise
+        except BaseException:
+            self.fail(request)
+            raise
+        self.finish(request)
+
+    def _write(self, writes: list[Write]) -> None:
+        with self._lock, self._db:
+            for sql, params in writes:
+                _ = self._db.execute(sql, params)
+
+    async def flush(self) -> None:
+        if not self._pending:
+            return
+        writes, self._pending = self._pending, []
+        await asyncio.to_thread(self._write, writes)
+
+    async def run(self) -> None:
+        """Commit queued writes every `flush_interval` until cancelled, then once more."""
+        try:
+            while True:
+                await asyncio.sleep(self.flush_interval)
+                await self.flush()
+        finally:
+            # Cancelled at shutdown; commit what is left without giving up the thread
+            writes, self._pending = self._pending, []
+            self._write(writes)
+
+    def unfinished(self) -> list[LoggedRequest]:
+        """Requests accepted and never finished, oldest first."""
+        with self._lock:
+            rows = cast(
+                list[tuple[str, str, str, str, str, int, float]],
+                self._db.execute(_UNFINISHED, (STATE_ACCEPTED,)).fetchall(),
+            )
+        return [LoggedRequest(*row) for row in rows]
+
+    def prune(self, keep_seconds: float = KEEP_SECONDS) -> None:
+        with self._lock, self._db:
+            _ = self._db.execute(
+                "DELETE FROM requests WHERE state != ? AND updated < ?",
+                (STATE_ACCEPTED, time.time() - keep_seconds),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,183 @@
+# pyright: reportUnknownMemberType=none, reportUnknownVariableType=none, reportUnknownArgumentType=none
+import asyncio
+import functools
+import logging
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass, field
+from typing import Any, cast
+
+from slack_bolt.kwargs_injection.async_args import AsyncArgs
+from slack_bolt.util.utils import get_arg_names_of_callable
+
+from lsimons_bot.bot.metrics import LatencyStats
+
+logger = logging.getLogger(__name__)
+
+type Job = Callable[[], Awaitable[None]]
+type Listener = Callable[..., Awaitable[None]]
+
+DEFAULT_WORKERS = 8
+DEFAULT_MAX_PENDING = 100
+# How long a listener waits for room in a full queue before the event is rejected
+DEFAULT_SUBMIT_TIMEOUT = 10.0
+
+
+@dataclass
+class _Pending:
+    job: Job
+    submitted: float
+
+
+@dataclass
+class WorkQueueStats:
+    wait: LatencyStats = field(default_factory=LatencyStats)
+    run: LatencyStats = field(default_factory=LatencyStats)
+    completed: int = 0
+    failed: int = 0
+    rejected: int = 0
+
+
+class WorkQueue:
+    """A bounded queue of Slack event work, drained by a pool of workers.
+
+    Jobs with the same key, normally a conversation thread, run one at a time in the order they
+    were submitted; jobs with different keys run concurrently on up to `workers` workers. When
+    `max_pending` jobs are waiting, `submit` waits for room and gives up after `submit_timeout`.
+    """
+
+    def __init__(
+        self,
+        workers: int = DEFAULT_WORKERS,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        submit_timeout: float = DEFAULT_SUBMIT_TIMEOUT,
+    ) -> None:
+        self.workers: int = workers
+        self.max_pending: int = max_pending
+        self.submit_timeout: float = submit_timeout
+        self.stats: WorkQueueStats = WorkQueueStats()
+        self._slots: asyncio.Semaphore = asyncio.Semaphore(max_pending)
+        self._queued: int = 0
+        # Pending jobs per key; a key is present while one of its jobs is queued or running
+        self._jobs: dict[Hashable, deque[_Pending]] = {}
+        # Keys with a job ready to run and no job running
+        self._ready: asyncio.Queue[Hashable] = asyncio.Queue()
+        # Set while no job is queued or running
+        self._idle: asyncio.Event = asyncio.Event()
+        self._idle.set()
+
+    @property
+    def depth(self) -> int:
+        """Jobs submitted and not yet started."""
+        return self._queued
+
+    def oldest_age(self) -> float:
+        """Seconds the longest-waiting job has been queued."""
+        oldest = min(
+            (pending.submitted for jobs in self._jobs.values() for pending in jobs), default=None
+        )
+        return time.monotonic() - oldest if oldest is not None else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"depth={self.depth} oldest={self.oldest_age():.1f}s"
+            f" completed={self.stats.completed} failed={self.stats.failed}"
+            f" rejected={self.stats.rejected} wait p95={self.stats.wait.percentile(95):.2f}s"
+            f" run p95={self.stats.run.percentile(95):.2f}s"
+        )
+
+    async def submit(self, key: Hashable, job: Job) -> bool:
+        """Queue `job` behind earlier jobs for `key`; False if the queue stayed full."""
+        try:
+            async with asyncio.timeout(self.submit_timeout):
+                _ = await self._slots.acquire()
+        except TimeoutError:
+            self.stats.rejected += 1
+            logger.warning("Work queue full, rejected a job (%s)", self.summary())
+            return False
+        pending = _Pending(job, time.monotonic())
+        self._queued += 1
+        self._idle.clear()
+        jobs = self._jobs.get(key)
+        if jobs is None:
+            self._jobs[key] = deque([pending])
+            self._ready.put_nowait(key)
+        else:
+            jobs.append(pending)
+        return True
+
+    async def drain(self) -> None:
+        """Wait until every submitted job has finished; workers must be running."""
+        _ = await self._idle.wait()
+
+    async def run(self) -> None:
+        """Run the workers until cancelled."""
+        async with asyncio.TaskGroup() as tasks:
+            for _ in range(self.workers):
+                _ = tasks.create_task(self._worker())
+
+    async def _worker(self) -> None:
+        while True:
+            key = await self._ready.get()
+            jobs = self._jobs[key]
+            pending = jobs.popleft()
+            self._queued -= 1
+            self._slots.release()
+            start = time.monotonic()
+            self.stats.wait.record(start - pending.submitted)
+            try:
+                await pending.job()
+            except Exception as e:
+                self.stats.failed += 1
+                logger.error("Work queue job for %s failed: %r", key, e)
+            else:
+                self.stats.completed += 1
+            finally:
+                self.stats.run.record(time.monotonic() - start)
+                if jobs:
+                    self._ready.put_nowait(key)
+                else:
+                    del self._jobs[key]
+                    if not self._jobs:
+                        self._idle.set()
+            logger.debug("Work queue: %s", self.summary())
+
+
+def thread_key(args: AsyncArgs) -> Hashable:
+    """The conversation an event belongs to; a top-level message starts its own thread."""
+    event = args.event or {}
+    channel = args.context.channel_id or cast(str | None, event.get("channel"))
+    thread_ts = (
+        args.context.thread_ts
+        or cast(str | None, event.get("thread_ts"))
+        or cast(str | None, event.get("ts"))
+    )
+    return (channel, thread_ts)
+
+
+def queued(
+    work_queue: WorkQueue,
+    listener: Listener,
+    on_rejected: Callable[[AsyncArgs], Awaitable[None]] | None = None,
+) -> Listener:
+    """Wrap a Bolt listener so it only puts the work on `work_queue` and returns.
+
+    Bolt acknowledges events before it runs the listener, so the listener's own time never held
+    up an acknowledgement; queueing bounds how many run at once and keeps each thread in order.
+    """
+    arg_names = get_arg_names_of_callable(listener)
+
+    @functools.wraps(listener)
+    async def enqueue(args: AsyncArgs) -> None:
+        kwargs: dict[str, Any] = {
+            name: getattr(args, name) if hasattr(args, name) else args.context.get(name)
+            for name in arg_names
+        }
+        accepted = await work_queue.submit(thread_key(args), lambda: listener(**kwargs))
+        if not accepted and on_rejected is not None:
+            await on_rejected(args)
+
+    # Bolt reads a listener's arguments from the unwrapped function; `enqueue` wants them all
+    del enqueue.__wrapped__
+    return enqueue
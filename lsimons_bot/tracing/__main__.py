@@ -0,0 +1,52 @@
+import argparse
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+from lsimons_bot.tracing.report import build_traces, format_trace, read_spans, slowest, trace_files
+
+DEFAULT_TOP = 10
+DEFAULT_ROOT = "slack.assistant_message"
+
+
+@dataclass
+class TraceArgs:
+    path: Path = Path("traces/traces.jsonl")
+    top: int = DEFAULT_TOP
+    root: str | None = DEFAULT_ROOT
+
+
+def _parse_args() -> TraceArgs:
+    parser = argparse.ArgumentParser(
+        description="Show the slowest request traces and their critical paths"
+    )
+    _ = parser.add_argument("path", type=Path, help="Trace file written by the bot (TRACING_FILE)")
+    _ = parser.add_argument(
+        "--top", type=int, help=f"Number of traces to show (default {DEFAULT_TOP})"
+    )
+    _ = parser.add_argument(
+        "--root",
+        help=f"Only traces whose root span has this name (default {DEFAULT_ROOT}, '' for all)",
+    )
+    args = parser.parse_args(namespace=TraceArgs())
+    args.root = args.root or None
+    return args
+
+
+def main() -> int:
+    args = _parse_args()
+    files = trace_files(args.path)
+    if not files:
+        print(f"No trace files at {args.path}", file=sys.stderr)
+        return 1
+    roots = build_traces(read_spans(files))
+    traces = slowest(roots, args.top, args.root)
+    print(f"{len(roots)} traces in {len(files)} files, slowest {len(traces)}:")
+    for root in traces:
+        print()
+        print(format_trace(root))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+import json
+import logging
+import queue
+import sys
+from logging.handlers import QueueListener, RotatingFileHandler
+from pathlib import Path
+from typing import Any
+
+from lsimons_bot.app.logs import QUEUE_SIZE, CappedQueueHandler
+from lsimons_bot.tracing.trace import STATUS_ERROR, STATUS_OK, AttributeValue, Span
+
+FORMAT_JSONL = "jsonl"
+FORMAT_OTLP = "otlp"
+FORMATS = (FORMAT_JSONL, FORMAT_OTLP)
+SERVICE_NAME = "lsimons-bot"
+MAX_BYTES = 10 * 1024 * 1024
+BACKUP_COUNT = 5
+
+# OTLP status codes; cancelled spans are left unset
+_OTLP_STATUS = {STATUS_OK: 1, STATUS_ERROR: 2}
+
+
+def span_record(span: Span) -> dict[str, Any]:
+    """A span as one flat JSON object."""
+    return {
+        "trace_id": span.trace_id,
+        "span_id": span.span_id,
+        "parent_id": span.parent_id,
+        "name": span.name,
+        "start_ns": span.start_ns,
+        "end_ns": span.end_ns,
+        "duration": round(span.duration, 6),
+        "status": span.status,
+        "error": span.error,
+        "attributes": span.attributes,
+    }
+
+
+def _otlp_value(value: AttributeValue) -> dict[str, Any]:
+    match value:
+        case bool():
+            return {"boolValue": value}
+        case int():
+            # OTLP/JSON encodes 64-bit integers as strings
+            return {"intValue": str(value)}
+        case float():
+            return {"doubleValue": value}
+        case str():
+            return {"stringValue": value}
+
+
+def otlp_record(span: Span) -> dict[str, Any]:
+    """A span wrapped in an OTLP/JSON `ExportTraceServiceRequest`, as OTLP file exporters write."""
+    otlp_span: dict[str, Any] = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": 1,
+        "startTimeUnixNano": str(span.start_ns),
+        "endTimeUnixNano": str(span.end_ns),
+        "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in span.attributes.items()],
+        "status": {"code": _OTLP_STATUS.get(span.status, 0)},
+    }
+    if span.parent_id is not None:
+        otlp_span["parentSpanId"] = span.parent_id
+    if span.error is not None:
+        otlp_span["status"]["message"] = span.error
+    return {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]
+                },
+                "scopeSpans": [{"scope": {"name": "lsimons_bot"}, "spans": [otlp_span]}],
+            }
+        ]
+    }
+
+
+class JsonlExporter:
+    """Writes finished spans to a size-rotated JSON lines file, one span per line.
+
+    `otlp` format lines are OTLP/JSON export requests that an OpenTelemetry collector's
+    file receiver can read; `jsonl` lines are flat and easier to grep. Like log records, spans
+    are queued and written by a background thread, so exporting never blocks the event loop on
+    file I/O; when the queue is full spans are dropped.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        format: str = FORMAT_JSONL,
+        max_bytes: int = MAX_BYTES,
+        backup_count: int = BACKUP_COUNT,
+        queue_size: int = QUEUE_SIZE,
+    ) -> None:
+        if format not in FORMATS:
+            raise ValueError(f"Unknown trace format {format!r}, expected one of {FORMATS}")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path: Path = path
+        self.format: str = format
+        # The logging handler brings rotation, and the listener writes from one thread
+        self.handler: RotatingFileHandler = RotatingFileHandler(
+            path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+        )
+        self.handler.setFormatter(logging.Formatter("%(message)s"))
+        span_queue: queue.Queue[logging.LogRecord] = queue.Queue(queue_size)
+        # A cut-off line would not be valid JSON, so records are never shortened
+        self.queue_handler: CappedQueueHandler = CappedQueueHandler(span_queue, sys.maxsize)
+        self.listener: QueueListener = QueueListener(span_queue, self.handler)
+        self.listener.start()
+
+    def export(self, span: Span) -> None:
+        record = otlp_record(span) if self.format == FORMAT_OTLP else span_record(span)
+        _ = self.queue_handler.handle(
+            logging.LogRecord(
+                "lsimons_bot.tracing",
+                logging.INFO,
+                "",
+                0,
+                json.dumps(record, separators=(",", ":")),
+                None,
+                None,
+            )
+        )
+
+    def close(self) -> None:
+        """Write the spans still queued, then close the file."""
+        self.listener.stop()
+        self.handler.close()
@@ -0,0 +1,148 @@
+import json
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Self, cast
+
+from lsimons_bot.tracing.trace import STATUS_OK, AttributeValue
+
+
+@dataclass
+class SpanRecord:
+    """A span read back from an exported trace file."""
+
+    trace_id: str
+    span_id: str
+    parent_id: str | None
+    name: str
+    start_ns: int
+    end_ns: int
+    status: str = STATUS_OK
+    attributes: dict[str, AttributeValue] = field(default_factory=dict)
+    children: list[Self] = field(default_factory=list)
+
+    @property
+    def duration(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e9
+
+
+def _otlp_attribute(value: dict[str, Any]) -> AttributeValue:
+    for key in ("stringValue", "boolValue", "doubleValue"):
+        if key in value:
+            return cast(AttributeValue, value[key])
+    # OTLP JSON writes 64-bit integers as strings
+    return int(cast(str | int, value.get("intValue", 0)))
+
+
+def _from_otlp(data: dict[str, Any]) -> Iterator[SpanRecord]:
+    for resource in cast(list[dict[str, Any]], data.get("resourceSpans", [])):
+        for scope in cast(list[dict[str, Any]], resource.get("scopeSpans", [])):
+            for span in cast(list[dict[str, Any]], scope.get("spans", [])):
+                code = cast(int, cast(dict[str, Any], span.get("status", {})).get("code", 0))
+                attributes = cast(list[dict[str, Any]], span.get("attributes", []))
+                yield SpanRecord(
+                    trace_id=cast(str, span["traceId"]),
+                    span_id=cast(str, span["spanId"]),
+                    parent_id=cast(str | None, span.get("parentSpanId")) or None,
+                    name=cast(str, span["name"]),
+                    start_ns=int(cast(str, span["startTimeUnixNano"])),
+                    end_ns=int(cast(str, span["endTimeUnixNano"])),
+                    status={1: "ok", 2: "error"}.get(code, "cancelled"),
+                    attributes={
+                        cast(str, a["key"]): _otlp_attribute(cast(dict[str, Any], a["value"]))
+                        for a in attributes
+                    },
+                )
+
+
+def read_spans(paths: Iterable[Path]) -> list[SpanRecord]:
+    """Read spans from trace files in either export format; bad lines are skipped."""
+    spans: list[SpanRecord] = []
+    for path in paths:
+        with path.open(encoding="utf-8") as f:
+            for line in f:
+                try:
+                    data = cast(dict[str, Any], json.loads(line))
+                except ValueError:
+                    continue
+                if "resourceSpans" in data:
+                    spans.extend(_from_otlp(data))
+                elif data.get("end_ns") is not None:
+                    spans.append(
+                        SpanRecord(
+                            trace_id=cast(str, data["trace_id"]),
+                            span_id=cast(str, data["span_id"]),
+                            parent_id=cast(str | None, data.get("parent_id")),
+                            name=cast(str, data["name"]),
+                            start_ns=int(cast(int, data["start_ns"])),
+                            end_ns=int(cast(int, data["end_ns"])),
+                            status=cast(str, data.get("status", STATUS_OK)),
+                            attributes=cast(dict[str, AttributeValue], data.get("attributes", {})),
+                        )
+                    )
+    return spans
+
+
+def trace_files(path: Path) -> list[Path]:
+    """The trace file and its rotated backups (`traces.jsonl.1`, ...), oldest first."""
+    backups = sorted(
+        path.parent.glob(f"{path.name}.*"),
+        key=lambda p: int(p.suffix[1:]) if p.suffix[1:].isdigit() else 0,
+        reverse=True,
+    )
+    return [*backups, path] if path.exists() else backups
+
+
+def build_traces(spans: Iterable[SpanRecord]) -> list[SpanRecord]:
+    """Link spans to their parents; returns the root span of every trace."""
+    by_id = {span.span_id: span for span in spans}
+    roots: list[SpanRecord] = []
+    for span in by_id.values():
+        parent = by_id.get(span.parent_id) if span.parent_id else None
+        if parent is None:
+            # Roots, and spans whose parent was lost to rotation
+            roots.append(span)
+        else:
+            parent.children.append(span)
+    for span in by_id.values():
+        span.children.sort(key=lambda s: s.start_ns)
+    return roots
+
+
+def critical_path(root: SpanRecord) -> list[SpanRecord]:
+    """The chain of spans that determined when `root` finished.
+
+    From each span, follow the child that ended last: the parent was waiting on it at the end.
+    """
+    path = [root]
+    span = root
+    while span.children:
+        span = max(span.children, key=lambda s: s.end_ns)
+        path.append(span)
+    return path
+
+
+def self_time(span: SpanRecord) -> float:
+    """Time in `span` not covered by any of its children."""
+    covered = 0
+    end = span.start_ns
+    for child in span.children:
+        start = max(child.start_ns, end)
+        if child.end_ns > start:
+            covered += child.end_ns - start
+            end = child.end_ns
+    return max(0, span.end_ns - span.start_ns - covered) / 1e9
+
+
+def slowest(roots: Iterable[SpanRecord], count: int, name: str | None = None) -> list[SpanRecord]:
+    matching = [r for r in roots if name is None or r.name == name]
+    return sorted(matching, key=lambda r: r.duration, reverse=True)[:count]
+
+
+def format_trace(root: SpanRecord) -> str:
+    lines = [f"{root.duration:8.3f}s {root.name} trace={root.trace_id} status={root.status}"]
+    for depth, span in enumerate(critical_path(root)[1:], start=1):
+        indent = "  " * depth
+        own = self_time(span)
+        lines.append(f"{span.duration:8.3f}s {indent}{span.name} (self {own:.3f}s, {span.status})")
+    return "\n".join(lines)
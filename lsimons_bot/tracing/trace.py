@@ -0,0 +1,102 @@
+import asyncio
+import logging
+import os
+import time
+from collections.abc import Generator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Protocol
+
+logger = logging.getLogger(__name__)
+
+type AttributeValue = str | int | float | bool
+
+STATUS_OK = "ok"
+STATUS_ERROR = "error"
+# Abandoned on purpose, like the losing attempt of a hedged LLM request
+STATUS_CANCELLED = "cancelled"
+TRACEPARENT_HEADER = "traceparent"
+
+
+@dataclass
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: str | None = None
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: int | None = None
+    attributes: dict[str, AttributeValue] = field(default_factory=dict)
+    status: str = STATUS_OK
+    error: str | None = None
+
+    @property
+    def duration(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e9
+
+    def set(self, key: str, value: AttributeValue | None) -> None:
+        if value is not None:
+            self.attributes[key] = value
+
+    @property
+    def traceparent(self) -> str:
+        """W3C Trace Context header value naming this span as the parent."""
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+
+class SpanExporter(Protocol):
+    def export(self, span: Span) -> None: ...
+
+
+_current: ContextVar[Span | None] = ContextVar("lsimons_bot_span", default=None)
+_exporter: SpanExporter | None = None
+
+
+def set_exporter(exporter: SpanExporter | None) -> None:
+    """Send finished spans to `exporter`; None turns tracing off."""
+    global _exporter
+    _exporter = exporter
+
+
+def current_span() -> Span | None:
+    return _current.get()
+
+
+def traceparent() -> dict[str, str]:
+    """Headers that carry the current trace to another service, if a trace is active."""
+    span = _current.get()
+    return {TRACEPARENT_HEADER: span.traceparent} if span is not None else {}
+
+
+@contextmanager
+def span(name: str, **attributes: AttributeValue | None) -> Generator[Span]:
+    """Run the block in a new span, a child of the current one or the root of a new trace.
+
+    The span becomes current for the block, including asyncio tasks created inside it, and is
+    exported when the block ends. Exceptions mark the span as failed and are re-raised.
+    """
+    parent = _current.get()
+    trace_id = parent.trace_id if parent is not None else os.urandom(16).hex()
+    new = Span(name, trace_id, os.urandom(8).hex(), parent.span_id if parent else None)
+    for key, value in attributes.items():
+        new.set(key, value)
+    token = _current.set(new)
+    try:
+        yield new
+    except asyncio.CancelledError:
+        new.status = STATUS_CANCELLED
+        raise
+    except BaseException as e:
+        new.status = STATUS_ERROR
+        new.error = repr(e)
+        raise
+    finally:
+        new.end_ns = time.time_ns()
+        _current.reset(token)
+        exporter = _exporter
+        if exporter is not None:
+            try:
+                exporter.export(new)
+            except Exception as e:
+                logger.warning("Exporting span %s failed: %s", name, e)
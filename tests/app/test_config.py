@@ -3,7 +3,7 @@ from unittest.mock import patch
 
 import pytest
 
-from lsimons_bot.app.config import get_env_vars, validate_env_vars
+from lsimons_bot.app.config import get_env_vars, get_optional_env_vars, validate_env_vars
 
 
 class TestValidateEnvVars:
@@ -48,3 +48,15 @@ class TestGetEnvVars:
             pytest.raises(match="Missing required environment variables"),
         ):
             get_env_vars()
+
+
+class TestGetOptionalEnvVars:
+    def test_defaults(self) -> None:
+        with patch.dict(os.environ, {}, clear=True):
+            result = get_optional_env_vars()
+            assert result["BLOG_SCHEDULER_INTERVAL_MINUTES"] == ""
+
+    def test_overrides(self) -> None:
+        with patch.dict(os.environ, {"BLOG_SCHEDULER_INTERVAL_MINUTES": "60"}, clear=True):
+            result = get_optional_env_vars()
+            assert result["BLOG_SCHEDULER_INTERVAL_MINUTES"] == "60"
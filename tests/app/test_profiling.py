@@ -0,0 +1,105 @@
+import asyncio
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+from lsimons_bot.app.profiling import (
+    Profiler,
+    ProfilingConfig,
+    StackSampler,
+    folded_stack,
+    write_folded,
+)
+
+
+def _busy(seconds: float) -> None:
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        pass
+
+
+class TestFoldedStack:
+    def test_root_frame_comes_first(self) -> None:
+        def inner() -> str:
+            return folded_stack(sys._getframe())  # pyright: ignore[reportPrivateUsage]
+
+        frames = inner().split(";")
+
+        assert frames[-1].startswith("TestFoldedStack.test_root_frame_comes_first.<locals>.inner (")
+        assert "test_profiling.py:" in frames[-1]
+
+    def test_write_folded(self, tmp_path: Path) -> None:
+        path = write_folded(tmp_path / "out.folded", Counter({"a;b": 3, "a": 1}))
+
+        assert path.read_text() == "a;b 3\na 1\n"
+
+
+class TestStackSampler:
+    def test_samples_only_while_acquired(self) -> None:
+        sampler = StackSampler(threading.get_ident(), interval=0.001)
+
+        sampler.acquire()
+        _busy(0.1)
+        sampler.release()
+        count = len(sampler.samples)
+        time.sleep(0.02)
+
+        assert count > 0
+        assert len(sampler.samples) == count
+        assert any("_busy" in stack for _, stack in sampler.samples)
+
+
+class TestProfiler:
+    @pytest.mark.asyncio
+    async def test_profile_writes_flame_graph(self, tmp_path: Path) -> None:
+        profiler = Profiler(ProfilingConfig(directory=tmp_path, interval=0.001))
+
+        task = asyncio.create_task(profiler.profile(0.1))
+        await asyncio.sleep(0.01)
+        _busy(0.05)
+        path = await task
+
+        assert path.suffix == ".folded"
+        assert "_busy" in path.read_text()
+
+    @pytest.mark.asyncio
+    async def test_track_keeps_only_slow_requests(self, tmp_path: Path) -> None:
+        config = ProfilingConfig(directory=tmp_path, slow_request_seconds=0.05, interval=0.001)
+        profiler = Profiler(config)
+
+        async with profiler.track("fast"):
+            pass
+        async with profiler.track("slow"):
+            _busy(0.1)
+
+        [path] = tmp_path.iterdir()
+        assert path.name.endswith("-slow.folded")
+
+    @pytest.mark.asyncio
+    async def test_track_is_free_when_disabled(self, tmp_path: Path) -> None:
+        profiler = Profiler(ProfilingConfig(directory=tmp_path))
+
+        async with profiler.track("request"):
+            _busy(0.01)
+
+        assert not tmp_path.exists() or not any(tmp_path.iterdir())
+        assert not profiler.sampler.samples
+
+    def test_snapshot_memory_diffs_against_previous(self, tmp_path: Path) -> None:
+        profiler = Profiler(ProfilingConfig(directory=tmp_path, top_allocations=5))
+
+        try:
+            first = profiler.snapshot_memory()
+            kept = [bytearray(1000) for _ in range(1000)]
+            second = profiler.snapshot_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert first.read_text()
+        assert "test_profiling.py" in second.read_text()
+        assert len(kept) == 1000
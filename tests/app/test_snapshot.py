@@ -0,0 +1,76 @@
+import time
+import zlib
+from pathlib import Path
+
+from lsimons_bot.app.snapshot import (
+    HEADER,
+    MAGIC,
+    decode_snapshot,
+    encode_snapshot,
+    read_snapshot,
+    write_snapshot,
+)
+
+
+class TestEncodeSnapshot:
+    def test_round_trip(self) -> None:
+        data = {"router": {"fast": {"prompt_tokens": 12}}, "memory": []}
+
+        assert decode_snapshot(encode_snapshot(data)) == data
+
+    def test_header(self) -> None:
+        raw = encode_snapshot({}, created=1000.0)
+
+        assert HEADER.unpack_from(raw) == (MAGIC, 1, 1000.0)
+
+
+class TestDecodeSnapshot:
+    def test_too_old(self) -> None:
+        raw = encode_snapshot({"a": 1}, created=time.time() - 7200)
+
+        assert decode_snapshot(raw, max_age=3600) is None
+        assert decode_snapshot(raw, max_age=10800) == {"a": 1}
+
+    def test_other_version(self) -> None:
+        raw = HEADER.pack(MAGIC, 99, time.time()) + encode_snapshot({})[HEADER.size :]
+
+        assert decode_snapshot(raw) is None
+
+    def test_not_a_snapshot(self) -> None:
+        assert decode_snapshot(b"{}") is None
+        assert decode_snapshot(b"x" * 64) is None
+
+    def test_corrupt_body(self) -> None:
+        raw = encode_snapshot({"a": 1})
+
+        assert decode_snapshot(raw[:-4]) is None
+
+    def test_body_not_an_object(self) -> None:
+        raw = encode_snapshot({})[: HEADER.size] + zlib.compress(b"[1, 2]")
+
+        assert decode_snapshot(raw) is None
+
+
+class TestWriteSnapshot:
+    def test_write_and_read(self, tmp_path: Path) -> None:
+        path = tmp_path / "cache" / "snapshot.bin"
+
+        write_snapshot(path, {"a": [1, 2]})
+
+        assert read_snapshot(path) == {"a": [1, 2]}
+        assert [p.name for p in path.parent.iterdir()] == ["snapshot.bin"]
+
+    def test_replaces_existing(self, tmp_path: Path) -> None:
+        path = tmp_path / "snapshot.bin"
+        write_snapshot(path, {"a": 1})
+
+        write_snapshot(path, {"a": 2})
+
+        assert read_snapshot(path) == {"a": 2}
+
+    def test_missing_file(self, tmp_path: Path) -> None:
+        assert read_snapshot(tmp_path / "snapshot.bin") is None
+
+    def test_unreadable_file(self, tmp_path: Path) -> None:
+        # A directory where the file should be fails with IsADirectoryError
+        assert read_snapshot(tmp_path) is None
@@ -1,7 +1,9 @@
 import sys
+from datetime import UTC, datetime
 from unittest.mock import AsyncMock, patch
 
 from lsimons_bot.blog.__main__ import main
+from lsimons_bot.blog.backfill import BackfillWindow, WindowResult
 from lsimons_bot.blog.publish import PublishResult
 
 
@@ -45,3 +47,39 @@ class TestMain:
             exit_code = main()
 
         assert exit_code == 1
+
+    def test_backfill(self) -> None:
+        window = BackfillWindow(datetime(2025, 1, 1, tzinfo=UTC), datetime(2025, 1, 8, tzinfo=UTC))
+        mock_backfill = AsyncMock(return_value=[WindowResult(window, "written", "out.html")])
+
+        with (
+            patch.object(
+                sys,
+                "argv",
+                ["blog", "--backfill", "2025-01-01", "2025-02-01", "--window-days", "14"],
+            ),
+            patch("lsimons_bot.blog.__main__.get_env_vars", return_value={}),
+            patch("lsimons_bot.blog.__main__.create_clients"),
+            patch("lsimons_bot.blog.__main__.backfill", new=mock_backfill),
+        ):
+            exit_code = main()
+
+        assert exit_code == 0
+        start, end = mock_backfill.call_args.args[1:3]
+        assert start == datetime(2025, 1, 1, tzinfo=UTC)
+        assert end == datetime(2025, 2, 1, tzinfo=UTC)
+        assert mock_backfill.call_args.kwargs["window_days"] == 14
+
+    def test_backfill_failures(self) -> None:
+        window = BackfillWindow(datetime(2025, 1, 1, tzinfo=UTC), datetime(2025, 1, 8, tzinfo=UTC))
+        mock_backfill = AsyncMock(return_value=[WindowResult(window, "failed", "LLM down")])
+
+        with (
+            patch.object(sys, "argv", ["blog", "--backfill", "2025-01-01", "2025-01-08"]),
+            patch("lsimons_bot.blog.__main__.get_env_vars", return_value={}),
+            patch("lsimons_bot.blog.__main__.create_clients"),
+            patch("lsimons_bot.blog.__main__.backfill", new=mock_backfill),
+        ):
+            exit_code = main()
+
+        assert exit_code == 1
@@ -0,0 +1,172 @@
+import json
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from lsimons_bot.blog.backfill import (
+    BackfillWindow,
+    Checkpoint,
+    WindowResult,
+    backfill,
+    partition,
+    split_windows,
+)
+from lsimons_bot.blog.github import CommitInfo, CommitStats
+from lsimons_bot.blog.publish import BlogClients
+
+START = datetime(2025, 1, 1, tzinfo=UTC)
+END = START + timedelta(days=21)
+
+MESSAGES = [
+    "Add home tab",
+    "Fix flaky scheduler test",
+    "Refactor config loading",
+    "Stream answers from the model",
+    "Document the deployment",
+    "Cache GitHub commit stats",
+    "Handle WordPress token expiry",
+]
+
+
+def _week(days: int) -> list[CommitInfo]:
+    """A week with enough distinct commits to be significant."""
+    return [
+        CommitInfo(
+            repo_name="repo",
+            sha=f"{days:03d}{i:04d}",
+            message=message,
+            date=START + timedelta(days=days, hours=i),
+            additions=20,
+            deletions=5,
+        )
+        for i, message in enumerate(MESSAGES)
+    ]
+
+
+def _clients(commits: list[CommitInfo]) -> BlogClients:
+    mock_gh = MagicMock()
+    mock_gh.get_commits_since.return_value = CommitStats.from_commits(commits)
+    mock_llm = MagicMock()
+    mock_llm.chat = AsyncMock(return_value="TITLE: A week\nCONTENT: <p>Work.</p>")
+    mock_wp = MagicMock()
+    mock_wp.create_post.return_value = MagicMock(link="https://example.com/draft")
+    return BlogClients(wp=mock_wp, gh=mock_gh, llm=mock_llm)
+
+
+class TestSplitWindows:
+    def test_split_windows(self) -> None:
+        windows = split_windows(START, START + timedelta(days=10), days=7)
+
+        assert [w.key for w in windows] == ["2025-01-01..2025-01-08", "2025-01-08..2025-01-11"]
+
+
+class TestPartition:
+    def test_partition(self) -> None:
+        windows = split_windows(START, END, days=7)
+
+        per_window = partition([*_week(15), *_week(1)], windows)
+
+        assert [s.total_commits for s in per_window] == [7, 0, 7]
+
+
+class TestCheckpoint:
+    def test_round_trip(self, tmp_path: Path) -> None:
+        path = tmp_path / "checkpoint.json"
+        checkpoint = Checkpoint.load(path)
+        window = BackfillWindow(START, END)
+
+        checkpoint.record(WindowResult(window, "written", "out.html"))
+
+        assert Checkpoint.load(path).done == {window.key: "written: out.html"}
+
+
+class TestBackfill:
+    @pytest.mark.asyncio
+    async def test_writes_drafts_with_one_crawl(self, tmp_path: Path) -> None:
+        clients = _clients([*_week(0), *_week(14)])
+        output_dir = tmp_path / "drafts"
+
+        results = await backfill(
+            clients,
+            START,
+            END,
+            output_dir=output_dir,
+            checkpoint_path=tmp_path / "checkpoint.json",
+        )
+
+        clients.gh.get_commits_since.assert_called_once_with(START, END)
+        assert [r.status for r in results] == ["written", "skipped", "written"]
+        assert (output_dir / "2025-01-01.html").read_text().startswith("<h1>A week</h1>")
+        clients.wp.create_post.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_creates_wordpress_drafts(self, tmp_path: Path) -> None:
+        clients = _clients(_week(0))
+
+        results = await backfill(
+            clients, START, START + timedelta(days=7), checkpoint_path=tmp_path / "c.json"
+        )
+
+        assert results[0].status == "draft"
+        assert clients.wp.create_post.call_args.kwargs["status"] == "draft"
+
+    @pytest.mark.asyncio
+    async def test_resumes_from_checkpoint(self, tmp_path: Path) -> None:
+        checkpoint_path = tmp_path / "checkpoint.json"
+        _ = checkpoint_path.write_text(
+            json.dumps({"done": {"2025-01-01..2025-01-08": "written: x.html"}})
+        )
+        clients = _clients([*_week(0), *_week(14)])
+
+        results = await backfill(
+            clients, START, END, output_dir=tmp_path, checkpoint_path=checkpoint_path
+        )
+
+        clients.gh.get_commits_since.assert_called_once_with(START + timedelta(days=7), END)
+        assert [r.window.key for r in results] == [
+            "2025-01-08..2025-01-15",
+            "2025-01-15..2025-01-22",
+        ]
+        assert len(Checkpoint.load(checkpoint_path).done) == 3
+
+    @pytest.mark.asyncio
+    async def test_failed_windows_are_not_checkpointed(self, tmp_path: Path) -> None:
+        clients = _clients(_week(0))
+        clients.llm.chat = AsyncMock(side_effect=Exception("LLM down"))
+        checkpoint_path = tmp_path / "checkpoint.json"
+
+        results = await backfill(
+            clients, START, START + timedelta(days=7), checkpoint_path=checkpoint_path
+        )
+
+        assert results[0].failed
+        assert not checkpoint_path.exists()
+
+    @pytest.mark.asyncio
+    async def test_dry_run(self, tmp_path: Path) -> None:
+        clients = _clients(_week(0))
+
+        results = await backfill(
+            clients, START, END, checkpoint_path=tmp_path / "c.json", dry_run=True
+        )
+
+        assert [r.status for r in results] == ["planned"] * 3
+        clients.llm.chat.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_partial_crawl_is_not_checkpointed(self, tmp_path: Path) -> None:
+        clients = _clients(_week(0))
+        stats = CommitStats.from_commits(_week(0))
+        stats.partial = True
+        clients.gh.get_commits_since.return_value = stats
+        checkpoint_path = tmp_path / "checkpoint.json"
+
+        results = await backfill(
+            clients, START, START + timedelta(days=7), checkpoint_path=checkpoint_path
+        )
+
+        assert results[0].failed
+        clients.llm.chat.assert_not_called()
+        assert not checkpoint_path.exists()
@@ -0,0 +1,60 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from lsimons_bot.blog.budget import RateBudget, RateBudgetExhausted
+
+
+def _budget(now: float = 1000.0) -> tuple[RateBudget, MagicMock]:
+    sleep = MagicMock()
+    return RateBudget(reserve=10, max_wait=60, clock=lambda: now, sleep=sleep), sleep
+
+
+class TestRateBudget:
+    def test_unknown_budget_allows_requests(self) -> None:
+        budget, sleep = _budget()
+
+        budget.spend()
+
+        sleep.assert_not_called()
+
+    def test_spending_counts_down(self) -> None:
+        budget, _ = _budget()
+        budget.observe(100, 2000)
+
+        budget.spend(5)
+
+        assert budget.remaining == 95
+
+    def test_waits_for_a_reset_that_is_close(self) -> None:
+        budget, sleep = _budget()
+        budget.observe(10, 1030)
+
+        budget.spend()
+
+        sleep.assert_called_once_with(30)
+
+    def test_defers_when_the_reset_is_far(self) -> None:
+        budget, sleep = _budget()
+        budget.observe(10, 5000)
+
+        with pytest.raises(RateBudgetExhausted):
+            budget.spend()
+        sleep.assert_not_called()
+
+    def test_secondary_limit_blocks_for_retry_after(self) -> None:
+        budget, sleep = _budget()
+        budget.observe(4000, 5000)
+
+        budget.observe_headers({"Retry-After": "20"})
+        budget.spend()
+
+        sleep.assert_called_once_with(20)
+
+    def test_exhausted_primary_limit_waits_for_reset(self) -> None:
+        budget, _ = _budget()
+
+        budget.observe_headers({"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "4600"})
+
+        assert budget.blocked_until == 0
+        assert budget.wait_time() == 3600
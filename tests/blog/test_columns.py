@@ -0,0 +1,95 @@
+from datetime import UTC, date, datetime, timedelta
+
+import pytest
+
+from lsimons_bot.blog.columns import CommitColumns
+from lsimons_bot.blog.github import CommitInfo, CommitStats
+
+START = datetime(2025, 1, 1, 12, tzinfo=UTC)
+
+
+def _commit(repo_name: str, hours: float, additions: int, deletions: int = 0) -> CommitInfo:
+    return CommitInfo(
+        repo_name=repo_name,
+        sha="abc1234",
+        message="Change",
+        date=START + timedelta(hours=hours),
+        additions=additions,
+        deletions=deletions,
+    )
+
+
+@pytest.fixture
+def columns() -> CommitColumns:
+    return CommitColumns(
+        [
+            _commit("b", 30, 50, 10),
+            _commit("a", 0, 10),
+            _commit("a", 1, 20, 5),
+            _commit("a", 48, 400, 100),
+        ]
+    )
+
+
+class TestCommitColumns:
+    def test_sorted_by_date(self, columns: CommitColumns) -> None:
+        assert len(columns) == 4
+        assert columns.first == START
+        assert columns.last == START + timedelta(hours=48)
+        assert list(columns.additions) == [10, 20, 50, 400]
+
+    def test_interns_repo_names(self, columns: CommitColumns) -> None:
+        assert columns.repos == ["a", "b"]
+        assert list(columns.repo_ids) == [0, 0, 1, 0]
+
+    def test_per_repo_totals(self, columns: CommitColumns) -> None:
+        totals = columns.per_repo_totals()
+
+        assert totals["a"].commits == 3
+        assert totals["a"].total_lines == 535
+        assert totals["b"].additions == 50
+
+    def test_daily_histogram(self, columns: CommitColumns) -> None:
+        assert columns.daily_histogram() == {
+            date(2025, 1, 1): 2,
+            date(2025, 1, 2): 1,
+            date(2025, 1, 3): 1,
+        }
+        assert columns.active_days() == 3
+
+    def test_size_percentiles(self, columns: CommitColumns) -> None:
+        assert columns.size_percentile(50) == 25
+        assert columns.size_percentile(100) == 500
+        assert columns.max_size() == 500
+        assert CommitColumns().size_percentile(90) == 0
+
+    def test_between(self, columns: CommitColumns) -> None:
+        day_two = columns.between(START + timedelta(hours=12), START + timedelta(hours=36))
+
+        assert len(day_two) == 1
+        assert day_two.per_repo_totals() == {"b": columns.per_repo_totals()["b"]}
+
+    def test_rolling_max(self, columns: CommitColumns) -> None:
+        assert columns.rolling_max(timedelta(hours=2)) == 2
+        assert columns.rolling_max(timedelta(days=3)) == 4
+
+
+class TestCommitStatsColumns:
+    def test_columns_follow_the_commits(self) -> None:
+        stats = CommitStats.from_commits([_commit("a", 0, 10), _commit("a", 1, 300)])
+        assert stats.columns().total_lines == 310
+
+        stats.commits.append(_commit("b", 2, 5))
+
+        assert stats.columns().total_lines == 315
+
+    def test_significant_when_spread_over_days(self) -> None:
+        stats = CommitStats.from_commits([_commit("a", 24 * day, 10) for day in range(3)])
+
+        assert stats.is_significant() is True
+        assert stats.is_significant(min_active_days=4) is False
+
+    def test_few_commits_on_one_day_are_not_significant(self) -> None:
+        stats = CommitStats.from_commits([_commit("a", hour, 150) for hour in range(4)])
+
+        assert stats.is_significant() is False
@@ -3,7 +3,7 @@ from unittest.mock import patch
 
 import pytest
 
-from lsimons_bot.blog.config import get_env_vars, validate_env_vars
+from lsimons_bot.blog.config import get_env_vars, get_optional_env_vars, validate_env_vars
 
 
 class TestValidateEnvVars:
@@ -43,3 +43,13 @@ class TestGetEnvVars:
             pytest.raises(Exception, match="Missing required environment variables"),
         ):
             get_env_vars()
+
+
+class TestGetOptionalEnvVars:
+    def test_defaults(self) -> None:
+        with patch.dict(os.environ, {}, clear=True):
+            assert get_optional_env_vars() == {"BLOG_EXCLUDE_PATHS": "", "BLOG_MIRROR_DIR": ""}
+
+    def test_overrides(self) -> None:
+        with patch.dict(os.environ, {"BLOG_EXCLUDE_PATHS": "docs/*"}, clear=True):
+            assert get_optional_env_vars()["BLOG_EXCLUDE_PATHS"] == "docs/*"
@@ -1,9 +1,15 @@
 from datetime import UTC, datetime
+from typing import Any
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
-from lsimons_bot.blog.content import BlogContent, generate_blog_post
+from lsimons_bot.blog.content import (
+    MAX_COMMITS_PER_SUMMARY,
+    BlogContent,
+    generate_blog_post,
+    summarize_commits,
+)
 from lsimons_bot.blog.github import CommitInfo, CommitStats
 
 
@@ -53,3 +59,82 @@ class TestGenerateBlogPost:
 
         assert result.title == "Weekly Update"
         assert result.content == "Some unparseable response"
+
+
+def _many_commits(repos: int, per_repo: int) -> CommitStats:
+    commits = [
+        CommitInfo(
+            repo_name=f"repo-{r}",
+            sha=f"{r:03d}{c:04d}",
+            message=f"Change {c}",
+            date=datetime.now(UTC),
+            additions=10,
+            deletions=2,
+        )
+        for r in range(repos)
+        for c in range(per_repo)
+    ]
+    return CommitStats(commits=commits, total_commits=len(commits), max_lines_in_commit=12)
+
+
+def _prompt(call: Any) -> str:
+    return str(call.kwargs["messages"][-1]["content"])
+
+
+class TestSummarizeCommits:
+    @pytest.mark.asyncio
+    async def test_summarizes_per_repo(self) -> None:
+        mock_llm = MagicMock()
+        mock_llm.chat = AsyncMock(return_value="Did things.")
+
+        summary = await summarize_commits(mock_llm, _many_commits(repos=3, per_repo=10))
+
+        assert mock_llm.chat.await_count == 3
+        assert summary.startswith("30 commits in 3 repositories")
+        assert "- [repo-0] 10 commits (+100/-20): Did things." in summary
+
+    @pytest.mark.asyncio
+    async def test_bounds_prompt_size(self) -> None:
+        mock_llm = MagicMock()
+        mock_llm.chat = AsyncMock(return_value="Did things.")
+
+        summary = await summarize_commits(mock_llm, _many_commits(repos=30, per_repo=50))
+
+        for call in mock_llm.chat.await_args_list:
+            assert _prompt(call).count("\n- ") <= MAX_COMMITS_PER_SUMMARY
+        # 60 chunk summaries are reduced again in batches of 20
+        assert mock_llm.chat.await_count == 60 + 3
+        assert summary.count("\n- ") == 3
+
+    @pytest.mark.asyncio
+    async def test_reuses_cached_summaries(self) -> None:
+        mock_llm = MagicMock()
+        mock_llm.chat = AsyncMock(return_value="Did things.")
+        cache: dict[str, str] = {}
+        stats = _many_commits(repos=2, per_repo=15)
+
+        _ = await summarize_commits(mock_llm, stats, cache)
+        stats.commits.append(
+            CommitInfo(
+                repo_name="repo-1",
+                sha="new1234",
+                message="One more",
+                date=datetime.now(UTC),
+                additions=1,
+                deletions=1,
+            )
+        )
+        _ = await summarize_commits(mock_llm, stats, cache)
+
+        # Only the repository with a new commit is summarized again
+        assert mock_llm.chat.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_generate_blog_post_uses_summaries_for_large_sets(self) -> None:
+        mock_llm = MagicMock()
+        mock_llm.chat = AsyncMock(return_value="TITLE: Busy week\nCONTENT: <p>Lots.</p>")
+
+        result = await generate_blog_post(mock_llm, _many_commits(repos=2, per_repo=30))
+
+        assert result.title == "Busy week"
+        assert "60 commits in 2 repositories" in _prompt(mock_llm.chat.await_args_list[-1])
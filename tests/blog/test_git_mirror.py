@@ -0,0 +1,131 @@
+import os
+import subprocess
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from lsimons_bot.blog.git_mirror import GitMirror, parse_log
+
+BOT = "lsimons-bot <bot@leosimons.com>"
+OTHER = "Someone Else <someone@example.com>"
+SINCE = datetime(2025, 1, 10, tzinfo=UTC)
+
+
+def _run(*args: str, cwd: Path, date: datetime | None = None) -> None:
+    env = {**os.environ, "GIT_CONFIG_GLOBAL": os.devnull, "GIT_CONFIG_NOSYSTEM": "1"}
+    if date is not None:
+        env |= {"GIT_AUTHOR_DATE": date.isoformat(), "GIT_COMMITTER_DATE": date.isoformat()}
+    _ = subprocess.run(["git", *args], cwd=cwd, env=env, check=True, capture_output=True)
+
+
+def _commit(origin: Path, author: str, date: datetime, path: str, lines: int) -> None:
+    file = origin / path
+    existing = file.read_text() if file.exists() else ""
+    _ = file.write_text(existing + "".join(f"line {i}\n" for i in range(lines)))
+    _run("add", path, cwd=origin)
+    _run(
+        "-c",
+        "user.name=committer",
+        "-c",
+        "user.email=committer@example.com",
+        "commit",
+        f"--author={author}",
+        "-m",
+        f"Change {path}",
+        cwd=origin,
+        date=date,
+    )
+
+
+def _origin(tmp_path: Path) -> Path:
+    origin = tmp_path / "origin"
+    origin.mkdir()
+    _run("init", "-q", "-b", "main", cwd=origin)
+    # Old history with a large tree, outside the range and the shallow clone
+    _commit(origin, OTHER, SINCE - timedelta(days=30), "big.txt", 500)
+    _commit(origin, BOT, SINCE + timedelta(days=1), "app.py", 3)
+    _commit(origin, OTHER, SINCE + timedelta(days=2), "other.py", 7)
+    _commit(origin, BOT, SINCE + timedelta(days=3), "app.py", 2)
+    return origin
+
+
+def _mirror(tmp_path: Path, origin: Path, pushed_at: datetime) -> tuple[GitMirror, MagicMock]:
+    repo = MagicMock(clone_url=f"file://{origin}", pushed_at=pushed_at)
+    repo.name = "origin"
+    github = MagicMock(token="")
+    github.list_repos.return_value = [repo]
+    return GitMirror(github, tmp_path / "mirrors"), repo
+
+
+class TestParseLog:
+    def test_parses_commits_and_numstat(self) -> None:
+        output = (
+            "\x1eabcdef0123\x1f2025-01-11T10:00:00+01:00\x1fAdd logo\n\n"
+            "3\t1\tREADME.md\n-\t-\tlogo.png\n"
+        )
+
+        [commit] = parse_log(output, "repo")
+
+        assert commit.sha == "abcdef0"
+        assert commit.date == datetime(2025, 1, 11, 9, tzinfo=UTC)
+        assert commit.message == "Add logo"
+        assert (commit.additions, commit.deletions) == (3, 1)
+        assert [f.path for f in commit.files] == ["README.md", "logo.png"]
+
+
+class TestGitMirror:
+    def test_reads_bot_commits_from_mirror(self, tmp_path: Path) -> None:
+        origin = _origin(tmp_path)
+        mirror, _ = _mirror(tmp_path, origin, SINCE + timedelta(days=3))
+
+        stats = mirror.get_commits_since(SINCE)
+
+        assert stats.source == "mirror"
+        assert stats.partial is False
+        # The oldest commit in range sits on the shallow boundary; it must not count the tree
+        assert [c.total_lines for c in stats.commits] == [2, 3]
+        assert (tmp_path / "mirrors" / "origin.git" / "shallow").exists()
+
+    def test_until_limits_the_range(self, tmp_path: Path) -> None:
+        origin = _origin(tmp_path)
+        mirror, _ = _mirror(tmp_path, origin, SINCE + timedelta(days=3))
+
+        stats = mirror.get_commits_since(SINCE, until=SINCE + timedelta(days=2))
+
+        assert stats.total_commits == 1
+
+    def test_fetches_only_after_a_push(self, tmp_path: Path) -> None:
+        origin = _origin(tmp_path)
+        mirror, repo = _mirror(tmp_path, origin, SINCE + timedelta(days=3))
+        _ = mirror.get_commits_since(SINCE)
+        _commit(origin, BOT, SINCE + timedelta(days=4), "app.py", 4)
+
+        unchanged = mirror.get_commits_since(SINCE)
+        repo.pushed_at = SINCE + timedelta(days=4)
+        fetched = mirror.get_commits_since(SINCE)
+
+        assert unchanged.total_commits == 2
+        assert fetched.total_commits == 3
+        assert fetched.commits[0].total_lines == 4
+
+    def test_no_commits_since_the_boundary(self, tmp_path: Path) -> None:
+        origin = _origin(tmp_path)
+        since = SINCE + timedelta(days=30)
+        mirror, repo = _mirror(tmp_path, origin, since)
+
+        cloned = mirror.get_commits_since(since)
+        repo.pushed_at = since + timedelta(days=1)
+        fetched = mirror.get_commits_since(since)
+
+        for stats in (cloned, fetched):
+            assert stats.partial is False
+            assert stats.total_commits == 0
+        assert (tmp_path / "mirrors" / "origin.git" / "lsimons-mirror.json").exists()
+
+    def test_unreachable_repo_makes_stats_partial(self, tmp_path: Path) -> None:
+        mirror, _ = _mirror(tmp_path, tmp_path / "missing", SINCE)
+
+        stats = mirror.get_commits_since(SINCE)
+
+        assert stats.partial is True
+        assert stats.total_commits == 0
@@ -1,9 +1,28 @@
 from datetime import UTC, datetime
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, PropertyMock, patch
+
+from github.GithubException import GithubException, RateLimitExceededException
 
 from lsimons_bot.blog.github import CommitInfo, CommitStats, GitHubClient
 
 
+def _github(remaining: int = 5000, reset: int = 0) -> MagicMock:
+    github = MagicMock()
+    github.rate_limiting = (remaining, 5000)
+    github.rate_limiting_resettime = reset
+    return github
+
+
+def _repo(
+    private: bool = False, pushed_at: datetime | None = None, name: str = "repo"
+) -> MagicMock:
+    repo = MagicMock(private=private)
+    repo.name = name
+    repo.full_name = f"lsimons-bot/{name}"
+    repo.pushed_at = pushed_at or datetime.now(UTC)
+    return repo
+
+
 class TestCommitInfo:
     def test_total_lines(self) -> None:
         commit = CommitInfo(
@@ -30,12 +49,24 @@ class TestCommitStats:
         stats = CommitStats(commits=[], total_commits=2, max_lines_in_commit=50)
         assert stats.is_significant(min_commits=5, min_lines=200) is False
 
+    def test_from_commits(self) -> None:
+        commits = [
+            CommitInfo("a", "abc1234", "One", datetime.now(UTC), additions=10, deletions=0),
+            CommitInfo("a", "def5678", "Two", datetime.now(UTC), additions=200, deletions=100),
+        ]
+        stats = CommitStats.from_commits(commits)
+
+        assert stats.commits == commits
+        assert stats.total_commits == 2
+        assert stats.max_lines_in_commit == 300
+        assert CommitStats.from_commits([]).max_lines_in_commit == 0
+
 
 class TestGitHubClient:
     def test_get_commits_since(self) -> None:
-        mock_github = MagicMock()
+        mock_github = _github()
         mock_user = MagicMock()
-        mock_repo = MagicMock()
+        mock_repo = _repo()
         mock_repo.name = "test-repo"
 
         mock_commit = MagicMock()
@@ -44,6 +75,8 @@ class TestGitHubClient:
         mock_commit.commit.author.date = datetime.now(UTC)
         mock_commit.stats.additions = 10
         mock_commit.stats.deletions = 5
+        mock_file = MagicMock(filename="app.py", additions=10, deletions=5)
+        mock_commit.files = [mock_file]
 
         mock_repo.get_commits.return_value = [mock_commit]
         mock_user.get_repos.return_value = [mock_repo]
@@ -57,3 +90,314 @@ class TestGitHubClient:
         assert result.total_commits == 1
         assert result.max_lines_in_commit == 15
         assert result.commits[0].sha == "abc1234"
+        assert result.commits[0].files[0].path == "app.py"
+
+    def test_get_commits_since_reuses_commit_index(self) -> None:
+        mock_github = _github()
+        mock_repo = _repo()
+        mock_repo.name = "test-repo"
+
+        mock_commit = MagicMock()
+        mock_commit.sha = "abc1234567890"
+        mock_commit.commit.message = "Test commit"
+        mock_commit.commit.author.date = datetime.now(UTC)
+        mock_stats = PropertyMock(return_value=MagicMock(additions=10, deletions=5))
+        type(mock_commit).stats = mock_stats
+
+        mock_repo.get_commits.return_value = [mock_commit]
+        mock_github.get_user.return_value.get_repos.return_value = [mock_repo]
+
+        with patch("lsimons_bot.blog.github.Github", return_value=mock_github):
+            client = GitHubClient(token="token")
+            since = datetime(2024, 1, 1, tzinfo=UTC)
+            first = client.get_commits_since(since)
+            second = client.get_commits_since(since)
+
+        assert first.commits == second.commits
+        assert mock_stats.call_count == 1
+
+    def test_get_commits_since_with_until(self) -> None:
+        mock_github = _github()
+        mock_repo = _repo()
+        mock_repo.get_commits.return_value = []
+        mock_github.get_user.return_value.get_repos.return_value = [mock_repo]
+
+        with patch("lsimons_bot.blog.github.Github", return_value=mock_github):
+            client = GitHubClient(token="token")
+            _ = client.get_commits_since(
+                datetime(2024, 1, 1, tzinfo=UTC), until=datetime(2024, 2, 1, tzinfo=UTC)
+            )
+
+        kwargs = mock_repo.get_commits.call_args.kwargs
+        assert kwargs["since"] == datetime(2024, 1, 1)
+        assert kwargs["until"] == datetime(2024, 2, 1)
+
+
+def _search_results(commits: list[MagicMock], total: int | None = None) -> MagicMock:
+    # Only what PaginatedList has: iteration and totalCount from the first page
+    results = MagicMock(spec=["__iter__", "totalCount"])
+    results.__iter__.return_value = iter(commits)
+    results.totalCount = len(commits) if total is None else total
+    return results
+
+
+def _commit(sha: str, repo_name: str = "") -> MagicMock:
+    commit = MagicMock()
+    commit.sha = sha
+    commit.repository.full_name = f"lsimons-bot/{repo_name}"
+    commit.commit.message = f"Commit {sha}"
+    commit.commit.author.date = datetime(2024, 1, 2, tzinfo=UTC)
+    commit.stats.additions = 1
+    commit.stats.deletions = 1
+    commit.files = []
+    return commit
+
+
+class TestCommitSearch:
+    def test_search_covers_public_repos(self) -> None:
+        mock_github = _github()
+        public = _repo(name="public")
+        mock_github.get_user.return_value.get_repos.return_value = [public]
+        mock_github.search_commits.return_value = _search_results([_commit("a" * 40, "public")])
+
+        with patch("lsimons_bot.blog.github.Github", return_value=mock_github):
+            client = GitHubClient(token="token")
+            result = client.get_commits_since(datetime(2024, 1, 1, tzinfo=UTC))
+
+        query = mock_github.search_commits.call_args.args[0]
+        assert query == (
+            "author-email:bot@leosimons.com user:lsimons-bot committer-date:>=2024-01-01T00:00:00Z"
+        )
+        public.get_commits.assert_not_called()
+        assert result.source == "search"
+        assert [c.repo_name for c in result.commits] == ["public"]
+
+    def test_private_repos_are_listed(self) -> None:
+        mock_github = _github()
+        private = _repo(private=True, name="private")
+        private.get_commits.return_value = [_commit("b" * 40), _commit("a" * 40)]
+        mock_github.get_user.return_value.get_repos.return_value = [private]
+        mock_github.search_commits.return_value = _search_results([_commit("a" * 40, "public")])
+
+        with patch("lsimons_bot.blog.github.Github", return_value=mock_github):
+            client = GitHubClient(token="token")
+            result = client.get_commits_since(
+                datetime(2024, 1, 1, tzinfo=UTC), until=datetime(2024, 2, 1, tzinfo=UTC)
+            )
+
+        query = mock_github.search_commits.call_args.args[0]
+        assert query.endswith("committer-date:2024-01-01T00:00:00Z..2024-02-01T00:00:00Z")
+        assert result.source == "search+repos"
+        # The same commit found both ways is counted once
+        assert result.total_commits == 2
+
+    def test_incomplete_search_falls_back_to_repos(self) -> None:
+        mock_github = _github()
+        repo = _repo(name="public")
+        repo.get_commits.return_value = [_commit("a" * 40)]
+        mock_github.get_user.return_value.get_repos.return_value = [repo]
+        results = _search_results([], total=1500)
+        mock_github.search_commits.return_value = results
+
+        with patch("lsimons_bot.blog.github.Github", return_value=mock_github):
+            client = GitHubClient(token="token")
+            result = client.get_commits_since(datetime(2024, 1, 1, tzinfo=UTC))
+
+        # Too many results is known from the first page; the rest is not paged through
+        results.__iter__.assert_not_called()
+        repo.get_commits.assert_called_once()
+        assert result.source == "repos"
+        assert result.total_commits == 1
+
+    def test_short_search_falls_back_to_repos(self) -> None:
+        mock_github = _github()
+        repo = _repo(name="public")
+        repo.get_commits.return_value = [_commit("a" * 40), _commit("b" * 40)]
+        mock_github.get_user.return_value.get_repos.return_value = [repo]
+        mock_github.search_commits.return_value = _search_results(
+            [_commit("a" * 40, "public")], total=2
+        )
+
+        with patch("lsimons_bot.blog.github.Github", return_value=mock_github):
+            client = GitHubClient(token="token")
+            result = client.get_commits_since(datetime(2024, 1, 1, tzinfo=UTC))
+
+        assert result.source == "repos"
+        assert result.total_commits == 2
+
+    def test_search_results_outside_listed_repos_are_skipped(self) -> None:
+        mock_github = _github()
+        public = _repo(name="public")
+        mock_github.get_user.return_value.get_repos.return_value = [public]
+        mock_github.search_commits.return_value = _search_results(
+            [_commit("a" * 40, "public"), _commit("b" * 40, "archived")]
+        )
+
+        with patch("lsimons_bot.blog.github.Github", return_value=mock_github):
+            client = GitHubClient(token="token")
+            result = client.get_commits_since(datetime(2024, 1, 1, tzinfo=UTC))
+
+        assert [c.repo_name for c in result.commits] == ["public"]
+
+    def test_failed_search_falls_back_to_repos(self) -> None:
+        mock_github = _github()
+        repo = _repo()
+        repo.get_commits.return_value = []
+        mock_github.get_user.return_value.get_repos.return_value = [repo]
+        mock_github.search_commits.side_effect = Exception("422")
+
+        with patch("lsimons_bot.blog.github.Github", return_value=mock_github):
+            client = GitHubClient(token="token")
+            result = client.get_commits_since(datetime(2024, 1, 1, tzinfo=UTC))
+
+        repo.get_commits.assert_called_once()
+        assert result.source == "repos"
+
+    def test_search_can_be_disabled(self) -> None:
+        mock_github = _github()
+        mock_github.get_user.return_value.get_repos.return_value = []
+
+        with patch("lsimons_bot.blog.github.Github", return_value=mock_github):
+            client = GitHubClient(token="token", use_search=False)
+            result = client.get_commits_since(datetime(2024, 1, 1, tzinfo=UTC))
+
+        mock_github.search_commits.assert_not_called()
+        assert result.source == "repos"
+
+
+class TestRateBudget:
+    def test_crawls_recently_pushed_repos_first(self) -> None:
+        mock_github = _github()
+        since = datetime(2024, 1, 1, tzinfo=UTC)
+        stale = _repo(pushed_at=datetime(2023, 6, 1, tzinfo=UTC))
+        older = _repo(pushed_at=datetime(2024, 1, 5, tzinfo=UTC))
+        newer = _repo(pushed_at=datetime(2024, 1, 9, tzinfo=UTC))
+        order: list[str] = []
+        older.get_commits.side_effect = lambda **_: order.append("older") or []
+        newer.get_commits.side_effect = lambda **_: order.append("newer") or []
+        mock_github.get_user.return_value.get_repos.return_value = [stale, older, newer]
+
+        with patch("lsimons_bot.blog.github.Github", return_value=mock_github):
+            client = GitHubClient(token="token", use_search=False)
+            result = client.get_commits_since(since)
+
+        assert order == ["newer", "older"]
+        stale.get_commits.assert_not_called()
+        assert result.partial is False
+
+    def test_exhausted_budget_returns_partial_stats(self) -> None:
+        mock_github = _github(remaining=10, reset=2**31)
+        first = _repo(pushed_at=datetime(2024, 1, 9, tzinfo=UTC))
+        first.name = "first"
+        first.get_commits.return_value = [_commit("a" * 40)]
+        second = _repo(pushed_at=datetime(2024, 1, 5, tzinfo=UTC))
+        mock_github.get_user.return_value.get_repos.return_value = [first, second]
+
+        with patch("lsimons_bot.blog.github.Github", return_value=mock_github):
+            client = GitHubClient(token="token", use_search=False)
+            client.budget.observe(60, 2**31)
+            result = client.get_commits_since(datetime(2024, 1, 1, tzinfo=UTC))
+
+        assert result.partial is True
+        second.get_commits.assert_not_called()
+
+    def test_secondary_limit_is_retried(self) -> None:
+        mock_github = _github()
+        repo = _repo()
+        repo.name = "repo"
+        repo.get_commits.side_effect = [
+            RateLimitExceededException(403, None, {"Retry-After": "1"}),
+            [_commit("a" * 40)],
+        ]
+        mock_github.get_user.return_value.get_repos.return_value = [repo]
+        sleep = MagicMock()
+
+        with patch("lsimons_bot.blog.github.Github", return_value=mock_github):
+            client = GitHubClient(token="token", use_search=False)
+            client.budget.sleep = sleep
+            result = client.get_commits_since(datetime(2024, 1, 1, tzinfo=UTC))
+
+        sleep.assert_called_once()
+        assert result.total_commits == 1
+        assert result.partial is False
+
+    def test_repeated_rate_limits_make_stats_partial(self) -> None:
+        mock_github = _github()
+        repo = _repo()
+        repo.get_commits.side_effect = RateLimitExceededException(403, None, {"Retry-After": "1"})
+        mock_github.get_user.return_value.get_repos.return_value = [repo]
+
+        with patch("lsimons_bot.blog.github.Github", return_value=mock_github):
+            client = GitHubClient(token="token", use_search=False)
+            client.budget.sleep = MagicMock()
+            result = client.get_commits_since(datetime(2024, 1, 1, tzinfo=UTC))
+
+        assert repo.get_commits.call_count == 3
+        assert result.partial is True
+
+    def test_unreadable_repo_is_skipped(self) -> None:
+        mock_github = _github()
+        empty = _repo(pushed_at=datetime(2024, 1, 9, tzinfo=UTC), name="empty")
+        empty.get_commits.side_effect = GithubException(
+            409, {"message": "Git Repository is empty."}
+        )
+        repo = _repo(pushed_at=datetime(2024, 1, 5, tzinfo=UTC))
+        repo.get_commits.return_value = [_commit("a" * 40)]
+        mock_github.get_user.return_value.get_repos.return_value = [empty, repo]
+
+        with patch("lsimons_bot.blog.github.Github", return_value=mock_github):
+            client = GitHubClient(token="token", use_search=False)
+            result = client.get_commits_since(datetime(2024, 1, 1, tzinfo=UTC))
+
+        assert result.total_commits == 1
+        assert result.partial is False
+
+    def test_rate_limited_stats_make_stats_partial(self) -> None:
+        mock_github = _github()
+        repo = _repo()
+        failing = _commit("a" * 40)
+        type(failing).stats = PropertyMock(
+            side_effect=RateLimitExceededException(403, None, {"Retry-After": "1"})
+        )
+        repo.get_commits.return_value = [failing, _commit("b" * 40)]
+        mock_github.get_user.return_value.get_repos.return_value = [repo]
+
+        with patch("lsimons_bot.blog.github.Github", return_value=mock_github):
+            client = GitHubClient(token="token", use_search=False)
+            client.budget.sleep = MagicMock()
+            result = client.get_commits_since(datetime(2024, 1, 1, tzinfo=UTC))
+
+        assert result.partial is True
+        assert result.total_commits == 1
+
+    def test_rate_limited_stats_of_a_search_hit_make_stats_partial(self) -> None:
+        mock_github = _github()
+        mock_github.get_user.return_value.get_repos.return_value = [_repo(name="public")]
+        failing = _commit("a" * 40, "public")
+        type(failing).stats = PropertyMock(
+            side_effect=RateLimitExceededException(403, None, {"Retry-After": "1"})
+        )
+        mock_github.search_commits.return_value = _search_results([failing])
+
+        with patch("lsimons_bot.blog.github.Github", return_value=mock_github):
+            client = GitHubClient(token="token")
+            client.budget.sleep = MagicMock()
+            result = client.get_commits_since(datetime(2024, 1, 1, tzinfo=UTC))
+
+        assert result.partial is True
+        assert result.total_commits == 0
+
+    def test_unreadable_commit_is_skipped(self) -> None:
+        mock_github = _github()
+        repo = _repo()
+        failing = _commit("a" * 40)
+        type(failing).stats = PropertyMock(side_effect=GithubException(422, {"message": "Diff"}))
+        repo.get_commits.return_value = [failing, _commit("b" * 40)]
+        mock_github.get_user.return_value.get_repos.return_value = [repo]
+
+        with patch("lsimons_bot.blog.github.Github", return_value=mock_github):
+            client = GitHubClient(token="token", use_search=False)
+            result = client.get_commits_since(datetime(2024, 1, 1, tzinfo=UTC))
+
+        assert result.partial is False
+        assert result.total_commits == 1
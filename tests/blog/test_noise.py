@@ -0,0 +1,132 @@
+from datetime import UTC, datetime, timedelta
+
+from lsimons_bot.blog.github import CommitInfo, CommitStats, FileChange
+from lsimons_bot.blog.noise import (
+    LOCKFILE_PATTERNS,
+    NoiseRules,
+    fold_noise,
+    is_excluded,
+    parse_exclude_paths,
+    signature,
+    similarity,
+)
+
+NOW = datetime(2026, 1, 10, tzinfo=UTC)
+
+
+def _commit(
+    message: str,
+    hours_ago: int = 0,
+    lines: int = 10,
+    repo_name: str = "repo",
+    files: tuple[FileChange, ...] = (),
+) -> CommitInfo:
+    return CommitInfo(
+        repo_name=repo_name,
+        sha=f"{abs(hash((message, hours_ago))) % 10**7:07d}",
+        message=message,
+        date=NOW - timedelta(hours=hours_ago),
+        additions=lines,
+        deletions=0,
+        files=files,
+    )
+
+
+def _stats(*commits: CommitInfo) -> CommitStats:
+    return CommitStats(
+        commits=list(commits),
+        total_commits=len(commits),
+        max_lines_in_commit=max(c.total_lines for c in commits),
+    )
+
+
+class TestPatterns:
+    def test_is_excluded(self) -> None:
+        assert is_excluded("uv.lock", LOCKFILE_PATTERNS)
+        assert is_excluded("web/package-lock.json", LOCKFILE_PATTERNS)
+        assert not is_excluded("lsimons_bot/blog/noise.py", LOCKFILE_PATTERNS)
+
+    def test_parse_exclude_paths(self) -> None:
+        patterns = parse_exclude_paths("docs/*, *.svg,")
+        assert patterns == (*LOCKFILE_PATTERNS, "docs/*", "*.svg")
+
+
+class TestSignature:
+    def test_masks_versions_and_numbers(self) -> None:
+        assert signature("Bump ruff from 0.5.1 to 0.6.0") == signature(
+            "Bump ruff from 0.6.0 to 0.7.2"
+        )
+
+    def test_similarity(self) -> None:
+        assert similarity(signature("Fix typo"), signature("fix typos")) == 1.0
+        assert similarity(signature("Add login page"), signature("Add feature flags")) < 0.6
+
+
+class TestFoldNoise:
+    def test_folds_near_duplicates(self) -> None:
+        stats = _stats(
+            _commit("Fix typo in README", 3),
+            _commit("fix typos in readme", 2),
+            _commit("Fix typo in README", 1),
+            _commit("Add home tab", 0, lines=120),
+        )
+
+        folded = fold_noise(stats)
+
+        assert folded.total_commits == 2
+        messages = [c.message for c in folded.commits]
+        assert "Fix typo in README (×3)" in messages
+        assert "Add home tab" in messages
+        assert folded.max_lines_in_commit == 120
+
+    def test_keeps_repos_apart(self) -> None:
+        stats = _stats(_commit("Fix typo", repo_name="a"), _commit("Fix typo", repo_name="b"))
+        assert fold_noise(stats).total_commits == 2
+
+    def test_folds_dependency_updates(self) -> None:
+        stats = _stats(
+            _commit("Bump requests from 2.31.0 to 2.32.0", 2, lines=900),
+            _commit("chore(deps): update actions/checkout", 1, lines=4),
+            _commit("Update README to mention the home tab", 0, lines=12),
+        )
+
+        folded = fold_noise(stats)
+
+        messages = [c.message for c in folded.commits]
+        assert "Dependency updates (×2)" in messages
+        assert "Update README to mention the home tab" in messages
+        assert folded.max_lines_in_commit == 12
+
+    def test_folds_revert_pairs(self) -> None:
+        stats = _stats(
+            _commit("Try a faster parser", 2, lines=300),
+            _commit('Revert "Try a faster parser"', 1, lines=300),
+        )
+
+        folded = fold_noise(stats)
+
+        assert folded.total_commits == 1
+        assert folded.commits[0].message == "Try a faster parser (reverted)"
+        assert folded.commits[0].folded == 2
+        assert folded.max_lines_in_commit == 0
+
+    def test_excluded_paths_do_not_count(self) -> None:
+        files = (FileChange("uv.lock", 800, 700), FileChange("lsimons_bot/app.py", 20, 5))
+        lockfile_only = (FileChange("uv.lock", 50, 50),)
+        stats = _stats(
+            _commit("Add profiling", 1, files=files),
+            _commit("Relock", 0, files=lockfile_only),
+        )
+
+        folded = fold_noise(stats)
+
+        assert folded.max_lines_in_commit == 25
+        assert "Dependency updates (×1)" in [c.message for c in folded.commits]
+
+    def test_configured_paths(self) -> None:
+        files = (FileChange("docs/big.md", 500, 0), FileChange("app.py", 10, 0))
+        stats = _stats(_commit("Write docs", files=files))
+
+        rules = NoiseRules(exclude_paths=parse_exclude_paths("docs/*"))
+
+        assert fold_noise(stats, rules).max_lines_in_commit == 10
@@ -1,12 +1,40 @@
 from datetime import UTC, datetime, timedelta
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from lsimons_bot.blog.github import CommitStats
-from lsimons_bot.blog.publish import PublishResult, check_and_publish
+from lsimons_bot.blog.github import CommitInfo, CommitStats
+from lsimons_bot.blog.publish import BlogClients, PublishResult, check_and_publish
 from lsimons_bot.blog.wordpress import BlogPost
 
+MESSAGES = [
+    "Add home tab",
+    "Fix flaky scheduler test",
+    "Refactor config loading",
+    "Stream answers from the model",
+    "Document the deployment",
+    "Cache GitHub commit stats",
+    "Handle WordPress token expiry",
+    "Split long answers into blocks",
+    "Route simple turns to a fast model",
+    "Bound LLM requests with a deadline",
+]
+
+
+def _stats(count: int, lines: int) -> CommitStats:
+    commits = [
+        CommitInfo(
+            repo_name="test-repo",
+            sha=f"{i:07d}",
+            message=MESSAGES[i],
+            date=datetime.now(UTC) - timedelta(hours=i),
+            additions=lines,
+            deletions=0,
+        )
+        for i in range(count)
+    ]
+    return CommitStats(commits=commits, total_commits=count, max_lines_in_commit=lines)
+
 
 class TestPublishResult:
     def test_dataclass(self) -> None:
@@ -61,7 +89,7 @@ class TestCheckAndPublish:
             date=datetime.now(UTC) - timedelta(hours=72),
             link="https://example.com",
         )
-        stats = CommitStats(commits=[], total_commits=2, max_lines_in_commit=50)
+        stats = _stats(2, 50)
 
         with (
             patch("lsimons_bot.blog.publish.get_env_vars", return_value=mock_env),
@@ -89,7 +117,7 @@ class TestCheckAndPublish:
             date=datetime.now(UTC) - timedelta(hours=72),
             link="https://example.com",
         )
-        stats = CommitStats(commits=[], total_commits=10, max_lines_in_commit=300)
+        stats = _stats(10, 300)
 
         with (
             patch("lsimons_bot.blog.publish.get_env_vars", return_value=mock_env),
@@ -109,3 +137,83 @@ class TestCheckAndPublish:
         assert result.should_publish is True
         assert "Would publish" in result.reason
         assert result.post is None
+
+    @pytest.mark.asyncio
+    async def test_publishes_with_given_clients(self) -> None:
+        old_post = BlogPost(
+            id=1,
+            title="Old",
+            date=datetime.now(UTC) - timedelta(hours=72),
+            link="https://example.com",
+        )
+        new_post = BlogPost(id=2, title="New", date=datetime.now(UTC), link="https://x")
+        stats = _stats(10, 300)
+        mock_wp = MagicMock()
+        mock_wp.get_latest_post.return_value = old_post
+        mock_wp.create_post.return_value = new_post
+        mock_gh = MagicMock()
+        mock_gh.get_commits_since.return_value = stats
+        mock_llm = MagicMock()
+        mock_llm.chat = AsyncMock(return_value="TITLE: New\nCONTENT: <p>Hi</p>")
+        clients = BlogClients(wp=mock_wp, gh=mock_gh, llm=mock_llm)
+
+        with patch("lsimons_bot.blog.publish.get_env_vars") as mock_get_env_vars:
+            result = await check_and_publish(clients=clients)
+
+        mock_get_env_vars.assert_not_called()
+        mock_wp.create_post.assert_called_once_with(title="New", content="<p>Hi</p>")
+        assert result.post is new_post
+
+    @pytest.mark.asyncio
+    async def test_noise_does_not_count_as_activity(self) -> None:
+        old_post = BlogPost(
+            id=1,
+            title="Old",
+            date=datetime.now(UTC) - timedelta(hours=72),
+            link="https://example.com",
+        )
+        commits = [
+            CommitInfo(
+                repo_name="test-repo",
+                sha=f"{i:07d}",
+                message=f"Bump requests from 2.{i}.0 to 2.{i + 1}.0",
+                date=datetime.now(UTC),
+                additions=400,
+                deletions=400,
+            )
+            for i in range(10)
+        ]
+        mock_wp = MagicMock()
+        mock_wp.get_latest_post.return_value = old_post
+        mock_gh = MagicMock()
+        mock_gh.get_commits_since.return_value = CommitStats(
+            commits=commits, total_commits=10, max_lines_in_commit=800
+        )
+        clients = BlogClients(wp=mock_wp, gh=mock_gh, llm=MagicMock())
+
+        result = await check_and_publish(clients=clients)
+
+        assert result.should_publish is False
+        assert "Not enough activity: 1 commits, max 0 lines" in result.reason
+
+    @pytest.mark.asyncio
+    async def test_partial_commit_list_defers(self) -> None:
+        old_post = BlogPost(
+            id=1,
+            title="Old",
+            date=datetime.now(UTC) - timedelta(hours=72),
+            link="https://example.com",
+        )
+        stats = _stats(10, 300)
+        stats.partial = True
+        mock_wp = MagicMock()
+        mock_wp.get_latest_post.return_value = old_post
+        mock_gh = MagicMock()
+        mock_gh.get_commits_since.return_value = stats
+        clients = BlogClients(wp=mock_wp, gh=mock_gh, llm=MagicMock())
+
+        result = await check_and_publish(clients=clients)
+
+        assert result.should_publish is False
+        assert "incomplete" in result.reason
+        mock_wp.create_post.assert_not_called()
@@ -0,0 +1,60 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from lsimons_bot.blog.publish import PublishResult
+from lsimons_bot.blog.scheduler import BlogScheduler
+
+
+class TestBlogScheduler:
+    def test_next_delay_within_jitter(self) -> None:
+        scheduler = BlogScheduler(MagicMock(), interval=100, jitter=0.1)
+        for _ in range(100):
+            assert 90 <= scheduler.next_delay() <= 110
+
+    @pytest.mark.asyncio
+    async def test_run_once_records_result(self) -> None:
+        clients = MagicMock()
+        result = PublishResult(should_publish=False, reason="Not enough activity")
+        scheduler = BlogScheduler(clients, interval=60)
+
+        with patch(
+            "lsimons_bot.blog.scheduler.check_and_publish", new=AsyncMock(return_value=result)
+        ) as mock_check:
+            run = await scheduler.run_once()
+
+        mock_check.assert_awaited_once_with(dry_run=False, clients=clients)
+        assert run is not None
+        assert scheduler.last_run is run
+        assert run.status == "Not enough activity"
+
+    @pytest.mark.asyncio
+    async def test_run_once_records_error(self) -> None:
+        scheduler = BlogScheduler(MagicMock(), interval=60)
+
+        with patch(
+            "lsimons_bot.blog.scheduler.check_and_publish",
+            new=AsyncMock(side_effect=Exception("GitHub down")),
+        ):
+            run = await scheduler.run_once()
+
+        assert run is not None
+        assert run.status == "failed: GitHub down"
+
+    @pytest.mark.asyncio
+    async def test_run_once_skips_overlapping_runs(self) -> None:
+        scheduler = BlogScheduler(MagicMock(), interval=60)
+        release = asyncio.Event()
+
+        async def slow_check(**_: object) -> PublishResult:
+            await release.wait()
+            return PublishResult(should_publish=False, reason="done")
+
+        with patch("lsimons_bot.blog.scheduler.check_and_publish", new=slow_check):
+            first = asyncio.create_task(scheduler.run_once())
+            await asyncio.sleep(0)
+            assert scheduler.running
+            assert await scheduler.run_once() is None
+            release.set()
+            assert await first is not None
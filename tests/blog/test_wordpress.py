@@ -27,7 +27,7 @@ class TestWordPressClient:
             }
         ]
 
-        with patch("lsimons_bot.blog.wordpress.requests.get", return_value=mock_response):
+        with patch.object(client.session, "get", return_value=mock_response):
             result = client.get_latest_post()
 
         assert result is not None
@@ -39,11 +39,30 @@ class TestWordPressClient:
         mock_response = MagicMock()
         mock_response.json.return_value = []
 
-        with patch("lsimons_bot.blog.wordpress.requests.get", return_value=mock_response):
+        with patch.object(client.session, "get", return_value=mock_response):
             result = client.get_latest_post()
 
         assert result is None
 
+    def test_get_recent_posts(self) -> None:
+        client = _make_client()
+        mock_response = MagicMock()
+        mock_response.json.return_value = [
+            {
+                "id": i,
+                "title": {"rendered": f"Post {i}"},
+                "date_gmt": "2024-01-15T10:00:00",
+                "link": f"https://example.com/post-{i}",
+            }
+            for i in (2, 1)
+        ]
+
+        with patch.object(client.session, "get", return_value=mock_response) as mock_get:
+            result = client.get_recent_posts(count=2)
+
+        assert [post.id for post in result] == [2, 1]
+        assert mock_get.call_args.kwargs["params"]["per_page"] == 2
+
     def test_create_post(self) -> None:
         client = _make_client()
         mock_token_response = MagicMock()
@@ -56,13 +75,54 @@ class TestWordPressClient:
             "link": "https://example.com/new-post",
         }
 
-        with patch("lsimons_bot.blog.wordpress.requests.post") as mock_post:
+        with patch.object(client.session, "post") as mock_post:
             mock_post.side_effect = [mock_token_response, mock_post_response]
             result = client.create_post(title="New Post", content="<p>Content</p>")
 
         assert result.id == 2
         assert result.title == "New Post"
 
+    def test_create_draft_post(self) -> None:
+        client = _make_client()
+        client._access_token = "test_token"
+        mock_post_response = MagicMock(status_code=201)
+        mock_post_response.json.return_value = {
+            "id": 4,
+            "title": {"rendered": "Backfilled"},
+            "link": "https://example.com/?p=4",
+        }
+        date = datetime(2025, 1, 8, tzinfo=UTC)
+
+        with patch.object(client.session, "post", return_value=mock_post_response) as mock_post:
+            result = client.create_post(
+                title="Backfilled", content="<p>Content</p>", status="draft", date=date
+            )
+
+        payload = mock_post.call_args.kwargs["json"]
+        assert payload["status"] == "draft"
+        assert payload["date_gmt"] == "2025-01-08T00:00:00"
+        assert result.date == date
+
+    def test_create_post_refreshes_rejected_token(self) -> None:
+        client = _make_client()
+        client._access_token = "expired_token"
+        mock_rejected = MagicMock(status_code=401)
+        mock_token_response = MagicMock()
+        mock_token_response.json.return_value = {"access_token": "fresh_token"}
+        mock_post_response = MagicMock(status_code=201)
+        mock_post_response.json.return_value = {
+            "id": 3,
+            "title": {"rendered": "Retried"},
+            "link": "https://example.com/retried",
+        }
+
+        with patch.object(client.session, "post") as mock_post:
+            mock_post.side_effect = [mock_rejected, mock_token_response, mock_post_response]
+            result = client.create_post(title="Retried", content="<p>Content</p>")
+
+        assert result.id == 3
+        assert mock_post.call_args.kwargs["headers"] == {"Authorization": "Bearer fresh_token"}
+
 
 class TestBlogPost:
     def test_dataclass(self) -> None:
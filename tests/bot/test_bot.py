@@ -0,0 +1,67 @@
+import pytest
+
+from lsimons_bot.bot.bot import CACHE_CONTROL, SYSTEM_CONTENT, Bot, Messages, short_title
+
+
+def _thread() -> Messages:
+    return [
+        {"role": "user", "content": "first question"},
+        {"role": "assistant", "content": "first answer"},
+        {"role": "user", "content": "second question"},
+    ]
+
+
+class TestBuildMessages:
+    def test_prepends_system_prompt(self) -> None:
+        messages = Bot().build_messages(_thread())
+
+        assert messages[0] == {"role": "system", "content": SYSTEM_CONTENT}
+        assert messages[1:] == _thread()
+
+    def test_prompt_caching_marks_stable_prefix(self) -> None:
+        messages = Bot(prompt_caching=True).build_messages(_thread())
+
+        assert messages[0]["content"] == [
+            {"type": "text", "text": SYSTEM_CONTENT, "cache_control": CACHE_CONTROL}
+        ]
+        assert messages[2]["content"] == [
+            {"type": "text", "text": "first answer", "cache_control": CACHE_CONTROL}
+        ]
+        assert messages[1]["content"] == "first question"
+        assert messages[3]["content"] == "second question"
+
+    def test_prompt_caching_single_turn(self) -> None:
+        messages = Bot(prompt_caching=True).build_messages([{"role": "user", "content": "hi"}])
+
+        assert messages[1] == {"role": "user", "content": "hi"}
+
+    def test_context_goes_after_cached_prefix(self) -> None:
+        messages = Bot(prompt_caching=True).build_messages(_thread(), context="notes")
+
+        assert messages[2]["content"] == [
+            {"type": "text", "text": "first answer", "cache_control": CACHE_CONTROL}
+        ]
+        assert messages[3] == {"role": "system", "content": "notes"}
+        assert messages[4]["content"] == "second question"
+
+
+class TestChat:
+    @pytest.mark.asyncio
+    async def test_chat_returns_canned_response(self) -> None:
+        response = await Bot().chat([{"role": "user", "content": "hi"}])
+        assert isinstance(response, str)
+
+
+class TestShortTitle:
+    def test_short_text_is_kept(self) -> None:
+        assert short_title("  What is\nSBP?  ") == "What is SBP?"
+
+    def test_cut_at_a_word(self) -> None:
+        title = short_title("Could you please summarize the quarterly planning document for me", 40)
+
+        assert title == "Could you please summarize the…"
+        assert len(title) <= 40
+
+    @pytest.mark.asyncio
+    async def test_bot_title(self) -> None:
+        assert await Bot().title("hello there") == "hello there"
@@ -0,0 +1,139 @@
+import time
+from unittest.mock import AsyncMock
+
+import pytest
+
+from lsimons_bot.bot.bot import Message
+from lsimons_bot.bot.memory import (
+    SUMMARY_HEADER,
+    MemoryRules,
+    ThreadMemory,
+    summary_prompt,
+)
+
+THREAD = ("C1", "1.0")
+
+
+def _turns(count: int) -> list[Message]:
+    return [
+        {"role": "user" if i % 2 == 0 else "assistant", "content": f"turn {i}"}
+        for i in range(count)
+    ]
+
+
+class TestSummaryPrompt:
+    def test_includes_previous_summary_and_turns(self) -> None:
+        prompt = summary_prompt("earlier", _turns(2))
+
+        content = str(prompt[-1].get("content"))
+        assert "earlier" in content
+        assert "user: turn 0" in content
+        assert "assistant: turn 1" in content
+
+
+class TestThreadMemory:
+    @pytest.mark.asyncio
+    async def test_short_thread_is_sent_as_is(self) -> None:
+        summarize = AsyncMock(return_value="summary")
+        memory = ThreadMemory(summarize, MemoryRules(max_turns=10, keep_recent=4))
+        messages = _turns(10)
+
+        assert memory.compact(THREAD, messages) == messages
+        await memory.wait()
+        summarize.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_summarizes_in_background(self) -> None:
+        summarize = AsyncMock(return_value="summary")
+        memory = ThreadMemory(summarize, MemoryRules(max_turns=10, keep_recent=4))
+        messages = _turns(12)
+
+        # The first request does not wait for the summary
+        assert memory.compact(THREAD, messages) == messages
+        await memory.wait()
+
+        summarize.assert_awaited_once_with("", messages[:8])
+        compacted = memory.compact(THREAD, [*messages, *_turns(1)])
+        assert len(compacted) == 1 + 5
+        assert compacted[0].get("role") == "system"
+        assert str(compacted[0].get("content")).startswith(SUMMARY_HEADER)
+        assert compacted[1:5] == messages[8:]
+
+    @pytest.mark.asyncio
+    async def test_summary_is_extended_incrementally(self) -> None:
+        summarize = AsyncMock(side_effect=["first", "second"])
+        memory = ThreadMemory(summarize, MemoryRules(max_turns=10, keep_recent=4))
+        messages = _turns(30)
+
+        _ = memory.compact(THREAD, messages[:12])
+        await memory.wait()
+        _ = memory.compact(THREAD, messages)
+        await memory.wait()
+
+        summarize.assert_awaited_with("first", messages[8:26])
+        summary = memory.summaries[THREAD]
+        assert summary.text == "second"
+        assert summary.covered == 26
+
+    @pytest.mark.asyncio
+    async def test_edited_history_drops_summary(self) -> None:
+        summarize = AsyncMock(return_value="summary")
+        memory = ThreadMemory(summarize, MemoryRules(max_turns=10, keep_recent=4))
+        messages = _turns(12)
+        _ = memory.compact(THREAD, messages)
+        await memory.wait()
+
+        edited: list[Message] = [{"role": "user", "content": "changed"}, *messages[1:]]
+
+        assert memory.compact(THREAD, edited) == edited
+        assert THREAD not in memory.summaries
+
+    @pytest.mark.asyncio
+    async def test_failed_summary_keeps_full_history(self) -> None:
+        summarize = AsyncMock(side_effect=Exception("boom"))
+        memory = ThreadMemory(summarize, MemoryRules(max_turns=10, keep_recent=4))
+        messages = _turns(12)
+
+        _ = memory.compact(THREAD, messages)
+        await memory.wait()
+
+        assert memory.compact(THREAD, messages) == messages
+
+    @pytest.mark.asyncio
+    async def test_evicts_least_recently_used_threads(self) -> None:
+        summarize = AsyncMock(return_value="summary")
+        memory = ThreadMemory(summarize, MemoryRules(max_turns=2, keep_recent=1, max_threads=2))
+
+        for thread_ts in ("1.0", "2.0", "3.0"):
+            _ = memory.compact(("C1", thread_ts), _turns(4))
+            await memory.wait()
+
+        assert list(memory.summaries) == [("C1", "2.0"), ("C1", "3.0")]
+
+    @pytest.mark.asyncio
+    async def test_snapshot_and_restore(self) -> None:
+        summarize = AsyncMock(return_value="summary")
+        memory = ThreadMemory(summarize, MemoryRules(max_turns=10, keep_recent=4))
+        messages = _turns(12)
+        _ = memory.compact(THREAD, messages)
+        await memory.wait()
+
+        restored = ThreadMemory(summarize, MemoryRules(max_turns=10, keep_recent=4))
+        restored.restore(memory.snapshot(), max_age=3600)
+
+        assert restored.summaries == memory.summaries
+        # The restored summary is used without summarizing again
+        assert len(restored.compact(THREAD, messages)) == 1 + 4
+        summarize.assert_awaited_once()
+
+    def test_restore_skips_stale_summaries(self) -> None:
+        memory = ThreadMemory(AsyncMock(), MemoryRules(max_threads=2))
+        data = [
+            {"channel": "C1", "thread_ts": ts, "text": "s", "covered": 4, "fingerprint": "f"}
+            | {"updated": updated}
+            for ts, updated in [("1.0", time.time()), ("2.0", 0.0), ("3.0", time.time())]
+        ]
+
+        memory.restore(data, max_age=3600)
+
+        assert list(memory.summaries) == [("C1", "3.0")]
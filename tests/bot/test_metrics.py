@@ -0,0 +1,59 @@
+from lsimons_bot.bot.metrics import LatencyStats, LLMMetrics
+from lsimons_bot.llm.client import ChatResult
+
+
+class TestLatencyStats:
+    def test_percentiles(self) -> None:
+        stats = LatencyStats()
+        for i in range(1, 101):
+            stats.record(i / 100)
+
+        assert stats.count == 100
+        assert stats.percentile(50) == 0.5
+        assert stats.percentile(95) == 0.95
+        assert round(stats.mean, 3) == 0.505
+
+    def test_window(self) -> None:
+        stats = LatencyStats(window=2)
+        for value in (10.0, 1.0, 2.0):
+            stats.record(value)
+
+        assert stats.percentile(100) == 2.0
+        assert stats.count == 3
+
+    def test_empty(self) -> None:
+        assert LatencyStats().percentile(95) == 0.0
+
+    def test_snapshot_and_restore(self) -> None:
+        stats = LatencyStats(window=3)
+        for value in (1.0, 2.0, 3.0, 4.0):
+            stats.record(value)
+
+        restored = LatencyStats(window=3)
+        restored.restore(stats.snapshot())
+
+        assert restored.count == 4
+        assert restored.mean == 2.5
+        assert restored.percentile(100) == 4.0
+        assert restored.percentile(0) == 2.0
+
+
+class TestLLMMetrics:
+    def test_record_splits_ttft_by_cache_hit(self) -> None:
+        metrics = LLMMetrics()
+        metrics.record(
+            ChatResult(
+                content="a", model="m", prompt_tokens=100, cached_tokens=0, time_to_first_token=1.0
+            )
+        )
+        metrics.record(
+            ChatResult(
+                content="b", model="m", prompt_tokens=100, cached_tokens=90, time_to_first_token=0.3
+            )
+        )
+
+        assert metrics.requests == 2
+        assert metrics.cache_hit_ratio == 0.45
+        assert metrics.ttft_cached.percentile(50) == 0.3
+        assert metrics.ttft_uncached.percentile(50) == 1.0
+        assert "45% cached" in metrics.summary()
@@ -0,0 +1,66 @@
+from lsimons_bot.bot.bot import Messages
+from lsimons_bot.bot.router import ModelRouter, RoutingRules, estimate_tokens
+
+
+def _router() -> ModelRouter:
+    return ModelRouter("primary-model", RoutingRules(fast_model="fast-model"))
+
+
+class TestEstimateTokens:
+    def test_estimate_tokens(self) -> None:
+        assert estimate_tokens([{"role": "user", "content": "a" * 400}]) == 101
+
+
+class TestModelRouter:
+    def test_without_fast_model_always_primary(self) -> None:
+        router = ModelRouter("primary-model")
+        route = router.route([{"role": "user", "content": "hi"}])
+        assert route.model == "primary-model"
+
+    def test_short_greeting_goes_fast(self) -> None:
+        route = _router().route(
+            [{"role": "system", "content": "x" * 5000}, {"role": "user", "content": "hi there!"}]
+        )
+        assert route.name == "fast"
+        assert route.model == "fast-model"
+
+    def test_complex_request_goes_primary(self) -> None:
+        route = _router().route([{"role": "user", "content": "Explain how DNS works"}])
+        assert route.name == "primary"
+        assert route.reason == "complex request"
+
+    def test_long_context_goes_primary(self) -> None:
+        messages: Messages = [
+            {"role": "user", "content": "a" * 1500},
+            {"role": "assistant", "content": "b" * 1500},
+            {"role": "user", "content": "thanks"},
+        ]
+        route = _router().route(messages)
+        assert route.reason == "long context"
+
+    def test_long_thread_goes_primary(self) -> None:
+        messages: Messages = [{"role": "user", "content": "ok"}] * 7
+        assert _router().route(messages).reason == "long thread"
+
+    def test_record_per_route_stats(self) -> None:
+        router = _router()
+        fast = router.route([{"role": "user", "content": "hi"}])
+        router.record(fast, 0.5, time_to_first_token=0.1, prompt_tokens=20)
+        router.record(router.primary, 2.0)
+
+        assert router.stats["fast"].latency.count == 1
+        assert router.stats["fast"].prompt_tokens == 20
+        assert router.stats["primary"].latency.mean == 2.0
+        assert "fast: latency n=1" in router.summary()
+
+    def test_snapshot_and_restore(self) -> None:
+        router = _router()
+        fast = router.route([{"role": "user", "content": "hi"}])
+        router.record(fast, 0.5, time_to_first_token=0.1, prompt_tokens=20)
+
+        restored = _router()
+        restored.restore(router.snapshot())
+
+        assert restored.stats["fast"].latency.mean == 0.5
+        assert restored.stats["fast"].time_to_first_token.count == 1
+        assert restored.stats["fast"].prompt_tokens == 20
@@ -0,0 +1,79 @@
+from collections.abc import AsyncIterator
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from lsimons_bot.llm.client import LLMClient, supports_cache_control
+from lsimons_bot.tracing.trace import span
+
+
+def _chunk(content: str | None = None, usage: object | None = None) -> SimpleNamespace:
+    choices = [] if content is None else [SimpleNamespace(delta=SimpleNamespace(content=content))]
+    return SimpleNamespace(choices=choices, usage=usage)
+
+
+async def _stream(*chunks: SimpleNamespace) -> AsyncIterator[SimpleNamespace]:
+    for chunk in chunks:
+        yield chunk
+
+
+class TestSupportsCacheControl:
+    def test_models(self) -> None:
+        assert supports_cache_control("anthropic/claude-sonnet-4") is True
+        assert supports_cache_control("bedrock/us.anthropic.claude-haiku") is True
+        assert supports_cache_control("azure/gpt-5-mini") is False
+
+
+class TestLLMClient:
+    @pytest.mark.asyncio
+    async def test_chat_completion_streams_and_reports_usage(self) -> None:
+        usage = SimpleNamespace(
+            prompt_tokens=1200,
+            completion_tokens=20,
+            prompt_tokens_details=SimpleNamespace(cached_tokens=1024),
+            cache_creation_input_tokens=None,
+        )
+        client = LLMClient(base_url="http://localhost:8000", api_key="key", model="test/model")
+        create = AsyncMock(
+            return_value=_stream(_chunk("Hello"), _chunk(", world"), _chunk(usage=usage))
+        )
+        client.client = MagicMock()
+        client.client.chat.completions.create = create
+
+        result = await client.chat_completion([{"role": "user", "content": "hi"}])
+
+        assert result.content == "Hello, world"
+        assert result.model == "test/model"
+        assert result.prompt_tokens == 1200
+        assert result.cached_tokens == 1024
+        assert result.cache_write_tokens == 0
+        assert result.time_to_first_token is not None
+        assert create.call_args.kwargs["stream"] is True
+
+    @pytest.mark.asyncio
+    async def test_chat_completion_model_override(self) -> None:
+        client = LLMClient(base_url="http://localhost:8000", api_key="key", model="test/model")
+        create = AsyncMock(return_value=_stream(_chunk("ok")))
+        client.client = MagicMock()
+        client.client.chat.completions.create = create
+
+        result = await client.chat_completion([{"role": "user", "content": "hi"}], model="fast")
+
+        assert result.model == "fast"
+        assert result.prompt_tokens == 0
+        assert create.call_args.kwargs["model"] == "fast"
+
+    @pytest.mark.asyncio
+    async def test_chat_completion_propagates_trace(self) -> None:
+        client = LLMClient(base_url="http://localhost:8000", api_key="key", model="test/model")
+        create = AsyncMock(return_value=_stream(_chunk("ok")))
+        client.client = MagicMock()
+        client.client.chat.completions.create = create
+
+        with span("request") as request:
+            _ = await client.chat_completion([{"role": "user", "content": "hi"}])
+
+        traceparent = create.call_args.kwargs["extra_headers"]["traceparent"]
+        assert traceparent.startswith(f"00-{request.trace_id}-")
+        assert request.span_id not in traceparent
@@ -0,0 +1,152 @@
+import asyncio
+from collections.abc import Callable
+from unittest.mock import MagicMock
+
+import pytest
+
+from lsimons_bot.llm.client import ChatResult
+from lsimons_bot.llm.resilience import (
+    MIN_HEDGE_SAMPLES,
+    CircuitBreaker,
+    CircuitOpenError,
+    ResilienceConfig,
+    ResilientLLM,
+)
+
+
+class FakeLLM:
+    """Per-model (delay before first token, error) behaviour."""
+
+    def __init__(self, behaviour: dict[str, tuple[float, Exception | None]]) -> None:
+        self.model: str = "primary"
+        self.behaviour: dict[str, tuple[float, Exception | None]] = behaviour
+        self.calls: list[str] = []
+        self.cancelled: list[str] = []
+
+    async def chat_completion(
+        self,
+        messages: object,
+        model: str | None = None,
+        on_first_token: Callable[[], None] | None = None,
+    ) -> ChatResult:
+        model = model or self.model
+        self.calls.append(model)
+        delay, error = self.behaviour[model]
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled.append(model)
+            raise
+        if error is not None:
+            raise error
+        if on_first_token is not None:
+            on_first_token()
+        return ChatResult(content=f"from {model}", model=model, time_to_first_token=delay)
+
+
+def _resilient(fake: FakeLLM, **kwargs: object) -> ResilientLLM:
+    config = ResilienceConfig(fallback_model="fallback", default_hedge_delay=0.05)
+    for key, value in kwargs.items():
+        setattr(config, key, value)
+    return ResilientLLM(fake, config)
+
+
+class TestCircuitBreaker:
+    def test_opens_after_threshold_and_half_opens(self) -> None:
+        now = [0.0]
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=lambda: now[0])
+
+        breaker.record_failure()
+        assert breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == "open"
+        assert not breaker.allow()
+
+        now[0] = 10.0
+        assert breaker.state == "half-open"
+        breaker.record_failure()
+        assert breaker.state == "open"
+
+        now[0] = 20.0
+        breaker.record_success()
+        assert breaker.state == "closed"
+
+
+class TestResilientLLM:
+    @pytest.mark.asyncio
+    async def test_fast_primary_does_not_hedge(self) -> None:
+        fake = FakeLLM({"primary": (0.0, None), "fallback": (0.0, None)})
+
+        result = await _resilient(fake).chat_completion([])
+
+        assert result.model == "primary"
+        assert fake.calls == ["primary"]
+
+    @pytest.mark.asyncio
+    async def test_slow_primary_hedges_and_cancels_loser(self) -> None:
+        fake = FakeLLM({"primary": (1.0, None), "fallback": (0.0, None)})
+
+        result = await _resilient(fake).chat_completion([])
+
+        assert result.model == "fallback"
+        assert fake.calls == ["primary", "fallback"]
+        await asyncio.sleep(0)
+        assert fake.cancelled == ["primary"]
+
+    @pytest.mark.asyncio
+    async def test_failing_primary_falls_back(self) -> None:
+        fake = FakeLLM({"primary": (0.0, RuntimeError("boom")), "fallback": (0.0, None)})
+        resilient = _resilient(fake)
+
+        result = await resilient.chat_completion([])
+
+        assert result.model == "fallback"
+        assert resilient.breaker("primary").failures == 1
+
+    @pytest.mark.asyncio
+    async def test_budget_exceeded(self) -> None:
+        fake = FakeLLM({"primary": (1.0, None), "fallback": (1.0, None)})
+        resilient = _resilient(fake, budget=0.1)
+
+        with pytest.raises(TimeoutError):
+            _ = await resilient.chat_completion([])
+
+        assert resilient.breaker("primary").failures == 1
+        assert resilient.breaker("fallback").failures == 1
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_skips_model(self) -> None:
+        fake = FakeLLM({"primary": (0.0, None), "fallback": (0.0, None)})
+        resilient = _resilient(fake)
+        resilient.breaker("primary").opened_at = float("inf")
+
+        result = await resilient.chat_completion([])
+
+        assert result.model == "fallback"
+
+    @pytest.mark.asyncio
+    async def test_all_circuits_open(self) -> None:
+        resilient = ResilientLLM(MagicMock(model="primary"))
+        resilient.breaker("primary").opened_at = float("inf")
+
+        with pytest.raises(CircuitOpenError):
+            _ = await resilient.chat_completion([])
+
+    def test_hedge_delay_uses_p95_once_warm(self) -> None:
+        resilient = _resilient(FakeLLM({}), min_hedge_delay=0.5)
+        assert resilient.hedge_delay("primary") == 0.05
+
+        for _ in range(MIN_HEDGE_SAMPLES):
+            resilient._record_ttft("primary", 2.0)
+
+        assert resilient.hedge_delay("primary") == 2.0
+
+    def test_restored_ttft_sets_hedge_delay(self) -> None:
+        resilient = _resilient(FakeLLM({}), min_hedge_delay=0.5)
+        for _ in range(MIN_HEDGE_SAMPLES):
+            resilient._record_ttft("primary", 2.0)
+
+        restored = _resilient(FakeLLM({}), min_hedge_delay=0.5)
+        restored.restore(resilient.snapshot())
+
+        assert restored.hedge_delay("primary") == 2.0
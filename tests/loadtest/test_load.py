@@ -0,0 +1,105 @@
+import asyncio
+from collections.abc import AsyncIterator
+
+import pytest
+from slack_bolt.adapter.socket_mode.async_handler import AsyncSocketModeHandler
+from slack_bolt.async_app import AsyncApp
+
+from lsimons_bot.app.main import make_slack_client
+from lsimons_bot.bot.bot import Bot
+from lsimons_bot.loadtest.fake_slack import Delivery, FakeSlack
+from lsimons_bot.loadtest.load import LoadConfig, LoadReport, run_load
+from lsimons_bot.slack import assistant
+from lsimons_bot.slack.work_queue import WorkQueue
+
+
+@pytest.fixture
+async def slack() -> AsyncIterator[FakeSlack]:
+    fake = FakeSlack(ack_timeout=0.5, max_retries=1)
+    await fake.start()
+    yield fake
+    await fake.stop()
+
+
+async def _connect_bot(
+    slack: FakeSlack, work_queue: WorkQueue | None = None
+) -> AsyncSocketModeHandler:
+    client = make_slack_client("xoxb-fake", {"SLACK_API_URL": slack.api_url})
+    app = AsyncApp(client=client, ignoring_self_assistant_message_events_enabled=False)
+    assistant.register(app, Bot(), work_queue=work_queue)
+    handler = AsyncSocketModeHandler(app, "xapp-fake")
+    await handler.connect_async()
+    await asyncio.wait_for(slack.connected.wait(), 5)
+    return handler
+
+
+class TestLoadReport:
+    def test_counts_dropped_and_duplicated_events(self) -> None:
+        acked = Delivery("env-1", sent_at=1.0, acked_at=1.25, acks=1)
+        duplicated = Delivery("env-2", sent_at=1.0, acked_at=1.5, acks=2)
+        dropped = Delivery("env-3", sent_at=1.0)
+        report = LoadReport()
+
+        report.record_deliveries([acked, duplicated, dropped])
+
+        assert (report.events, report.dropped, report.duplicated) == (3, 1, 1)
+        assert report.ack_latency.count == 2
+        assert "dropped 1, duplicated 1" in report.summary()
+
+
+class TestFakeSlack:
+    @pytest.mark.asyncio
+    async def test_unacknowledged_event_is_redelivered_then_dropped(self, slack: FakeSlack) -> None:
+        slack.connected.set()
+        slack.ack_timeout = 0.01
+        sent: list[object] = []
+
+        class Socket:
+            async def send_json(self, data: object) -> None:
+                sent.append(data)
+
+            async def close(self) -> None:
+                pass
+
+        slack._sockets.append(Socket())  # pyright: ignore[reportPrivateUsage, reportArgumentType]
+        delivery = await slack.send_event({"type": "message"})
+        await asyncio.sleep(0.1)
+
+        assert len(sent) == 2
+        assert delivery.acked_at is None
+
+
+class TestRunLoad:
+    @pytest.mark.asyncio
+    async def test_replays_threads_against_the_bot(self, slack: FakeSlack) -> None:
+        handler = await _connect_bot(slack)
+        try:
+            report = await run_load(slack, LoadConfig(threads=3, rate=50, turns=2, timeout=10))
+        finally:
+            await handler.close_async()
+
+        assert report.messages == 6
+        assert report.unanswered == 0
+        assert report.response_latency.count == 6
+        assert report.events == 9
+        assert report.dropped == 0
+        assert slack.calls["auth.test"] >= 1
+        assert slack.calls["chat.postMessage"] == 9
+
+    @pytest.mark.asyncio
+    async def test_replays_threads_through_the_work_queue(self, slack: FakeSlack) -> None:
+        work_queue = WorkQueue(workers=2)
+        workers = asyncio.create_task(work_queue.run())
+        handler = await _connect_bot(slack, work_queue)
+        try:
+            report = await run_load(slack, LoadConfig(threads=3, rate=50, turns=2, timeout=10))
+        finally:
+            await handler.close_async()
+            _ = workers.cancel()
+
+        assert report.unanswered == 0
+        assert report.dropped == 0
+        assert slack.calls["chat.postMessage"] == 9
+        # Thread greetings and both turns of each thread
+        assert work_queue.stats.completed == 9
+        assert work_queue.stats.failed == 0
@@ -0,0 +1,16 @@
+from pathlib import Path
+
+from lsimons_bot.retrieval.bench import run_benchmark, sample_queries, synthetic_documents
+
+
+class TestBenchmark:
+    def test_run_benchmark(self, tmp_path: Path) -> None:
+        chunks = list(synthetic_documents(20))
+        queries = sample_queries(chunks, 10)
+
+        report = run_benchmark(chunks, queries, tmp_path / "index.bin", top_k=3)
+
+        assert len(queries) == 10
+        assert report.chunks == len(chunks)
+        assert report.query.count == 10
+        assert "10 queries" in report.summary()
@@ -0,0 +1,161 @@
+from pathlib import Path
+
+import pytest
+
+from lsimons_bot.retrieval.index import (
+    HEADER,
+    Chunk,
+    IndexFormatError,
+    RetrievalIndex,
+    build_index,
+    chunk_document,
+    encode_index,
+    tokenize,
+)
+
+CHUNKS = [
+    Chunk("leo.md > About", "Leo Simons is an engineer at Schuberg Philis."),
+    Chunk("leo.md > Hobbies", "Leo likes cycling, and cycling, and more cycling."),
+    Chunk("sbp.md", "Schuberg Philis runs mission-critical IT for its customers."),
+    Chunk("other.md", "Nothing relevant here at all."),
+]
+
+
+def _index() -> RetrievalIndex:
+    return RetrievalIndex(encode_index(CHUNKS))
+
+
+class TestTokenize:
+    def test_lowercases_and_drops_stopwords(self) -> None:
+        assert tokenize("The Bot is at Schuberg-Philis, a 2024 x") == [
+            "bot",
+            "schuberg",
+            "philis",
+            "2024",
+        ]
+
+
+class TestChunkDocument:
+    def test_packs_paragraphs_under_their_heading(self) -> None:
+        text = "# Intro\n\none\n\ntwo\n\n## Details\n\nthree"
+
+        chunks = chunk_document("doc.md", text)
+
+        assert chunks == [
+            Chunk("doc.md > Intro", "# Intro\n\none\n\ntwo"),
+            Chunk("doc.md > Details", "## Details\n\nthree"),
+        ]
+
+    def test_splits_at_max_chars(self) -> None:
+        text = "\n\n".join(["word " * 10] * 3)
+
+        chunks = chunk_document("doc.md", text, max_chars=60)
+
+        assert len(chunks) == 3
+        assert all(len(chunk.text) <= 60 for chunk in chunks)
+
+    def test_cuts_long_paragraphs(self) -> None:
+        chunks = chunk_document("doc.md", "word " * 50, max_chars=40)
+
+        assert all(len(chunk.text) <= 40 for chunk in chunks)
+        assert " ".join(chunk.text for chunk in chunks).split() == ["word"] * 50
+
+    def test_comments_in_code_blocks_are_not_headings(self) -> None:
+        text = "# Usage\n\n```bash\n# run it\nrun\n\n# again\nrun\n```"
+
+        chunks = chunk_document("doc.md", text)
+
+        assert {chunk.source for chunk in chunks} == {"doc.md > Usage"}
+
+
+class TestRetrievalIndex:
+    def test_search_ranks_by_bm25(self) -> None:
+        hits = _index().search("what does Leo do at Schuberg Philis?", count=2)
+
+        assert [hit.source for hit in hits] == ["leo.md > About", "sbp.md"]
+        assert hits[0].score > hits[1].score
+        assert hits[0].text == CHUNKS[0].text
+
+    def test_term_frequency_counts(self) -> None:
+        hits = _index().search("cycling")
+
+        assert [hit.source for hit in hits] == ["leo.md > Hobbies"]
+
+    def test_no_match(self) -> None:
+        assert _index().search("kubernetes") == []
+        assert _index().search("") == []
+
+    def test_max_postings(self) -> None:
+        hits = _index().search("leo", max_postings=1)
+
+        assert len(hits) == 1
+
+    def test_counts(self) -> None:
+        index = _index()
+
+        assert index.chunks == 4
+        assert index.chunk(2) == ("sbp.md", CHUNKS[2].text)
+
+    def test_empty_index(self) -> None:
+        index = RetrievalIndex(encode_index([]))
+
+        assert index.search("anything") == []
+
+    def test_rejects_other_files(self) -> None:
+        with pytest.raises(IndexFormatError):
+            _ = RetrievalIndex(b"not an index" * 10)
+        with pytest.raises(IndexFormatError):
+            _ = RetrievalIndex(b"short")
+
+    def test_rejects_other_versions(self) -> None:
+        data = bytearray(encode_index(CHUNKS))
+        magic, _, *rest = HEADER.unpack_from(data)
+        HEADER.pack_into(data, 0, magic, 99, *rest)
+
+        with pytest.raises(IndexFormatError, match="rebuild"):
+            _ = RetrievalIndex(bytes(data))
+
+    def test_rejects_truncated_index(self) -> None:
+        data = encode_index(CHUNKS)
+
+        for size in range(HEADER.size, len(data)):
+            with pytest.raises(IndexFormatError, match="truncated"):
+                _ = RetrievalIndex(data[:size])
+
+    def test_rejects_offsets_outside_the_file(self) -> None:
+        data = bytearray(encode_index(CHUNKS))
+        *fields, _ = HEADER.unpack_from(data)
+        HEADER.pack_into(data, 0, *fields, len(data) + 8)
+
+        with pytest.raises(IndexFormatError):
+            _ = RetrievalIndex(bytes(data))
+
+
+class TestBuildIndex:
+    def test_build_and_open(self, tmp_path: Path) -> None:
+        docs = tmp_path / "docs"
+        (docs / "team").mkdir(parents=True)
+        _ = (docs / "leo.md").write_text("# About\n\nLeo Simons works at Schuberg Philis.")
+        _ = (docs / "team" / "notes.txt").write_text("The team meets on Mondays.")
+        _ = (docs / "image.png").write_bytes(b"\x89PNG")
+        path = tmp_path / "index" / "index.bin"
+
+        assert build_index(docs, path) == 2
+
+        index = RetrievalIndex.open(path)
+        assert [hit.source for hit in index.search("team mondays")] == ["team/notes.txt"]
+        index.close()
+
+    def test_open_empty_file(self, tmp_path: Path) -> None:
+        path = tmp_path / "index.bin"
+        _ = path.write_bytes(b"")
+
+        with pytest.raises(IndexFormatError):
+            _ = RetrievalIndex.open(path)
+
+    def test_open_truncated_file(self, tmp_path: Path) -> None:
+        path = tmp_path / "index.bin"
+        _ = path.write_bytes(encode_index(CHUNKS)[:120])
+
+        with pytest.raises(IndexFormatError):
+            _ = RetrievalIndex.open(path)
@@ -0,0 +1,35 @@
+from lsimons_bot.retrieval.index import Chunk, RetrievalIndex, encode_index
+from lsimons_bot.retrieval.retriever import CONTEXT_HEADER, Retriever
+
+
+def _retriever(max_tokens: int = 1000) -> Retriever:
+    index = RetrievalIndex(
+        encode_index(
+            [
+                Chunk("leo.md", "Leo Simons is an engineer at Schuberg Philis. " * 20),
+                Chunk("sbp.md", "Schuberg Philis is based in Schiphol-Rijk."),
+            ]
+        )
+    )
+    return Retriever(index, top_k=5, max_tokens=max_tokens)
+
+
+class TestRetriever:
+    def test_context_lists_sources(self) -> None:
+        context = _retriever().context("Where is Schuberg Philis?")
+
+        assert context is not None
+        assert context.startswith(CONTEXT_HEADER)
+        assert "[sbp.md]\nSchuberg Philis is based in Schiphol-Rijk." in context
+        assert "[leo.md]" in context
+
+    def test_context_fits_the_budget(self) -> None:
+        context = _retriever(max_tokens=50).context("Leo Simons at Schuberg Philis")
+
+        assert context is not None
+        assert len(context) <= 50 * 4
+        assert "[leo.md]" not in context
+        assert "[sbp.md]" in context
+
+    def test_nothing_found(self) -> None:
+        assert _retriever().context("kubernetes") is None
@@ -1,3 +1,6 @@
+import asyncio
+import sqlite3
+from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -6,6 +9,9 @@ from lsimons_bot.slack.assistant.assistant_message import (
     assistant_message_handler_maker,
     read_thread,
 )
+from lsimons_bot.slack.assistant.thread_titles import ThreadTitler
+from lsimons_bot.slack.users import UserDirectory
+from lsimons_bot.slack.work_log import STATE_DONE, WorkLog
 
 
 class TestReadThread:
@@ -27,10 +33,42 @@ class TestReadThread:
         assert messages[0]["role"] == "user"
         assert messages[1]["role"] == "assistant"
 
+    @pytest.mark.asyncio
+    async def test_read_thread_names_speakers_and_mentions(self) -> None:
+        mock_client = MagicMock()
+        mock_response = {
+            "messages": [
+                {"text": "what do you think, <@U2>?", "user": "U1"},
+                {"text": "ask <@U3>", "user": "U2"},
+                {"text": "bot response <@U1>", "bot_id": "B123"},
+                {"text": "hi", "user": "U9"},
+            ]
+        }
+        mock_client.conversations_replies = AsyncMock(return_value=mock_response)
+        users = UserDirectory()
+        users.names.update({"U1": "ann", "U2": "bob"})
+
+        messages = await read_thread(mock_client, "C123", "1234567890.123456", users)
+
+        assert [m.get("content") for m in messages] == [
+            "ann: what do you think, <@U2> (bob)?",
+            "bob: ask <@U3>",
+            "bot response <@U1> (ann)",
+            "hi",
+        ]
+
 
 class TestAssistantMessage:
     async def _call_assistant_message(
-        self, channel_id: str | None, thread_ts: str | None, mock_client: MagicMock
+        self,
+        channel_id: str | None,
+        thread_ts: str | None,
+        mock_client: MagicMock,
+        say: AsyncMock | None = None,
+        response: str = "Bot response",
+        work_log: WorkLog | None = None,
+        set_title: AsyncMock | None = None,
+        titler: ThreadTitler | None = None,
     ) -> None:
         mock_context = MagicMock()
         mock_context.channel_id = channel_id
@@ -38,17 +76,19 @@ class TestAssistantMessage:
 
         mock_bot = MagicMock()
         mock_bot.loading_messages.return_value = ["Loading..."]
-        mock_bot.chat = AsyncMock(return_value="Bot response")
+        mock_bot.chat = AsyncMock(return_value=response)
 
-        assistant_message = assistant_message_handler_maker(mock_bot)
+        assistant_message = assistant_message_handler_maker(
+            mock_bot, work_log=work_log, titler=titler
+        )
 
         with patch("lsimons_bot.slack.assistant.assistant_message.sleep", new=AsyncMock()):
             await assistant_message(
                 mock_context,
-                {"text": "hello"},
-                AsyncMock(),
-                AsyncMock(),
+                {"text": "hello", "ts": "1234567890.999999"},
+                say or AsyncMock(),
                 AsyncMock(),
+                set_title or AsyncMock(),
                 mock_client,
             )
 
@@ -71,3 +111,84 @@ class TestAssistantMessage:
         mock_client.conversations_replies = AsyncMock(side_effect=Exception("API error"))
 
         await self._call_assistant_message("C123", "1234567890.123456", mock_client)
+
+    @pytest.mark.asyncio
+    async def test_assistant_message_posts_converted_chunks(self) -> None:
+        say = AsyncMock()
+
+        await self._call_assistant_message(
+            None, None, MagicMock(), say=say, response="**Hi**\n\n" + "word " * 3000
+        )
+
+        assert say.await_count == 2
+        first = say.await_args_list[0].kwargs
+        assert first["text"].startswith("*Hi*")
+        assert first["blocks"][0]["type"] == "section"
+
+    @pytest.mark.asyncio
+    async def test_assistant_message_records_the_request(self, tmp_path: Path) -> None:
+        mock_client = MagicMock()
+        mock_client.conversations_replies = AsyncMock(
+            return_value={"messages": [{"text": "hello"}]}
+        )
+        work_log = WorkLog(tmp_path / "work.sqlite3")
+
+        await self._call_assistant_message(
+            "C123", "1234567890.123456", mock_client, work_log=work_log
+        )
+        await work_log.flush()
+
+        assert work_log.unfinished() == []
+        with sqlite3.connect(work_log.path) as db:
+            rows = db.execute("SELECT id, text, state FROM requests").fetchall()
+        assert rows == [("C123:1234567890.999999", "hello", STATE_DONE)]
+
+    @pytest.mark.asyncio
+    async def test_assistant_message_does_not_wait_for_the_title(self) -> None:
+        mock_client = MagicMock()
+        mock_client.conversations_replies = AsyncMock(
+            return_value={"messages": [{"text": "hello"}]}
+        )
+        say = AsyncMock()
+        set_title = AsyncMock()
+        titled = asyncio.Event()
+        title_bot = MagicMock()
+
+        async def slow_title(text: str) -> str:
+            await titled.wait()
+            return "Greeting"
+
+        title_bot.title = slow_title
+        titler = ThreadTitler(title_bot)
+
+        await self._call_assistant_message(
+            "C123", "1234567890.123456", mock_client, say=say, set_title=set_title, titler=titler
+        )
+
+        say.assert_awaited()
+        set_title.assert_not_awaited()
+        titled.set()
+        await titler.wait()
+        set_title.assert_awaited_once_with("Greeting")
+
+    @pytest.mark.asyncio
+    async def test_assistant_message_titles_only_the_first_turn(self) -> None:
+        mock_client = MagicMock()
+        mock_client.conversations_replies = AsyncMock(
+            return_value={
+                "messages": [
+                    {"text": "first question"},
+                    {"text": "an answer", "bot_id": "B123"},
+                    {"text": "hello"},
+                ]
+            }
+        )
+        set_title = AsyncMock()
+        titler = ThreadTitler(MagicMock())
+
+        await self._call_assistant_message(
+            "C123", "1234567890.123456", mock_client, set_title=set_title, titler=titler
+        )
+        await titler.wait()
+
+        set_title.assert_not_awaited()
@@ -1,6 +1,9 @@
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
 
 from lsimons_bot.slack.assistant import register
+from lsimons_bot.slack.work_queue import WorkQueue
 
 
 class TestRegister:
@@ -24,7 +27,7 @@ class TestRegister:
                     register(mock_app, mock_bot)
 
                     # Verify the factory was called with the bot instance
-                    mock_factory.assert_called_once_with(mock_bot)
+                    mock_factory.assert_called_once_with(mock_bot, None, None, None)
 
                     # Verify assistant methods were called properly
                     mock_assistant.thread_started.assert_called_once_with(mock_thread_started)
@@ -32,3 +35,23 @@ class TestRegister:
 
                     # Verify the assistant was registered with the app
                     mock_app.use.assert_called_once_with(mock_assistant)
+
+    @pytest.mark.asyncio
+    async def test_register_with_work_queue(self) -> None:
+        mock_app = MagicMock()
+        work_queue = WorkQueue(workers=0, max_pending=0, submit_timeout=0)
+
+        with patch("lsimons_bot.slack.assistant.AsyncAssistant") as mock_assistant_class:
+            mock_assistant = MagicMock()
+            mock_assistant_class.return_value = mock_assistant
+
+            register(mock_app, MagicMock(), work_queue=work_queue)
+
+        user_message = mock_assistant.user_message.call_args.args[0]
+        assert user_message.__name__ == "assistant_message"
+        args = MagicMock()
+        args.say = AsyncMock()
+        # The queue is full, so the user is told to come back later
+        await user_message(args)
+        args.say.assert_awaited_once()
+        assert "too many conversations" in args.say.call_args.args[0]
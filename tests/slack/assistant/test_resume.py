@@ -0,0 +1,103 @@
+import time
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from lsimons_bot.slack.assistant.resume import RESTART_MESSAGE, resume_request, resume_requests
+from lsimons_bot.slack.work_log import LoggedRequest, WorkLog
+from lsimons_bot.slack.work_queue import WorkQueue
+
+
+def _request(attempts: int = 0, age: float = 60) -> LoggedRequest:
+    return LoggedRequest("D1", "1.0", "2.0", "hello", attempts=attempts, created=time.time() - age)
+
+
+def _client(replies: list[dict[str, str]]) -> MagicMock:
+    client = MagicMock()
+    client.conversations_replies = AsyncMock(return_value={"messages": replies})
+    client.chat_postMessage = AsyncMock()
+    client.assistant_threads_setStatus = AsyncMock()
+    return client
+
+
+def _bot() -> MagicMock:
+    bot = MagicMock()
+    bot.chat = AsyncMock(return_value="Hi there")
+    return bot
+
+
+class TestResumeRequest:
+    @pytest.mark.asyncio
+    async def test_answers_the_thread(self) -> None:
+        client, bot, work_log = _client([{"text": "hello"}]), _bot(), MagicMock()
+        request = _request()
+
+        await resume_request(client, bot, work_log, request)
+
+        bot.chat.assert_awaited_once_with(
+            [{"role": "user", "content": "hello"}], thread=("D1", "1.0")
+        )
+        assert client.chat_postMessage.call_args.kwargs["thread_ts"] == "1.0"
+        assert client.chat_postMessage.call_args.kwargs["text"] == "Hi there"
+        work_log.retry.assert_called_once_with(request)
+        work_log.track.assert_called_once_with(request)
+
+    @pytest.mark.asyncio
+    async def test_skips_a_thread_already_answered(self) -> None:
+        client, bot = _client([{"text": "hello"}, {"text": "Hi", "bot_id": "B1"}]), _bot()
+
+        await resume_request(client, bot, MagicMock(), _request())
+
+        bot.chat.assert_not_awaited()
+        client.chat_postMessage.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_apologises_for_old_requests(self) -> None:
+        client, bot, work_log = _client([]), _bot(), MagicMock()
+        request = _request(age=3600)
+
+        await resume_request(client, bot, work_log, request)
+
+        bot.chat.assert_not_awaited()
+        client.chat_postMessage.assert_awaited_once_with(
+            channel="D1", thread_ts="1.0", text=RESTART_MESSAGE
+        )
+        work_log.fail.assert_called_once_with(request)
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_repeated_restarts(self, tmp_path: Path) -> None:
+        client, bot = _client([{"text": "hello"}]), _bot()
+        work_log = WorkLog(tmp_path / "work.sqlite3")
+        work_log.accept(_request())
+        await work_log.flush()
+
+        # The first restart resumes it; cut off again, the second gives up
+        await resume_request(client, bot, work_log, work_log.unfinished()[0])
+        await resume_request(client, bot, work_log, _request(attempts=1))
+        await work_log.flush()
+
+        assert bot.chat.await_count == 1
+        assert client.chat_postMessage.call_args.kwargs["text"] == RESTART_MESSAGE
+
+
+class TestResumeRequests:
+    @pytest.mark.asyncio
+    async def test_without_work_queue(self) -> None:
+        client, bot, work_log = _client([{"text": "hello"}]), _bot(), MagicMock()
+        work_log.unfinished.return_value = [_request(), _request()]
+        client.chat_postMessage.side_effect = [Exception("channel_not_found"), None]
+
+        await resume_requests(client, bot, work_log)
+
+        assert bot.chat.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_through_work_queue(self) -> None:
+        work_log = MagicMock()
+        work_log.unfinished.return_value = [_request()]
+        work_queue = WorkQueue(workers=0)
+
+        await resume_requests(_client([]), _bot(), work_log, work_queue)
+
+        assert work_queue.depth == 1
@@ -0,0 +1,83 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from lsimons_bot.bot.bot import Bot
+from lsimons_bot.slack.assistant.thread_titles import ThreadTitler
+
+THREAD = ("C1", "1.0")
+
+
+class TestThreadTitler:
+    @pytest.mark.asyncio
+    async def test_titles_a_thread_once(self) -> None:
+        set_title = AsyncMock()
+        titler = ThreadTitler(Bot())
+
+        titler.start(THREAD, "hello there", set_title)
+        titler.start(THREAD, "second message", set_title)
+        await titler.wait()
+        titler.start(THREAD, "third message", set_title)
+        await titler.wait()
+
+        set_title.assert_awaited_once_with("hello there")
+        assert titler.titles == {THREAD: "hello there"}
+
+    @pytest.mark.asyncio
+    async def test_long_messages_are_summarized(self) -> None:
+        bot = MagicMock()
+        bot.title = AsyncMock(return_value="Planning the offsite")
+        set_title = AsyncMock()
+        titler = ThreadTitler(bot)
+
+        titler.start(THREAD, "Can you help me plan " + "the offsite " * 20, set_title)
+        await titler.wait()
+
+        set_title.assert_awaited_once_with("Planning the offsite")
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_the_message_when_the_llm_fails(self) -> None:
+        bot = MagicMock()
+        bot.title = AsyncMock(side_effect=RuntimeError("down"))
+        set_title = AsyncMock()
+        titler = ThreadTitler(bot)
+
+        titler.start(THREAD, "word " * 30, set_title)
+        await titler.wait()
+
+        title = set_title.await_args.args[0]
+        assert title.startswith("word word")
+        assert len(title) <= 50
+
+    @pytest.mark.asyncio
+    async def test_failed_set_title_is_tried_again(self) -> None:
+        set_title = AsyncMock(side_effect=[RuntimeError("rate limited"), None])
+        titler = ThreadTitler(Bot())
+
+        titler.start(THREAD, "hello", set_title)
+        await titler.wait()
+        assert THREAD not in titler.titles
+        titler.start(THREAD, "hello again", set_title)
+        await titler.wait()
+
+        assert titler.titles == {THREAD: "hello again"}
+
+    @pytest.mark.asyncio
+    async def test_forgets_oldest_threads(self) -> None:
+        titler = ThreadTitler(Bot(), max_threads=2)
+
+        for thread_ts in ("1.0", "2.0", "3.0"):
+            titler.start(("C1", thread_ts), "hi", AsyncMock())
+            await titler.wait()
+
+        assert list(titler.titles) == [("C1", "2.0"), ("C1", "3.0")]
+
+    @pytest.mark.asyncio
+    async def test_empty_message(self) -> None:
+        set_title = AsyncMock()
+        titler = ThreadTitler(Bot())
+
+        titler.start(THREAD, "  ", set_title)
+        await titler.wait()
+
+        set_title.assert_not_awaited()
@@ -1,9 +1,29 @@
+from unittest.mock import AsyncMock, MagicMock
+
 import pytest
 
-from lsimons_bot.slack.home.app_home_opened import app_home_opened
+from lsimons_bot.slack.home.app_home_opened import app_home_opened_handler_maker
+from lsimons_bot.slack.home.home_view import HomeView
 
 
 class TestAppHomeOpened:
     @pytest.mark.asyncio
-    async def test_app_home_opened_runs_without_error(self) -> None:
-        await app_home_opened()
+    async def test_app_home_opened_publishes_cached_view(self) -> None:
+        home_view = HomeView()
+        mock_client = MagicMock()
+        mock_client.views_publish = AsyncMock()
+
+        app_home_opened = app_home_opened_handler_maker(home_view)
+        await app_home_opened({"user": "U123", "tab": "home"}, mock_client)
+
+        mock_client.views_publish.assert_awaited_once_with(user_id="U123", view=home_view.view)
+
+    @pytest.mark.asyncio
+    async def test_app_home_opened_ignores_messages_tab(self) -> None:
+        mock_client = MagicMock()
+        mock_client.views_publish = AsyncMock()
+
+        app_home_opened = app_home_opened_handler_maker(HomeView())
+        await app_home_opened({"user": "U123", "tab": "messages"}, mock_client)
+
+        mock_client.views_publish.assert_not_awaited()
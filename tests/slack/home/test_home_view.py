@@ -0,0 +1,73 @@
+from datetime import UTC, datetime, timedelta
+from unittest.mock import MagicMock
+
+import pytest
+
+from lsimons_bot.blog.github import CommitInfo, CommitStats
+from lsimons_bot.blog.wordpress import BlogPost
+from lsimons_bot.slack.home.home_view import HomeActivity, HomeView, render_home_view
+
+
+def _commit(sha: str, days_ago: float) -> CommitInfo:
+    return CommitInfo(
+        repo_name="test-repo",
+        sha=sha,
+        message="Test commit",
+        date=datetime.now(UTC) - timedelta(days=days_ago),
+        additions=10,
+        deletions=5,
+    )
+
+
+class TestRenderHomeView:
+    def test_empty_activity(self) -> None:
+        view = render_home_view(HomeActivity())
+        assert view["type"] == "home"
+        assert "No blog posts yet." in str(view["blocks"])
+
+    def test_posts_and_commits(self) -> None:
+        post = BlogPost(
+            id=1, title="Fixing &amp; shipping", date=datetime.now(UTC), link="https://x"
+        )
+        activity = HomeActivity(
+            posts=[post], commits=[_commit("a", 1)], refreshed_at=datetime.now(UTC)
+        )
+
+        blocks = str(render_home_view(activity)["blocks"])
+
+        assert "<https://x|Fixing &amp; shipping>" in blocks
+        assert "*1* commits in *1* repos (+10/-5 lines)" in blocks
+
+
+class TestHomeView:
+    @pytest.mark.asyncio
+    async def test_refresh_merges_commits_incrementally(self) -> None:
+        mock_wp = MagicMock()
+        mock_wp.get_recent_posts.return_value = []
+        mock_gh = MagicMock()
+        mock_gh.get_commits_since.side_effect = [
+            CommitStats(
+                commits=[_commit("a", 1), _commit("old", 8)],
+                total_commits=2,
+                max_lines_in_commit=15,
+            ),
+            CommitStats(
+                commits=[_commit("a", 1), _commit("b", 0)], total_commits=2, max_lines_in_commit=15
+            ),
+        ]
+        home_view = HomeView(mock_wp, mock_gh)
+
+        await home_view.refresh()
+        await home_view.refresh()
+
+        assert [c.sha for c in home_view.activity.commits] == ["b", "a"]
+        first_since = mock_gh.get_commits_since.call_args_list[0].args[0]
+        second_since = mock_gh.get_commits_since.call_args_list[1].args[0]
+        assert second_since > first_since
+        assert "*2* commits" in str(home_view.view["blocks"])
+
+    @pytest.mark.asyncio
+    async def test_refresh_without_clients(self) -> None:
+        home_view = HomeView()
+        await home_view.refresh()
+        assert home_view.activity.refreshed_at is not None
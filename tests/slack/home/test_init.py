@@ -1,6 +1,7 @@
 from unittest.mock import MagicMock
 
 from lsimons_bot.slack.home import register
+from lsimons_bot.slack.home.home_view import HomeView
 
 
 class TestRegister:
@@ -9,6 +10,6 @@ class TestRegister:
         mock_event = MagicMock()
         mock_app.event.return_value = mock_event
 
-        register(mock_app)
+        register(mock_app, HomeView())
 
         mock_app.event.assert_called_once_with("app_home_opened")
@@ -1,8 +1,18 @@
 from unittest.mock import MagicMock
 
-from lsimons_bot.slack.messages import register
+from lsimons_bot.slack.messages import message, register
+from lsimons_bot.slack.work_queue import WorkQueue
 
 
 class TestRegister:
     def test_register_happy_path(self) -> None:
         register(MagicMock())
+
+    def test_register_with_work_queue(self) -> None:
+        app = MagicMock()
+
+        register(app, WorkQueue())
+
+        queued_message = app.event.return_value.call_args_list[0].args[0]
+        assert queued_message is not message
+        assert queued_message.__name__ == "message"
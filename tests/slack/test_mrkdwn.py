@@ -0,0 +1,101 @@
+from lsimons_bot.slack.mrkdwn import (
+    MAX_BLOCKS_PER_MESSAGE,
+    MAX_SECTION_CHARS,
+    MrkdwnConverter,
+    convert_inline,
+    markdown_to_mrkdwn,
+    response_messages,
+    split_mrkdwn,
+)
+
+
+class TestConvertInline:
+    def test_emphasis(self) -> None:
+        assert convert_inline("**bold** and *italic* ~~old~~") == "*bold* and _italic_ ~old~"
+        assert convert_inline("***both***") == "*_both_*"
+        assert convert_inline("__bold__ and _italic_") == "*bold* and _italic_"
+
+    def test_links_and_images(self) -> None:
+        assert convert_inline("[docs](https://x.com)") == "<https://x.com|docs>"
+        assert convert_inline("![](https://x.com/a.png)") == "<https://x.com/a.png>"
+
+    def test_link_with_parentheses(self) -> None:
+        assert convert_inline("[link](https://x.com/a_(b))") == "<https://x.com/a_(b)|link>"
+        assert convert_inline("([link](https://x.com/a))") == "(<https://x.com/a|link>)"
+
+    def test_escaping_keeps_slack_markup(self) -> None:
+        assert convert_inline("<@U123> said a<b & c &amp; d") == (
+            "<@U123> said a&lt;b &amp; c &amp; d"
+        )
+        assert convert_inline("<#C123|general> <!here>") == "<#C123|general> <!here>"
+
+    def test_code_spans_untouched(self) -> None:
+        assert convert_inline("run `a **b** <c>` now") == "run `a **b** &lt;c&gt;` now"
+
+
+class TestMarkdownToMrkdwn:
+    def test_block_elements(self) -> None:
+        text = "## Heading **bold**\n- one\n  * two\n> quote\n---\n1. first"
+        assert markdown_to_mrkdwn(text) == (
+            "*Heading bold*\n• one\n  • two\n> quote\n──────────\n1. first"
+        )
+
+    def test_code_fence(self) -> None:
+        text = "```python\nif a < b: **x**\n```"
+        assert markdown_to_mrkdwn(text) == "```\nif a &lt; b: **x**\n```"
+
+    def test_unclosed_code_fence_is_closed(self) -> None:
+        assert markdown_to_mrkdwn("```\ncode") == "```\ncode\n```"
+
+    def test_table_becomes_code_block(self) -> None:
+        text = "| a | b |\n|---|---|\n| 1 | 2 |\nafter"
+        assert markdown_to_mrkdwn(text) == "```\n| a | b |\n| 1 | 2 |\n```\nafter"
+
+    def test_streaming_matches_one_shot(self) -> None:
+        text = "# Title\nSome **bold** text\n```\ncode\n```\n| a |\n| - |\n- item *x*"
+        converter = MrkdwnConverter()
+        streamed = "".join(converter.feed(char) for char in text) + converter.flush()
+        assert streamed.rstrip("\n") == markdown_to_mrkdwn(text)
+
+
+class TestSplitMrkdwn:
+    def test_short_text_single_chunk(self) -> None:
+        assert split_mrkdwn("hello\nworld") == ["hello\nworld"]
+
+    def test_long_text_respects_limit(self) -> None:
+        chunks = split_mrkdwn("line of text\n" * 1000)
+        assert len(chunks) > 1
+        assert all(len(chunk) <= MAX_SECTION_CHARS for chunk in chunks)
+
+    def test_code_block_split_is_rebalanced(self) -> None:
+        text = "intro\n```\n" + "code line\n" * 800 + "```\noutro"
+        chunks = split_mrkdwn(text)
+        assert len(chunks) > 1
+        assert all(chunk.count("```") == 2 for chunk in chunks[:-1])
+        assert chunks[-1].endswith("outro")
+
+    def test_very_long_line_is_cut(self) -> None:
+        chunks = split_mrkdwn("x" * 10000)
+        assert "".join(chunks) == "x" * 10000
+        assert all(len(chunk) <= MAX_SECTION_CHARS for chunk in chunks)
+
+
+class TestResponseMessages:
+    def test_short_answer(self) -> None:
+        messages = response_messages("Hello **there**")
+        assert messages == [
+            {
+                "text": "Hello *there*",
+                "blocks": [
+                    {"type": "section", "text": {"type": "mrkdwn", "text": "Hello *there*"}}
+                ],
+            }
+        ]
+
+    def test_long_answer_is_split_into_messages(self) -> None:
+        messages = response_messages("para\n\n" * 20000)
+        assert len(messages) > 1
+        assert all(len(m["blocks"]) <= MAX_BLOCKS_PER_MESSAGE for m in messages)
+
+    def test_empty_answer(self) -> None:
+        assert response_messages("") == [{"text": "…"}]
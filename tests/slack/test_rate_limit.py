@@ -0,0 +1,230 @@
+import asyncio
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from aiohttp import FormData
+from slack_sdk.errors import SlackApiError
+from slack_sdk.web.async_client import AsyncWebClient
+
+from lsimons_bot.slack.rate_limit import (
+    RateLimitedWebClient,
+    SlackRateLimiter,
+    TokenBucket,
+    register,
+    retry_after,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now: float = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _rate_limited(seconds: str) -> SlackApiError:
+    response = MagicMock()
+    response.status_code = 429
+    response.headers = {"Retry-After": seconds}
+    return SlackApiError("ratelimited", response)
+
+
+def _status(status: str) -> dict[str, Any]:
+    return {"channel_id": "C1", "thread_ts": "1.0", "status": status}
+
+
+class TestTokenBucket:
+    def test_refills_over_time(self) -> None:
+        clock = FakeClock()
+        bucket = TokenBucket(rate=1.0, burst=2, clock=clock)
+
+        assert bucket.take() is True
+        assert bucket.take() is True
+        assert bucket.take() is False
+        assert bucket.delay() == pytest.approx(1.0)
+
+        clock.now = 1.0
+        assert bucket.take() is True
+
+    def test_block(self) -> None:
+        clock = FakeClock()
+        bucket = TokenBucket(rate=10.0, burst=5, clock=clock)
+
+        bucket.block(30)
+
+        assert bucket.delay() == pytest.approx(30)
+        clock.now = 30
+        assert bucket.take() is True
+
+
+class TestRetryAfter:
+    def test_rate_limited(self) -> None:
+        assert retry_after(_rate_limited("7")) == 7
+
+    def test_other_errors(self) -> None:
+        response = MagicMock()
+        response.status_code = 200
+        assert retry_after(SlackApiError("channel_not_found", response)) is None
+
+
+class TestSlackRateLimiter:
+    def test_buckets_per_tier_and_channel(self) -> None:
+        limiter = SlackRateLimiter()
+
+        replies = limiter.bucket("conversations.replies", {"channel": "C1"})
+        post_c1 = limiter.bucket("chat.postMessage", {"channel": "C1"})
+        post_c2 = limiter.bucket("chat.postMessage", {"channel": "C2"})
+
+        assert replies.rate == pytest.approx(50 / 60)
+        assert limiter.bucket("conversations.replies", {"channel": "C2"}) is replies
+        assert post_c1 is not post_c2
+        assert post_c1.rate == 1.0
+
+    @pytest.mark.asyncio
+    async def test_retries_after_rate_limit(self) -> None:
+        limiter = SlackRateLimiter()
+        response = MagicMock()
+        send = AsyncMock(side_effect=[_rate_limited("0"), response])
+
+        result = await limiter.call("chat.postMessage", {"channel": "C1"}, send)
+
+        assert result is response
+        assert send.await_count == 2
+        assert limiter.stats["rate_limited"] == 1
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_retries(self) -> None:
+        limiter = SlackRateLimiter(max_retries=1)
+        send = AsyncMock(side_effect=[_rate_limited("0"), _rate_limited("0")])
+
+        with pytest.raises(SlackApiError):
+            _ = await limiter.call("chat.postMessage", {"channel": "C1"}, send)
+
+    @pytest.mark.asyncio
+    async def test_cosmetic_calls_are_dropped_when_rate_limited(self) -> None:
+        limiter = SlackRateLimiter()
+        send = AsyncMock(side_effect=_rate_limited("30"))
+
+        result = await limiter.call("assistant.threads.setStatus", _status("thinking"), send)
+
+        assert result is None
+        assert send.await_count == 1
+        assert limiter.stats["dropped"] == 1
+
+    @pytest.mark.asyncio
+    async def test_cosmetic_calls_give_up_waiting(self) -> None:
+        limiter = SlackRateLimiter(cosmetic_max_wait=0.01)
+        limiter.bucket("assistant.threads.setTitle", {}).block(30)
+        send = AsyncMock()
+
+        result = await limiter.call(
+            "assistant.threads.setTitle", {"channel_id": "C1", "thread_ts": "1.0"}, send
+        )
+
+        assert result is None
+        send.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_unchanged_status_is_skipped(self) -> None:
+        limiter = SlackRateLimiter()
+        send = AsyncMock(return_value=MagicMock())
+
+        _ = await limiter.call("assistant.threads.setStatus", _status("thinking"), send)
+        second = await limiter.call("assistant.threads.setStatus", _status("thinking"), send)
+        _ = await limiter.call("assistant.threads.setStatus", _status("writing"), send)
+
+        assert second is None
+        assert send.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_queued_updates_are_coalesced(self) -> None:
+        limiter = SlackRateLimiter()
+        sent: list[str] = []
+        release = asyncio.Event()
+
+        async def send(payload: dict[str, Any]) -> MagicMock:
+            sent.append(payload["text"])
+            await release.wait()
+            return MagicMock()
+
+        def update(text: str) -> dict[str, Any]:
+            return {"channel": "C1", "ts": "1.0", "text": text}
+
+        first = asyncio.create_task(limiter.call("chat.update", update("a"), send))
+        await asyncio.sleep(0)
+        queued = [
+            asyncio.create_task(limiter.call("chat.update", update(text), send))
+            for text in ("b", "c", "d")
+        ]
+        await asyncio.sleep(0)
+        release.set()
+        _ = await asyncio.gather(first, *queued)
+
+        assert sent == ["a", "d"]
+        assert limiter.stats["coalesced"] == 2
+
+
+class TestRateLimitedWebClient:
+    @pytest.mark.asyncio
+    async def test_api_call_goes_through_limiter(self) -> None:
+        limiter = SlackRateLimiter()
+        limiter.call = AsyncMock(return_value=None)
+        client = RateLimitedWebClient(token="xoxb-test", limiter=limiter)
+
+        response = await client.assistant_threads_setStatus(
+            channel_id="C1", thread_ts="1.0", status="thinking"
+        )
+
+        assert response["ok"] is True
+        assert response["skipped"] is True
+        api_method, payload, _ = limiter.call.await_args.args
+        assert api_method == "assistant.threads.setStatus"
+        assert payload["status"] == "thinking"
+
+    @pytest.mark.asyncio
+    async def test_form_data_bypasses_limiter(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        sent = MagicMock(data={"ok": True})
+        base_call = AsyncMock(return_value=sent)
+        monkeypatch.setattr(AsyncWebClient, "api_call", base_call)
+        limiter = SlackRateLimiter()
+        limiter.call = AsyncMock()
+        client = RateLimitedWebClient(token="xoxb-test", limiter=limiter)
+        form = FormData({"channel": "C1"})
+
+        response = await client.api_call("files.upload", data=form)
+
+        assert response is sent
+        limiter.call.assert_not_awaited()
+        assert base_call.await_args.kwargs["data"] is form
+
+    def test_wrap_keeps_client_settings(self) -> None:
+        limiter = SlackRateLimiter()
+        client = AsyncWebClient(token="xoxb-test", base_url="http://localhost:3000/api/")
+
+        wrapped = RateLimitedWebClient.wrap(client, limiter)
+
+        assert wrapped.token == "xoxb-test"
+        assert wrapped.base_url == "http://localhost:3000/api/"
+        assert wrapped.limiter is limiter
+
+
+class TestRegister:
+    @pytest.mark.asyncio
+    async def test_register_wraps_context_client(self) -> None:
+        mock_app = MagicMock()
+        limiter = SlackRateLimiter()
+
+        register(mock_app, limiter)
+
+        middleware = mock_app.use.call_args.args[0]
+        context: dict[str, Any] = {}
+        mock_context = MagicMock()
+        mock_context.client = AsyncWebClient(token="xoxb-test")
+        mock_context.__setitem__.side_effect = context.__setitem__
+        next_ = AsyncMock()
+        await middleware(mock_context, next_)
+
+        assert isinstance(context["client"], RateLimitedWebClient)
+        next_.assert_awaited_once()
@@ -0,0 +1,75 @@
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from lsimons_bot.slack.users import PAGE_SIZE, UserDirectory, display_name, register
+
+
+def _user(user_id: str, display: str = "", real: str = "", name: str = "") -> dict[str, Any]:
+    return {
+        "id": user_id,
+        "name": name,
+        "profile": {"display_name": display, "real_name": real},
+    }
+
+
+class TestDisplayName:
+    def test_prefers_display_name(self) -> None:
+        assert display_name(_user("U1", display="ann", real="Ann Smith", name="asmith")) == "ann"
+
+    def test_falls_back_to_real_name_and_username(self) -> None:
+        assert display_name(_user("U1", real="Ann Smith", name="asmith")) == "Ann Smith"
+        assert display_name(_user("U1", name="asmith")) == "asmith"
+        assert display_name({"id": "U1"}) is None
+
+
+class TestUserDirectory:
+    @pytest.mark.asyncio
+    async def test_load_follows_pagination(self) -> None:
+        client = MagicMock()
+        client.users_list = AsyncMock(
+            side_effect=[
+                {
+                    "members": [_user("U1", display="ann")],
+                    "response_metadata": {"next_cursor": "c"},
+                },
+                {"members": [_user("U2", real="Bob")], "response_metadata": {"next_cursor": ""}},
+            ]
+        )
+        users = UserDirectory()
+
+        await users.load(client)
+
+        assert users.names == {"U1": "ann", "U2": "Bob"}
+        assert users.loaded
+        assert client.users_list.await_args_list[1].kwargs == {"limit": PAGE_SIZE, "cursor": "c"}
+
+    def test_update(self) -> None:
+        users = UserDirectory()
+        users.update(_user("U1", display="ann"))
+        users.update(_user("U1", display="annie"))
+
+        assert users.name("U1") == "annie"
+        assert users.name("U2") is None
+
+    def test_resolve_mentions(self) -> None:
+        users = UserDirectory()
+        users.update(_user("U1", display="ann"))
+
+        text = users.resolve_mentions("ask <@U1> or <@U2>, cc <@U1|old label>")
+
+        assert text == "ask <@U1> (ann) or <@U2>, cc <@U1> (ann)"
+
+    @pytest.mark.asyncio
+    async def test_user_change_event(self) -> None:
+        app = MagicMock()
+        handlers: dict[str, Any] = {}
+        app.event.side_effect = lambda name: lambda handler: handlers.setdefault(name, handler)
+        users = UserDirectory()
+
+        register(app, users)
+        await handlers["user_change"]({"user": _user("U1", display="ann")})
+        await handlers["team_join"]({"user": _user("U2", display="bob")})
+
+        assert users.names == {"U1": "ann", "U2": "bob"}
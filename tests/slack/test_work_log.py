@@ -0,0 +1,131 @@
+import asyncio
+import sqlite3
+import time
+from pathlib import Path
+
+import pytest
+
+from lsimons_bot.slack.work_log import (
+    STATE_ACCEPTED,
+    STATE_DONE,
+    STATE_FAILED,
+    LoggedRequest,
+    WorkLog,
+)
+
+
+def _request(message_ts: str = "2.0") -> LoggedRequest:
+    return LoggedRequest("D1", "1.0", message_ts, "What is up?")
+
+
+def _states(path: Path) -> dict[str, str]:
+    with sqlite3.connect(path) as db:
+        return dict(db.execute("SELECT id, state FROM requests").fetchall())
+
+
+class TestWorkLog:
+    @pytest.mark.asyncio
+    async def test_writes_are_committed_in_batches(self, tmp_path: Path) -> None:
+        path = tmp_path / "work.sqlite3"
+        work_log = WorkLog(path)
+        first, second = _request("2.0"), _request("3.0")
+
+        work_log.accept(first)
+        work_log.accept(second)
+        work_log.finish(first)
+        assert _states(path) == {}
+
+        await work_log.flush()
+
+        assert _states(path) == {"D1:2.0": STATE_DONE, "D1:3.0": STATE_ACCEPTED}
+
+    @pytest.mark.asyncio
+    async def test_unfinished_requests_survive_a_restart(self, tmp_path: Path) -> None:
+        path = tmp_path / "work.sqlite3"
+        work_log = WorkLog(path)
+        work_log.accept(_request("2.0"))
+        work_log.accept(_request("3.0"))
+        work_log.fail(_request("3.0"))
+        await work_log.flush()
+        work_log.close()
+
+        unfinished = WorkLog(path).unfinished()
+
+        assert [r.id for r in unfinished] == ["D1:2.0"]
+        assert unfinished[0].text == "What is up?"
+        assert unfinished[0].attempts == 0
+        assert unfinished[0].created > 0
+
+    @pytest.mark.asyncio
+    async def test_retry_counts_attempts(self, tmp_path: Path) -> None:
+        work_log = WorkLog(tmp_path / "work.sqlite3")
+        work_log.accept(_request())
+        await work_log.flush()
+
+        request = work_log.unfinished()[0]
+        work_log.retry(request)
+        await work_log.flush()
+
+        assert request.attempts == 1
+        assert work_log.unfinished()[0].attempts == 1
+
+    @pytest.mark.asyncio
+    async def test_track(self, tmp_path: Path) -> None:
+        path = tmp_path / "work.sqlite3"
+        work_log = WorkLog(path)
+
+        with work_log.track(_request("2.0")):
+            pass
+        with pytest.raises(ValueError), work_log.track(_request("3.0")):
+            raise ValueError("boom")
+        with pytest.raises(asyncio.CancelledError), work_log.track(_request("4.0")):
+            raise asyncio.CancelledError
+        await work_log.flush()
+
+        assert _states(path) == {
+            "D1:2.0": STATE_DONE,
+            "D1:3.0": STATE_FAILED,
+            "D1:4.0": STATE_ACCEPTED,
+        }
+
+    @pytest.mark.asyncio
+    async def test_run_flushes_on_cancel(self, tmp_path: Path) -> None:
+        path = tmp_path / "work.sqlite3"
+        work_log = WorkLog(path, flush_interval=60)
+        task = asyncio.create_task(work_log.run())
+        await asyncio.sleep(0)
+
+        work_log.accept(_request())
+        _ = task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert _states(path) == {"D1:2.0": STATE_ACCEPTED}
+
+    @pytest.mark.asyncio
+    async def test_prune_keeps_unfinished(self, tmp_path: Path) -> None:
+        path = tmp_path / "work.sqlite3"
+        work_log = WorkLog(path)
+        work_log.accept(_request("2.0"))
+        work_log.accept(_request("3.0"))
+        work_log.finish(_request("3.0"))
+        await work_log.flush()
+
+        work_log.prune(keep_seconds=-1)
+
+        assert _states(path) == {"D1:2.0": STATE_ACCEPTED}
+
+    @pytest.mark.asyncio
+    async def test_overhead_per_request(self, tmp_path: Path) -> None:
+        work_log = WorkLog(tmp_path / "work.sqlite3")
+        requests = [_request(str(i)) for i in range(1000)]
+
+        start = time.perf_counter()
+        for request in requests:
+            work_log.accept(request)
+            work_log.finish(request)
+        await work_log.flush()
+
+        # Well under a millisecond per request, commit included
+        assert time.perf_counter() - start < 1.0
+        assert work_log.unfinished() == []
@@ -0,0 +1,157 @@
+import asyncio
+from collections.abc import AsyncIterator
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from lsimons_bot.slack.work_queue import Job, WorkQueue, queued, thread_key
+
+
+@pytest.fixture
+async def work_queue() -> AsyncIterator[WorkQueue]:
+    work_queue = WorkQueue(workers=4, max_pending=10, submit_timeout=0.05)
+    workers = asyncio.create_task(work_queue.run())
+    yield work_queue
+    _ = workers.cancel()
+
+
+def _args(
+    context_channel: str | None = "C1", context_thread: str | None = "1.0", **event: str
+) -> MagicMock:
+    args = MagicMock()
+    args.context.channel_id = context_channel
+    args.context.thread_ts = context_thread
+    args.event = event
+    return args
+
+
+class TestWorkQueue:
+    @pytest.mark.asyncio
+    async def test_runs_jobs_of_a_thread_in_order(self, work_queue: WorkQueue) -> None:
+        order: list[int] = []
+
+        def job(i: int, delay: float) -> Job:
+            async def run() -> None:
+                await asyncio.sleep(delay)
+                order.append(i)
+
+            return run
+
+        for i, delay in enumerate([0.03, 0.0, 0.01]):
+            assert await work_queue.submit(("C1", "1.0"), job(i, delay))
+        await work_queue.drain()
+
+        assert order == [0, 1, 2]
+        assert work_queue.stats.completed == 3
+
+    @pytest.mark.asyncio
+    async def test_runs_threads_concurrently(self, work_queue: WorkQueue) -> None:
+        running = 0
+        peak = 0
+
+        async def job() -> None:
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.02)
+            running -= 1
+
+        for i in range(4):
+            _ = await work_queue.submit(("C1", str(i)), job)
+        await work_queue.drain()
+
+        assert peak == 4
+
+    @pytest.mark.asyncio
+    async def test_rejects_when_full(self) -> None:
+        # No workers, so nothing leaves the queue
+        work_queue = WorkQueue(workers=0, max_pending=2, submit_timeout=0.01)
+        job = AsyncMock()
+
+        assert await work_queue.submit("a", job)
+        assert await work_queue.submit("b", job)
+        assert not await work_queue.submit("c", job)
+
+        assert work_queue.depth == 2
+        assert work_queue.stats.rejected == 1
+        assert work_queue.oldest_age() > 0
+        assert "depth=2" in work_queue.summary()
+
+    @pytest.mark.asyncio
+    async def test_failed_job_does_not_stop_the_thread(self, work_queue: WorkQueue) -> None:
+        second = AsyncMock()
+
+        _ = await work_queue.submit("a", AsyncMock(side_effect=RuntimeError("boom")))
+        _ = await work_queue.submit("a", second)
+        await work_queue.drain()
+
+        second.assert_awaited_once()
+        assert work_queue.stats.failed == 1
+        assert work_queue.stats.completed == 1
+        assert work_queue.stats.wait.count == 2
+
+    @pytest.mark.asyncio
+    async def test_drain_waits_for_running_jobs(self, work_queue: WorkQueue) -> None:
+        done: list[str] = []
+
+        async def job() -> None:
+            await asyncio.sleep(0.02)
+            done.append("job")
+
+        _ = await work_queue.submit("a", job)
+        _ = await work_queue.submit("a", job)
+        await work_queue.drain()
+
+        assert done == ["job", "job"]
+        assert work_queue.depth == 0
+
+    @pytest.mark.asyncio
+    async def test_drain_empty_queue(self) -> None:
+        async with asyncio.timeout(1):
+            await WorkQueue(workers=0).drain()
+
+
+class TestThreadKey:
+    def test_assistant_thread(self) -> None:
+        assert thread_key(_args("D1", "1.0")) == ("D1", "1.0")
+
+    def test_thread_reply(self) -> None:
+        assert thread_key(_args(None, None, channel="C1", thread_ts="1.0", ts="2.0")) == (
+            "C1",
+            "1.0",
+        )
+
+    def test_top_level_message_starts_a_thread(self) -> None:
+        assert thread_key(_args("C1", None, ts="2.0")) == ("C1", "2.0")
+
+
+class TestQueued:
+    @pytest.mark.asyncio
+    async def test_passes_the_listener_its_arguments(self, work_queue: WorkQueue) -> None:
+        received: list[object] = []
+
+        async def listener(say: object, body: object, user_id: object) -> None:
+            received.extend([say, body, user_id])
+
+        args = _args()
+        args.context.get.return_value = "U1"
+        del args.user_id
+        enqueue = queued(work_queue, listener)
+        await enqueue(args)
+        await work_queue.drain()
+
+        assert received == [args.say, args.body, "U1"]
+        assert enqueue.__name__ == "listener"
+        args.context.get.assert_called_once_with("user_id")
+
+    @pytest.mark.asyncio
+    async def test_rejected(self) -> None:
+        work_queue = WorkQueue(workers=0, max_pending=0, submit_timeout=0.01)
+        on_rejected = AsyncMock()
+        listener = AsyncMock()
+
+        args = _args()
+        await queued(work_queue, listener, on_rejected)(args)
+
+        on_rejected.assert_awaited_once_with(args)
+        listener.assert_not_awaited()
@@ -0,0 +1,116 @@
+import json
+import threading
+from pathlib import Path
+
+import pytest
+
+from lsimons_bot.tracing.export import FORMAT_OTLP, JsonlExporter, otlp_record, span_record
+from lsimons_bot.tracing.trace import STATUS_CANCELLED, STATUS_ERROR, Span
+
+
+def _span(**attributes: str | int | float | bool) -> Span:
+    return Span(
+        "llm.chat_completion",
+        "a" * 32,
+        "b" * 16,
+        parent_id="c" * 16,
+        start_ns=1_000_000_000,
+        end_ns=3_500_000_000,
+        attributes=dict(attributes),
+    )
+
+
+class TestSpanRecord:
+    def test_flat_record(self) -> None:
+        record = span_record(_span(model="fast", prompt_tokens=12))
+
+        assert record["name"] == "llm.chat_completion"
+        assert record["parent_id"] == "c" * 16
+        assert record["duration"] == 2.5
+        assert record["status"] == "ok"
+        assert record["attributes"] == {"model": "fast", "prompt_tokens": 12}
+
+
+class TestOtlpRecord:
+    def test_export_request(self) -> None:
+        record = otlp_record(_span(model="fast", prompt_tokens=12, ttft=0.5, cached=True))
+
+        resource = record["resourceSpans"][0]
+        assert resource["resource"]["attributes"][0]["value"] == {"stringValue": "lsimons-bot"}
+        span = resource["scopeSpans"][0]["spans"][0]
+        assert span["traceId"] == "a" * 32
+        assert span["parentSpanId"] == "c" * 16
+        assert span["startTimeUnixNano"] == "1000000000"
+        assert span["status"] == {"code": 1}
+        assert span["attributes"] == [
+            {"key": "model", "value": {"stringValue": "fast"}},
+            {"key": "prompt_tokens", "value": {"intValue": "12"}},
+            {"key": "ttft", "value": {"doubleValue": 0.5}},
+            {"key": "cached", "value": {"boolValue": True}},
+        ]
+
+    def test_status(self) -> None:
+        failed = _span()
+        failed.status, failed.error = STATUS_ERROR, "TimeoutError()"
+        cancelled = _span()
+        cancelled.status = STATUS_CANCELLED
+
+        failed_span = otlp_record(failed)["resourceSpans"][0]["scopeSpans"][0]["spans"][0]
+        cancelled_span = otlp_record(cancelled)["resourceSpans"][0]["scopeSpans"][0]["spans"][0]
+        assert failed_span["status"] == {"code": 2, "message": "TimeoutError()"}
+        assert cancelled_span["status"] == {"code": 0}
+
+
+class TestJsonlExporter:
+    def test_writes_one_line_per_span(self, tmp_path: Path) -> None:
+        path = tmp_path / "traces" / "traces.jsonl"
+        exporter = JsonlExporter(path)
+        exporter.export(_span())
+        exporter.export(_span())
+        exporter.close()
+
+        lines = path.read_text().splitlines()
+        assert len(lines) == 2
+        assert json.loads(lines[0])["span_id"] == "b" * 16
+
+    def test_otlp_format(self, tmp_path: Path) -> None:
+        path = tmp_path / "traces.jsonl"
+        exporter = JsonlExporter(path, FORMAT_OTLP)
+        exporter.export(_span())
+        exporter.close()
+
+        assert "resourceSpans" in json.loads(path.read_text())
+
+    def test_rotates(self, tmp_path: Path) -> None:
+        path = tmp_path / "traces.jsonl"
+        exporter = JsonlExporter(path, max_bytes=500, backup_count=2)
+        for _ in range(10):
+            exporter.export(_span())
+        exporter.close()
+
+        assert (tmp_path / "traces.jsonl.1").exists()
+        assert (tmp_path / "traces.jsonl.2").exists()
+        assert not (tmp_path / "traces.jsonl.3").exists()
+
+    def test_spans_from_many_threads(self, tmp_path: Path) -> None:
+        path = tmp_path / "traces.jsonl"
+        exporter = JsonlExporter(path)
+
+        def export() -> None:
+            for _ in range(50):
+                exporter.export(_span())
+
+        threads = [threading.Thread(target=export) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        exporter.close()
+
+        lines = path.read_text().splitlines()
+        assert len(lines) == 200
+        assert all(json.loads(line)["span_id"] == "b" * 16 for line in lines)
+
+    def test_unknown_format(self, tmp_path: Path) -> None:
+        with pytest.raises(ValueError, match="Unknown trace format"):
+            _ = JsonlExporter(tmp_path / "traces.jsonl", "zipkin")
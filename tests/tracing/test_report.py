@@ -0,0 +1,137 @@
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from lsimons_bot.tracing.__main__ import main
+from lsimons_bot.tracing.export import FORMAT_OTLP, JsonlExporter
+from lsimons_bot.tracing.report import (
+    SpanRecord,
+    build_traces,
+    critical_path,
+    format_trace,
+    read_spans,
+    self_time,
+    slowest,
+    trace_files,
+)
+from lsimons_bot.tracing.trace import Span
+
+S = 1_000_000_000
+
+
+def _request(trace: str, llm_seconds: int) -> list[Span]:
+    """An assistant message: read the thread, then chat, with a hedged LLM request."""
+    root = f"{trace}00"
+    return [
+        Span("slack.assistant_message", trace * 16, root, None, 0, (2 + llm_seconds) * S),
+        Span("slack.read_thread", trace * 16, f"{trace}01", root, 0, 1 * S),
+        Span("bot.chat", trace * 16, f"{trace}02", root, 1 * S, (1 + llm_seconds) * S),
+        Span("llm.chat_completion", trace * 16, f"{trace}03", f"{trace}02", 1 * S, 2 * S),
+        Span("llm.chat_completion", trace * 16, f"{trace}04", f"{trace}02", 1 * S, 3 * S),
+    ]
+
+
+def _records(spans: list[Span]) -> list[SpanRecord]:
+    return [
+        SpanRecord(s.trace_id, s.span_id, s.parent_id, s.name, s.start_ns, s.end_ns or 0)
+        for s in spans
+    ]
+
+
+def _write(path: Path, spans: list[Span], format: str = "jsonl") -> None:
+    exporter = JsonlExporter(path, format)
+    for span in spans:
+        exporter.export(span)
+    exporter.close()
+
+
+class TestReadSpans:
+    def test_both_formats(self, tmp_path: Path) -> None:
+        _write(tmp_path / "flat.jsonl", _request("a", 5))
+        _write(tmp_path / "otlp.jsonl", _request("b", 5), FORMAT_OTLP)
+
+        flat = read_spans([tmp_path / "flat.jsonl"])
+        otlp = read_spans([tmp_path / "otlp.jsonl"])
+
+        assert [(s.name, s.start_ns, s.end_ns) for s in flat] == [
+            (s.name, s.start_ns, s.end_ns) for s in otlp
+        ]
+        assert otlp[0].parent_id is None
+        assert otlp[1].parent_id == "b00"
+
+    def test_skips_bad_lines(self, tmp_path: Path) -> None:
+        path = tmp_path / "traces.jsonl"
+        _write(path, _request("a", 5))
+        with path.open("a") as f:
+            _ = f.write('{"name": "trunc')
+
+        assert len(read_spans([path])) == 5
+
+    def test_trace_files_oldest_first(self, tmp_path: Path) -> None:
+        for name in ("traces.jsonl", "traces.jsonl.1", "traces.jsonl.2", "traces.jsonl.10"):
+            (tmp_path / name).touch()
+
+        assert [p.name for p in trace_files(tmp_path / "traces.jsonl")] == [
+            "traces.jsonl.10",
+            "traces.jsonl.2",
+            "traces.jsonl.1",
+            "traces.jsonl",
+        ]
+
+
+class TestCriticalPath:
+    def test_follows_the_child_that_ended_last(self) -> None:
+        (root,) = build_traces(_records(_request("a", 5)))
+
+        path = critical_path(root)
+
+        assert [s.span_id for s in path] == ["a00", "a02", "a04"]
+
+    def test_self_time(self) -> None:
+        (root,) = build_traces(_records(_request("a", 5)))
+
+        # 7s request: read_thread 0-1s, bot.chat 1-6s
+        assert self_time(root) == pytest.approx(1.0)
+        # bot.chat 1-6s, its overlapping attempts cover 1-3s
+        assert self_time(root.children[1]) == pytest.approx(3.0)
+
+    def test_orphans_become_roots(self) -> None:
+        spans = _request("a", 5)[1:]
+
+        assert len(build_traces(_records(spans))) == 2
+
+    def test_slowest(self) -> None:
+        roots = build_traces(_records([*_request("a", 5), *_request("b", 9), *_request("c", 1)]))
+
+        assert [r.trace_id[0] for r in slowest(roots, 2, "slack.assistant_message")] == ["b", "a"]
+
+    def test_format(self) -> None:
+        (root,) = build_traces(_records(_request("a", 5)))
+
+        lines = format_trace(root).splitlines()
+
+        assert "slack.assistant_message" in lines[0]
+        assert "7.000s" in lines[0]
+        assert lines[1].strip().startswith("5.000s   bot.chat (self 3.000s")
+        assert "llm.chat_completion" in lines[2]
+
+
+class TestMain:
+    def test_report(self, tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        path = tmp_path / "traces.jsonl"
+        _write(path, [*_request("a", 5), *_request("b", 9)])
+
+        with patch.object(sys, "argv", ["tracing", str(path), "--top", "1"]):
+            exit_code = main()
+
+        output = capsys.readouterr().out
+        assert exit_code == 0
+        assert "2 traces in 1 files, slowest 1" in output
+        assert "trace=" + "b" * 16 in output
+        assert "trace=" + "a" * 16 not in output
+
+    def test_missing_file(self, tmp_path: Path) -> None:
+        with patch.object(sys, "argv", ["tracing", str(tmp_path / "missing.jsonl")]):
+            assert main() == 1
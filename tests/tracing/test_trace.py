@@ -0,0 +1,109 @@
+import asyncio
+from collections.abc import Iterator
+
+import pytest
+
+from lsimons_bot.tracing.trace import (
+    STATUS_CANCELLED,
+    STATUS_ERROR,
+    STATUS_OK,
+    Span,
+    current_span,
+    set_exporter,
+    span,
+    traceparent,
+)
+
+
+class Recorder:
+    def __init__(self) -> None:
+        self.spans: list[Span] = []
+
+    def export(self, span: Span) -> None:
+        self.spans.append(span)
+
+
+@pytest.fixture
+def recorder() -> Iterator[Recorder]:
+    recorder = Recorder()
+    set_exporter(recorder)
+    yield recorder
+    set_exporter(None)
+
+
+class TestSpan:
+    def test_nested_spans_share_the_trace(self, recorder: Recorder) -> None:
+        with span("root", channel="C1") as root:
+            with span("child", skipped=None) as child:
+                assert current_span() is child
+            assert current_span() is root
+        assert current_span() is None
+
+        assert [s.name for s in recorder.spans] == ["child", "root"]
+        assert child.trace_id == root.trace_id
+        assert child.parent_id == root.span_id
+        assert root.parent_id is None
+        assert root.attributes == {"channel": "C1"}
+        assert child.attributes == {}
+        assert root.end_ns is not None and child.end_ns is not None
+        assert root.end_ns >= child.end_ns
+
+    def test_separate_roots_start_new_traces(self, recorder: Recorder) -> None:
+        with span("one"):
+            pass
+        with span("two"):
+            pass
+
+        assert recorder.spans[0].trace_id != recorder.spans[1].trace_id
+
+    def test_error_is_recorded_and_raised(self, recorder: Recorder) -> None:
+        with pytest.raises(ValueError), span("failing"):
+            raise ValueError("boom")
+
+        assert recorder.spans[0].status == STATUS_ERROR
+        assert recorder.spans[0].error == "ValueError('boom')"
+
+    @pytest.mark.asyncio
+    async def test_tasks_inherit_the_current_span(self, recorder: Recorder) -> None:
+        async def attempt(name: str, delay: float) -> None:
+            with span(name):
+                await asyncio.sleep(delay)
+
+        with span("request") as request:
+            fast = asyncio.create_task(attempt("fast", 0))
+            slow = asyncio.create_task(attempt("slow", 10))
+            await fast
+            _ = slow.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await slow
+
+        by_name = {s.name: s for s in recorder.spans}
+        assert by_name["fast"].parent_id == request.span_id
+        assert by_name["fast"].status == STATUS_OK
+        assert by_name["slow"].parent_id == request.span_id
+        assert by_name["slow"].status == STATUS_CANCELLED
+
+    def test_exporter_errors_do_not_break_the_request(self) -> None:
+        class Broken:
+            def export(self, span: Span) -> None:
+                raise OSError("disk full")
+
+        set_exporter(Broken())
+        try:
+            with span("request"):
+                pass
+        finally:
+            set_exporter(None)
+
+
+class TestTraceparent:
+    def test_without_trace(self) -> None:
+        assert traceparent() == {}
+
+    def test_names_the_current_span(self) -> None:
+        with span("request") as current:
+            headers = traceparent()
+
+        assert headers == {"traceparent": f"00-{current.trace_id}-{current.span_id}-01"}
+        assert len(current.trace_id) == 32
+        assert len(current.span_id) == 16